@@ -8,20 +8,39 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
-import requests
+import argparse
 import time
 import numpy as np
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from indicator_engine import MIN_BARS
+from indicator_graph import IndicatorGraph
+from market_data_client import get_client
+from multi_timeframe import BASE_TIMEFRAME, CONFLUENCE_TIMEFRAMES, get_multi_timeframe, score_trend_momentum
+from ohlcv_store import get_store
+
+# Overall deadline (seconds) for the concurrent market data fan-out
+FETCH_DEADLINE = 10
+
+# Daily bars loaded from the local OHLCV store for technical indicators
+HISTORY_BARS = 250
+
+# Groups of indicators calculate_technical_indicators can compute on demand
+INDICATOR_SECTIONS = ('moving_averages', 'rsi', 'macd', 'bollinger', 'atr', 'volume')
+
+# Sections read by the signal and risk rules (Bollinger is display only)
+SIGNAL_SECTIONS = ('moving_averages', 'rsi', 'macd', 'atr', 'volume')
+
 
 class AdvancedTradingAssistant:
     def __init__(self):
         self.driver = None
         self.nifty_data = {}
         self.historical_data = None
+        self.indicator_graph = IndicatorGraph()
         self.vix_data = None
         self.technical_indicators = {}
         self.risk_metrics = {}
@@ -44,12 +63,15 @@ class AdvancedTradingAssistant:
             print("Continuing with API-only analysis...")
             return False
 
-    def fetch_comprehensive_market_data(self):
+    def fetch_comprehensive_market_data(self, concurrent=True, deadline=FETCH_DEADLINE):
         """Fetch comprehensive market data from multiple sources"""
         print("\n" + "="*70)
         print("📊 FETCHING COMPREHENSIVE MARKET DATA")
         print("="*70)
 
+        if concurrent:
+            return self._fetch_market_data_concurrently(deadline)
+
         # Fetch NIFTY 50 data
         self.fetch_nifty_data_yahoo()
 
@@ -64,85 +86,126 @@ class AdvancedTradingAssistant:
 
         return True
 
+    def _fetch_market_data_concurrently(self, deadline):
+        """
+        Issue the NIFTY, history, VIX and Bank NIFTY requests at once and join
+        them against a single overall deadline. Sources that miss the deadline
+        or fail fall back individually; everything that arrived is kept.
+        """
+        print(f"\n⚡ Fetching NIFTY, history, VIX and Bank NIFTY concurrently (deadline {deadline}s)...")
+
+        client = get_client()
+        requests_by_source = {
+            'nifty': lambda: client.fetch_quote('^NSEI'),
+            'history': lambda: get_store().history('^NSEI', bars=HISTORY_BARS),
+            'vix': lambda: client.fetch_quote('^INVIX', range='5d'),
+            'bank_nifty': lambda: client.fetch_quote('^NSEBANK'),
+        }
+
+        # Workers only perform the requests; all state is applied on this thread
+        # so a straggler finishing after the deadline cannot overwrite fallbacks
+        executor = ThreadPoolExecutor(max_workers=len(requests_by_source))
+        futures = {source: executor.submit(request) for source, request in requests_by_source.items()}
+        wait(futures.values(), timeout=deadline)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        results = {}
+        for source, future in futures.items():
+            if not future.done():
+                print(f"⚠️  {source} missed the {deadline}s deadline")
+                results[source] = None
+            elif future.exception() is not None:
+                print(f"⚠️  {source} error: {future.exception()}")
+                results[source] = None
+            else:
+                results[source] = future.result()
+
+        if not self._apply_nifty_quote(results['nifty']):
+            self._use_fallback_data()
+
+        if not self._apply_historical_data(results['history']):
+            print("⚠️  Historical data unavailable")
+
+        if not self._apply_vix_quote(results['vix']):
+            self.vix_data = {'current': 15.0, 'status': 'Moderate'}
+
+        if not self._apply_bank_nifty_quote(results['bank_nifty']):
+            self.nifty_data['bank_nifty_change'] = self.nifty_data['pct_change']
+
+        return True
+
     def fetch_nifty_data_yahoo(self):
         """Fetch real-time NIFTY 50 data from Yahoo Finance"""
         try:
             print("\n📈 Fetching NIFTY 50 real-time data...")
 
-            url = "https://query1.finance.yahoo.com/v8/finance/chart/%5ENSEI"
-            params = {'interval': '1d', 'range': '1d'}
-            headers = {'User-Agent': 'Mozilla/5.0'}
-
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                result = data['chart']['result'][0]
-                meta = result['meta']
-
-                # Extract current data
-                timestamps = result['timestamp']
-                quotes = result['indicators']['quote'][0]
-
-                # Get latest values
-                latest_idx = -1
-                current_price = meta.get('regularMarketPrice', quotes['close'][latest_idx])
-                prev_close = meta.get('chartPreviousClose', quotes['close'][-2] if len(quotes['close']) > 1 else current_price)
-
-                self.nifty_data = {
-                    'symbol': '^NSEI',
-                    'name': 'NIFTY 50',
-                    'last_price': float(current_price),
-                    'open': float(quotes['open'][latest_idx]) if quotes['open'][latest_idx] else current_price,
-                    'high': float(quotes['high'][latest_idx]) if quotes['high'][latest_idx] else current_price,
-                    'low': float(quotes['low'][latest_idx]) if quotes['low'][latest_idx] else current_price,
-                    'volume': int(quotes['volume'][latest_idx]) if quotes['volume'][latest_idx] else 0,
-                    'previous_close': float(prev_close),
-                    'change': float(current_price - prev_close),
-                    'pct_change': float((current_price - prev_close) / prev_close * 100),
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-
-                print(f"✅ NIFTY 50: ₹{self.nifty_data['last_price']:.2f} "
-                      f"({self.nifty_data['pct_change']:+.2f}%)")
-                return True
+            return self._apply_nifty_quote(get_client().fetch_quote('^NSEI'))
 
         except Exception as e:
             print(f"⚠️  Yahoo Finance error: {e}")
             self._use_fallback_data()
             return False
 
+    def _apply_nifty_quote(self, quote):
+        """Store a NIFTY 50 quote"""
+        if quote is None:
+            return None
+
+        self.nifty_data = {'symbol': '^NSEI', 'name': 'NIFTY 50', **quote}
+
+        print(f"✅ NIFTY 50: ₹{self.nifty_data['last_price']:.2f} "
+              f"({self.nifty_data['pct_change']:+.2f}%)")
+        return True
+
     def fetch_historical_data(self):
         """Fetch historical data for technical indicators"""
         try:
-            print("📊 Fetching 50-day historical data...")
+            print("📊 Loading historical data...")
 
-            url = "https://query1.finance.yahoo.com/v8/finance/chart/%5ENSEI"
-            params = {'interval': '1d', 'range': '60d'}
-            headers = {'User-Agent': 'Mozilla/5.0'}
+            return self._apply_historical_data(get_store().history('^NSEI', bars=HISTORY_BARS))
+
+        except Exception as e:
+            print(f"⚠️  Historical data error: {e}")
+            return False
 
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+    def _apply_historical_data(self, history):
+        """Store daily history for technical indicators"""
+        if history is None:
+            return None
 
-            if response.status_code == 200:
-                data = response.json()
-                result = data['chart']['result'][0]
-                quotes = result['indicators']['quote'][0]
+        self.historical_data = history
 
-                # Create DataFrame
-                self.historical_data = pd.DataFrame({
-                    'timestamp': pd.to_datetime(result['timestamp'], unit='s'),
-                    'open': quotes['open'],
-                    'high': quotes['high'],
-                    'low': quotes['low'],
-                    'close': quotes['close'],
-                    'volume': quotes['volume']
-                }).dropna()
+        print(f"✅ Historical data: {len(self.historical_data)} trading days")
+        return True
 
-                print(f"✅ Historical data: {len(self.historical_data)} trading days")
-                return True
+    def fetch_intraday_data(self):
+        """Bring the 5-minute NIFTY bars up to date and roll them into every confluence timeframe"""
+        try:
+            print(f"📊 Loading {BASE_TIMEFRAME} bars for {', '.join(CONFLUENCE_TIMEFRAMES)} confluence...")
+            store = get_store()
+            try:
+                store.update('^NSEI', BASE_TIMEFRAME)
+            except Exception as e:
+                print(f"⚠️  Intraday update failed, using stored bars: {e}")
+
+            columns = store.load_array('^NSEI', BASE_TIMEFRAME)
+            if columns is None:
+                print("⚠️  No intraday bars available")
+                return False
+
+            state = get_multi_timeframe('^NSEI')
+            if '1d' in state.timeframes and '1d' not in state.seeds:
+                # The intraday backfill holds too few sessions for daily indicators
+                daily = store.load_array('^NSEI', '1d')
+                if daily is not None:
+                    print(f"✅ Daily confluence seeded with {state.seed('1d', daily)} stored bars")
+
+            state.update(columns)
+            print(f"✅ Intraday data: {columns.shape[1]} {BASE_TIMEFRAME} bars")
+            return True
 
         except Exception as e:
-            print(f"⚠️  Historical data error: {e}")
+            print(f"⚠️  Intraday data error: {e}")
             return False
 
     def fetch_india_vix(self):
@@ -150,174 +213,153 @@ class AdvancedTradingAssistant:
         try:
             print("⚡ Fetching India VIX...")
 
-            url = "https://query1.finance.yahoo.com/v8/finance/chart/%5EINVIX"
-            params = {'interval': '1d', 'range': '5d'}
-            headers = {'User-Agent': 'Mozilla/5.0'}
-
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                result = data['chart']['result'][0]
-                meta = result['meta']
-                quotes = result['indicators']['quote'][0]
-
-                vix_current = meta.get('regularMarketPrice', quotes['close'][-1])
-
-                self.vix_data = {
-                    'current': float(vix_current),
-                    'status': self._interpret_vix(vix_current)
-                }
-
-                print(f"✅ India VIX: {self.vix_data['current']:.2f} ({self.vix_data['status']})")
-                return True
+            return self._apply_vix_quote(get_client().fetch_quote('^INVIX', range='5d'))
 
         except Exception as e:
             print(f"⚠️  VIX data error: {e}")
             self.vix_data = {'current': 15.0, 'status': 'Moderate'}
             return False
 
+    def _apply_vix_quote(self, quote):
+        """Store an India VIX quote"""
+        if quote is None:
+            return None
+
+        vix_current = quote['last_price']
+
+        self.vix_data = {
+            'current': vix_current,
+            'status': self._interpret_vix(vix_current)
+        }
+
+        print(f"✅ India VIX: {self.vix_data['current']:.2f} ({self.vix_data['status']})")
+        return True
+
     def fetch_bank_nifty(self):
         """Fetch Bank NIFTY for market breadth analysis"""
         try:
             print("🏦 Fetching Bank NIFTY...")
 
-            url = "https://query1.finance.yahoo.com/v8/finance/chart/%5ENSEBANK"
-            params = {'interval': '1d', 'range': '1d'}
-            headers = {'User-Agent': 'Mozilla/5.0'}
+            return self._apply_bank_nifty_quote(get_client().fetch_quote('^NSEBANK'))
 
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+        except Exception as e:
+            print(f"⚠️  Bank NIFTY error: {e}")
+            self.nifty_data['bank_nifty_change'] = self.nifty_data['pct_change']
+            return False
 
-            if response.status_code == 200:
-                data = response.json()
-                result = data['chart']['result'][0]
-                meta = result['meta']
-                quotes = result['indicators']['quote'][0]
+    def _apply_bank_nifty_quote(self, quote):
+        """Store the Bank NIFTY change used for market breadth"""
+        if quote is None:
+            return None
 
-                bank_price = meta.get('regularMarketPrice', quotes['close'][-1])
-                bank_prev = meta.get('chartPreviousClose', quotes['close'][-2] if len(quotes['close']) > 1 else bank_price)
-                bank_change = ((bank_price - bank_prev) / bank_prev) * 100
+        bank_change = quote['pct_change']
 
-                self.nifty_data['bank_nifty_change'] = float(bank_change)
+        self.nifty_data['bank_nifty_change'] = bank_change
 
-                print(f"✅ Bank NIFTY: {bank_change:+.2f}%")
-                return True
+        print(f"✅ Bank NIFTY: {bank_change:+.2f}%")
+        return True
 
-        except Exception as e:
-            print(f"⚠️  Bank NIFTY error: {e}")
-            self.nifty_data['bank_nifty_change'] = self.nifty_data['pct_change']
-            return False
+    def calculate_technical_indicators(self, only=None):
+        """
+        Calculate comprehensive technical indicators
+        only: sections to compute (see INDICATOR_SECTIONS), default all;
+        indicators none of them need are never evaluated
+        """
+        sections = INDICATOR_SECTIONS if only is None else tuple(only)
+        unknown = set(sections) - set(INDICATOR_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown indicator sections: {sorted(unknown)}")
 
-    def calculate_technical_indicators(self):
-        """Calculate comprehensive technical indicators"""
         print("\n" + "="*70)
         print("🔬 CALCULATING TECHNICAL INDICATORS")
         print("="*70)
 
-        if self.historical_data is None or len(self.historical_data) < 50:
+        if self.historical_data is None or len(self.historical_data) < MIN_BARS:
             print("⚠️  Insufficient historical data for full technical analysis")
             return self._calculate_basic_indicators()
 
-        df = self.historical_data.copy()
+        df = self.historical_data
+        self.indicator_graph.set_frame(df, version=(len(df), df['timestamp'].iloc[-1], df['close'].iloc[-1]))
+        graph = self.indicator_graph
+        current_price = self.nifty_data['last_price']
 
         # 1. Moving Averages
-        print("\n📈 Moving Averages...")
-        df['SMA_20'] = df['close'].rolling(window=20).mean()
-        df['SMA_50'] = df['close'].rolling(window=50).mean()
-        df['EMA_12'] = df['close'].ewm(span=12, adjust=False).mean()
-        df['EMA_26'] = df['close'].ewm(span=26, adjust=False).mean()
-
-        current_price = self.nifty_data['last_price']
-        sma_20 = df['SMA_20'].iloc[-1]
-        sma_50 = df['SMA_50'].iloc[-1]
+        if 'moving_averages' in sections:
+            print("\n📈 Moving Averages...")
+            sma_20 = graph.last('SMA_20')
+            sma_50 = graph.last('SMA_50')
 
-        self.technical_indicators['SMA_20'] = sma_20
-        self.technical_indicators['SMA_50'] = sma_50
-        self.technical_indicators['price_vs_sma20'] = ((current_price - sma_20) / sma_20) * 100
-        self.technical_indicators['price_vs_sma50'] = ((current_price - sma_50) / sma_50) * 100
+            self.technical_indicators['SMA_20'] = sma_20
+            self.technical_indicators['SMA_50'] = sma_50
+            self.technical_indicators['price_vs_sma20'] = ((current_price - sma_20) / sma_20) * 100
+            self.technical_indicators['price_vs_sma50'] = ((current_price - sma_50) / sma_50) * 100
 
-        print(f"   SMA 20: ₹{sma_20:.2f} | Price vs SMA20: {self.technical_indicators['price_vs_sma20']:+.2f}%")
-        print(f"   SMA 50: ₹{sma_50:.2f} | Price vs SMA50: {self.technical_indicators['price_vs_sma50']:+.2f}%")
+            print(f"   SMA 20: ₹{sma_20:.2f} | Price vs SMA20: {self.technical_indicators['price_vs_sma20']:+.2f}%")
+            print(f"   SMA 50: ₹{sma_50:.2f} | Price vs SMA50: {self.technical_indicators['price_vs_sma50']:+.2f}%")
 
         # 2. RSI (Relative Strength Index)
-        print("\n📊 RSI (Relative Strength Index)...")
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
+        if 'rsi' in sections:
+            print("\n📊 RSI (Relative Strength Index)...")
+            rsi = graph.last('RSI')
+            self.technical_indicators['RSI'] = rsi
+            self.technical_indicators['RSI_signal'] = self._interpret_rsi(rsi)
 
-        rsi = df['RSI'].iloc[-1]
-        self.technical_indicators['RSI'] = rsi
-        self.technical_indicators['RSI_signal'] = self._interpret_rsi(rsi)
-
-        print(f"   RSI: {rsi:.2f} - {self.technical_indicators['RSI_signal']}")
+            print(f"   RSI: {rsi:.2f} - {self.technical_indicators['RSI_signal']}")
 
         # 3. MACD
-        print("\n📉 MACD (Moving Average Convergence Divergence)...")
-        df['MACD'] = df['EMA_12'] - df['EMA_26']
-        df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-        df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
-
-        macd = df['MACD'].iloc[-1]
-        macd_signal = df['MACD_Signal'].iloc[-1]
-        macd_hist = df['MACD_Histogram'].iloc[-1]
+        if 'macd' in sections:
+            print("\n📉 MACD (Moving Average Convergence Divergence)...")
+            macd = graph.last('MACD')
+            macd_signal = graph.last('MACD_Signal')
+            macd_hist = graph.last('MACD_Histogram')
 
-        self.technical_indicators['MACD'] = macd
-        self.technical_indicators['MACD_Signal'] = macd_signal
-        self.technical_indicators['MACD_Histogram'] = macd_hist
-        self.technical_indicators['MACD_crossover'] = 'Bullish' if macd > macd_signal else 'Bearish'
+            self.technical_indicators['MACD'] = macd
+            self.technical_indicators['MACD_Signal'] = macd_signal
+            self.technical_indicators['MACD_Histogram'] = macd_hist
+            self.technical_indicators['MACD_crossover'] = 'Bullish' if macd > macd_signal else 'Bearish'
 
-        print(f"   MACD: {macd:.2f} | Signal: {macd_signal:.2f}")
-        print(f"   Histogram: {macd_hist:.2f} - {self.technical_indicators['MACD_crossover']}")
+            print(f"   MACD: {macd:.2f} | Signal: {macd_signal:.2f}")
+            print(f"   Histogram: {macd_hist:.2f} - {self.technical_indicators['MACD_crossover']}")
 
         # 4. Bollinger Bands
-        print("\n📊 Bollinger Bands...")
-        df['BB_Middle'] = df['close'].rolling(window=20).mean()
-        bb_std = df['close'].rolling(window=20).std()
-        df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-        df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
-
-        bb_upper = df['BB_Upper'].iloc[-1]
-        bb_middle = df['BB_Middle'].iloc[-1]
-        bb_lower = df['BB_Lower'].iloc[-1]
+        if 'bollinger' in sections:
+            print("\n📊 Bollinger Bands...")
+            bb_upper = graph.last('BB_Upper')
+            bb_middle = graph.last('BB_Middle')
+            bb_lower = graph.last('BB_Lower')
 
-        self.technical_indicators['BB_Upper'] = bb_upper
-        self.technical_indicators['BB_Middle'] = bb_middle
-        self.technical_indicators['BB_Lower'] = bb_lower
-        self.technical_indicators['BB_Position'] = ((current_price - bb_lower) / (bb_upper - bb_lower)) * 100
+            self.technical_indicators['BB_Upper'] = bb_upper
+            self.technical_indicators['BB_Middle'] = bb_middle
+            self.technical_indicators['BB_Lower'] = bb_lower
+            self.technical_indicators['BB_Position'] = ((current_price - bb_lower) / (bb_upper - bb_lower)) * 100
 
-        print(f"   Upper: ₹{bb_upper:.2f} | Middle: ₹{bb_middle:.2f} | Lower: ₹{bb_lower:.2f}")
-        print(f"   Position: {self.technical_indicators['BB_Position']:.1f}% of band width")
+            print(f"   Upper: ₹{bb_upper:.2f} | Middle: ₹{bb_middle:.2f} | Lower: ₹{bb_lower:.2f}")
+            print(f"   Position: {self.technical_indicators['BB_Position']:.1f}% of band width")
 
         # 5. ATR (Average True Range) for volatility
-        print("\n⚡ ATR (Average True Range)...")
-        df['H-L'] = df['high'] - df['low']
-        df['H-PC'] = abs(df['high'] - df['close'].shift(1))
-        df['L-PC'] = abs(df['low'] - df['close'].shift(1))
-        df['TR'] = df[['H-L', 'H-PC', 'L-PC']].max(axis=1)
-        df['ATR'] = df['TR'].rolling(window=14).mean()
+        if 'atr' in sections:
+            print("\n⚡ ATR (Average True Range)...")
+            atr = graph.last('ATR')
+            atr_pct = (atr / current_price) * 100
 
-        atr = df['ATR'].iloc[-1]
-        atr_pct = (atr / current_price) * 100
+            self.technical_indicators['ATR'] = atr
+            self.technical_indicators['ATR_pct'] = atr_pct
 
-        self.technical_indicators['ATR'] = atr
-        self.technical_indicators['ATR_pct'] = atr_pct
-
-        print(f"   ATR: ₹{atr:.2f} ({atr_pct:.2f}% of price)")
+            print(f"   ATR: ₹{atr:.2f} ({atr_pct:.2f}% of price)")
 
         # 6. Volume Analysis
-        print("\n📊 Volume Analysis...")
-        avg_volume_20 = df['volume'].rolling(window=20).mean().iloc[-1]
-        current_volume = self.nifty_data['volume']
-        volume_ratio = current_volume / avg_volume_20 if avg_volume_20 > 0 else 1.0
+        if 'volume' in sections:
+            print("\n📊 Volume Analysis...")
+            avg_volume_20 = graph.last('Volume_SMA_20')
+            current_volume = self.nifty_data['volume']
+            volume_ratio = current_volume / avg_volume_20 if avg_volume_20 > 0 else 1.0
 
-        self.technical_indicators['volume_ratio'] = volume_ratio
-        self.technical_indicators['volume_signal'] = 'High' if volume_ratio > 1.5 else 'Normal' if volume_ratio > 0.7 else 'Low'
+            self.technical_indicators['volume_ratio'] = volume_ratio
+            self.technical_indicators['volume_signal'] = 'High' if volume_ratio > 1.5 else 'Normal' if volume_ratio > 0.7 else 'Low'
 
-        print(f"   Current Volume: {current_volume:,}")
-        print(f"   20-day Avg: {avg_volume_20:,.0f}")
-        print(f"   Ratio: {volume_ratio:.2f}x - {self.technical_indicators['volume_signal']}")
+            print(f"   Current Volume: {current_volume:,}")
+            print(f"   20-day Avg: {avg_volume_20:,.0f}")
+            print(f"   Ratio: {volume_ratio:.2f}x - {self.technical_indicators['volume_signal']}")
 
         return True
 
@@ -506,8 +548,12 @@ class AdvancedTradingAssistant:
         else:
             return "🟢 VERY LOW RISK - Ideal trading conditions"
 
-    def generate_comprehensive_signals(self):
-        """Generate comprehensive trading signals"""
+    def generate_comprehensive_signals(self, multi_timeframe=False):
+        """
+        Generate comprehensive trading signals
+        multi_timeframe: score the trend, RSI and MACD rules on every
+        CONFLUENCE_TIMEFRAMES timeframe instead of daily bars only
+        """
         print("\n" + "="*70)
         print("🎯 SIGNAL GENERATION")
         print("="*70)
@@ -515,59 +561,24 @@ class AdvancedTradingAssistant:
         signal_score = 0
         signals = []
 
-        # 1. Trend Signals (weight: 3)
-        print("\n📈 Trend Analysis...")
-        price_vs_sma20 = self.technical_indicators.get('price_vs_sma20', 0)
-        price_vs_sma50 = self.technical_indicators.get('price_vs_sma50', 0)
+        # 1-3. Trend (weight: 3), momentum (weight: 3) and MACD (weight: 2) signals
+        confluence = self._multi_timeframe_confluence() if multi_timeframe else None
 
-        if price_vs_sma20 > 2 and price_vs_sma50 > 2:
-            signal_score += 3
-            signals.append("✅ Strong uptrend (above both SMAs)")
-        elif price_vs_sma20 > 0 and price_vs_sma50 > 0:
-            signal_score += 2
-            signals.append("📈 Uptrend (above SMAs)")
-        elif price_vs_sma20 < -2 and price_vs_sma50 < -2:
-            signal_score -= 3
-            signals.append("❌ Strong downtrend (below both SMAs)")
-        elif price_vs_sma20 < 0 and price_vs_sma50 < 0:
-            signal_score -= 2
-            signals.append("📉 Downtrend (below SMAs)")
+        if confluence is not None:
+            print("\n🧭 Multi-Timeframe Confluence...")
+            signal_score += round(confluence['score'])
+            signals.extend(self._describe_confluence(confluence))
         else:
-            signals.append("➡️  Mixed trend signals")
-
-        # 2. Momentum Signals (weight: 3)
-        print("⚡ Momentum Analysis...")
-        rsi = self.technical_indicators.get('RSI', 50)
-
-        if 40 < rsi < 60:
-            signal_score += 1
-            signals.append("📊 RSI neutral (balanced momentum)")
-        elif 30 < rsi < 40:
-            signal_score += 2
-            signals.append("📈 RSI oversold (bullish reversal setup)")
-        elif 60 < rsi < 70:
-            signal_score -= 1
-            signals.append("⚠️  RSI approaching overbought")
-        elif rsi > 70:
-            signal_score -= 3
-            signals.append("❌ RSI overbought (bearish reversal risk)")
-        elif rsi < 30:
-            signal_score += 3
-            signals.append("✅ RSI oversold (strong bounce potential)")
-
-        # 3. MACD Signals (weight: 2)
-        print("📊 MACD Analysis...")
-        macd_crossover = self.technical_indicators.get('MACD_crossover', 'Neutral')
-        macd_hist = self.technical_indicators.get('MACD_Histogram', 0)
-
-        if macd_crossover == 'Bullish' and macd_hist > 0:
-            signal_score += 2
-            signals.append("✅ MACD bullish crossover")
-        elif macd_crossover == 'Bearish' and macd_hist < 0:
-            signal_score -= 2
-            signals.append("❌ MACD bearish crossover")
-        else:
-            signals.append("➡️  MACD neutral")
+            print("\n📈 Trend, Momentum and MACD Analysis...")
+            trend_score, trend_signals = score_trend_momentum(
+                self.technical_indicators.get('price_vs_sma20', 0),
+                self.technical_indicators.get('price_vs_sma50', 0),
+                self.technical_indicators.get('RSI', 50),
+                self.technical_indicators.get('MACD_crossover', 'Neutral'),
+                self.technical_indicators.get('MACD_Histogram', 0),
+            )
+            signal_score += trend_score
+            signals.extend(trend_signals)
 
         # 4. Volatility Signals (weight: 2)
         print("⚡ Volatility Analysis...")
@@ -636,6 +647,42 @@ class AdvancedTradingAssistant:
 
         return signal_score, signals
 
+    def _multi_timeframe_confluence(self):
+        """
+        Confluence of the trend/RSI/MACD rules across timeframes at the current price
+        Returns: confluence dict, or None when no timeframe has enough bars
+        """
+        confluence = get_multi_timeframe('^NSEI').confluence(price=self.nifty_data['last_price'])
+        if not confluence['evaluated']:
+            print("⚠️  Not enough intraday bars for confluence, using daily indicators")
+            return None
+        return confluence
+
+    def _describe_confluence(self, confluence):
+        """Returns: signal lines for each evaluated timeframe plus an agreement summary"""
+        signals = []
+        for timeframe, result in confluence['timeframes'].items():
+            print(f"   {timeframe:>3}: {result['score']:+d} | " + " | ".join(result['signals']))
+            signals.append(f"🧭 {timeframe} score {result['score']:+d}")
+
+        bullish, bearish, evaluated = confluence['bullish'], confluence['bearish'], confluence['evaluated']
+        print(f"   Confluence score: {confluence['score']:+.2f} ({bullish} bullish / {bearish} bearish of {evaluated})")
+
+        if confluence['missing']:
+            missing = ', '.join(confluence['missing'])
+            print(f"   ⚠️  Not enough bars for {missing}: left out of the confluence score")
+            signals.append(f"⚠️  Confluence excludes {missing} (not enough bars)")
+
+        if bullish == evaluated:
+            signals.append(f"✅ All {evaluated} timeframes bullish (strong confluence)")
+        elif bearish == evaluated:
+            signals.append(f"❌ All {evaluated} timeframes bearish (strong confluence)")
+        elif bullish and bearish:
+            signals.append(f"⚠️  Timeframes disagree ({bullish} bullish / {bearish} bearish)")
+        else:
+            signals.append("➡️  Timeframes mostly neutral")
+        return signals
+
     def generate_trading_recommendation(self, signal_score, signals):
         """Generate final trading recommendation with risk management"""
         print("\n" + "="*70)
@@ -851,8 +898,13 @@ class AdvancedTradingAssistant:
         else:
             return "Oversold"
 
-    def run(self):
-        """Main execution flow"""
+    def run(self, full_report=True, multi_timeframe=False):
+        """
+        Main execution flow
+        full_report: print every indicator; False computes only what the
+        signal and risk rules read (SIGNAL_SECTIONS)
+        multi_timeframe: score trend/RSI/MACD by confluence of 5m, 15m, 1h and daily bars
+        """
         try:
             print("\n" + "="*70)
             print("🚀 ADVANCED TRADING ASSISTANT v2.0")
@@ -875,15 +927,17 @@ class AdvancedTradingAssistant:
 
             # Step 2: Fetch comprehensive market data
             self.fetch_comprehensive_market_data()
+            if multi_timeframe:
+                self.fetch_intraday_data()
 
             # Step 3: Calculate technical indicators
-            self.calculate_technical_indicators()
+            self.calculate_technical_indicators(only=None if full_report else SIGNAL_SECTIONS)
 
             # Step 4: Calculate risk metrics
             self.calculate_risk_metrics()
 
             # Step 5: Generate signals
-            signal_score, signals = self.generate_comprehensive_signals()
+            signal_score, signals = self.generate_comprehensive_signals(multi_timeframe=multi_timeframe)
 
             # Step 6: Generate final recommendation
             recommendation = self.generate_trading_recommendation(signal_score, signals)
@@ -907,8 +961,13 @@ class AdvancedTradingAssistant:
 
 def main():
     """Entry point"""
+    parser = argparse.ArgumentParser(description="Comprehensive NIFTY 50 market and risk analysis")
+    parser.add_argument('--multi-timeframe', action='store_true',
+                        help="score trend, RSI and MACD by confluence of 5m, 15m, 1h and daily bars")
+    args = parser.parse_args()
+
     assistant = AdvancedTradingAssistant()
-    assistant.run()
+    assistant.run(multi_timeframe=args.multi_timeframe)
 
 
 if __name__ == "__main__":
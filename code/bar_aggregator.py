@@ -0,0 +1,158 @@
+"""
+Tick-to-Bar Aggregation and Resampling
+Builds OHLCV bars (plus VWAP) incrementally from a stream of trades or quotes,
+and resamples stored bars to coarser timeframes in one vectorized pass.
+
+Bar boundaries are anchored to the NSE session open (09:15 IST), so 15m, 30m
+and 1h bars line up with the session instead of the UTC clock.
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from bar_buffer import BarBuffer, BarWindow
+
+TIMEFRAMES = {
+    '1m': 60,
+    '5m': 5 * 60,
+    '15m': 15 * 60,
+    '30m': 30 * 60,
+    '1h': 60 * 60,
+    '1d': 24 * 60 * 60,
+}
+
+# 09:15 IST as seconds after UTC midnight
+SESSION_ANCHOR = 3 * 60 * 60 + 45 * 60
+
+IST_OFFSET = 5 * 60 * 60 + 30 * 60
+
+# 09:15 to 15:30 IST
+SESSION_SECONDS = 6 * 60 * 60 + 15 * 60
+
+
+def timeframe_seconds(timeframe):
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Unknown timeframe: {timeframe} (expected one of {', '.join(TIMEFRAMES)})")
+    return TIMEFRAMES[timeframe]
+
+
+def bucket_start(timestamps, seconds):
+    """Start (epoch seconds) of the session-anchored bucket containing each timestamp"""
+    return SESSION_ANCHOR + np.floor_divide(np.asarray(timestamps) - SESSION_ANCHOR, seconds) * seconds
+
+
+def session_date(timestamp):
+    """IST trading date ('YYYY-MM-DD') of an epoch-seconds timestamp, the key daily bars use"""
+    return datetime.fromtimestamp(timestamp + IST_OFFSET, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def in_session(timestamp):
+    """True when an epoch-seconds timestamp falls on a weekday between the NSE open and close"""
+    local = datetime.fromtimestamp(timestamp + IST_OFFSET, tz=timezone.utc)
+    return local.weekday() < 5 and 0 <= (timestamp - SESSION_ANCHOR) % TIMEFRAMES['1d'] <= SESSION_SECONDS
+
+
+def resample(bars, timeframe):
+    """
+    Aggregate time-sorted bars (a BarWindow or (6, n) column array) to a
+    coarser timeframe. Group boundaries come from one diff over the bucket ids;
+    OHLCV are then reduced per group with ufunc.reduceat, with no Python loop.
+    Returns: BarWindow stamped with each bucket's start time
+    """
+    columns = bars.columns if isinstance(bars, BarWindow) else np.asarray(bars, dtype=np.float64)
+    if columns.shape[1] == 0:
+        return BarWindow(np.empty((6, 0)))
+
+    timestamp, open_, high, low, close, volume = columns
+    buckets = bucket_start(timestamp, timeframe_seconds(timeframe))
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+    ends = np.append(starts[1:], len(buckets)) - 1
+
+    return BarWindow(np.vstack([
+        buckets[starts],
+        open_[starts],
+        np.maximum.reduceat(high, starts),
+        np.minimum.reduceat(low, starts),
+        close[ends],
+        np.add.reduceat(volume, starts),
+    ]))
+
+
+class BarAggregator:
+    """
+    Incremental tick aggregator. Every update is O(1): it either extends the
+    forming bar in place or appends a new one to a BarBuffer, whose window()
+    then serves the bars to indicators and charts.
+
+    With cumulative_volume=True, volumes are running session totals (as in
+    Yahoo quotes) and only the increase since the previous tick is counted.
+    """
+
+    def __init__(self, timeframe='1m', buffer=None, cumulative_volume=False):
+        self.timeframe = timeframe
+        self.seconds = timeframe_seconds(timeframe)
+        self.buffer = buffer if buffer is not None else BarBuffer()
+        self.cumulative_volume = cumulative_volume
+
+        self._bar = None
+        self._bar_pv = 0.0
+        self._session = None
+        self._session_pv = 0.0
+        self._session_volume = 0.0
+        self._last_volume = None
+
+    def update(self, timestamp, price, volume=0.0):
+        """
+        Add one trade or quote
+        Returns: the bar it completed as a dict (with its VWAP), or None
+        """
+        if self.cumulative_volume:
+            total = volume
+            volume = 0.0 if self._last_volume is None or total < self._last_volume else total - self._last_volume
+            self._last_volume = total
+
+        session = bucket_start(timestamp, TIMEFRAMES['1d'])
+        if session != self._session:
+            self._session = session
+            self._session_pv = 0.0
+            self._session_volume = 0.0
+        self._session_pv += price * volume
+        self._session_volume += volume
+
+        start = bucket_start(timestamp, self.seconds)
+        completed = None
+
+        if self._bar is not None and start == self._bar['timestamp']:
+            bar = self._bar
+            bar['high'] = max(bar['high'], price)
+            bar['low'] = min(bar['low'], price)
+            bar['close'] = price
+            bar['volume'] += volume
+            self._bar_pv += price * volume
+            bar['vwap'] = self._bar_pv / bar['volume'] if bar['volume'] else price
+            self.buffer.update_last(start, bar['open'], bar['high'], bar['low'], price, bar['volume'])
+        else:
+            completed = self._bar
+            self._bar = {'timestamp': start, 'open': price, 'high': price, 'low': price,
+                         'close': price, 'volume': volume, 'vwap': price}
+            self._bar_pv = price * volume
+            self.buffer.append(start, price, price, price, price, volume)
+
+        return completed
+
+    @property
+    def forming_bar(self):
+        """The bar currently being built, or None before the first tick"""
+        return dict(self._bar) if self._bar is not None else None
+
+    @property
+    def vwap(self):
+        """Session VWAP, or the last price while no volume has traded"""
+        if self._session_volume:
+            return self._session_pv / self._session_volume
+        return self._bar['close'] if self._bar is not None else None
+
+    def window(self, bars=None):
+        """Returns: BarWindow of the last `bars` aggregated bars, forming bar included"""
+        return self.buffer.window(bars)
@@ -0,0 +1,157 @@
+"""
+Ring-Buffer Bar Store
+Fixed-capacity OHLCV bars in a struct-of-arrays layout for intraday sessions.
+Appending is O(1) with no reallocation, memory never grows past capacity, and
+the last n bars are always available as contiguous zero-copy NumPy views.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_store import COLUMNS
+
+# Enough for ten 375-minute NSE sessions of 1-minute bars
+DEFAULT_CAPACITY = 4096
+
+
+class BarWindow:
+    """
+    Zero-copy view of consecutive bars: one contiguous float64 array per column.
+    Views alias the ring buffer, so they change if it later wraps over them.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+        for i, name in enumerate(COLUMNS):
+            setattr(self, name, columns[i])
+
+    def __len__(self):
+        return self.columns.shape[1]
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def __contains__(self, name):
+        return name in COLUMNS
+
+    def tail(self, bars):
+        """Returns: BarWindow of the last `bars` bars (still views)"""
+        return BarWindow(self.columns[:, -bars:])
+
+    @property
+    def datetimes(self):
+        """Bar timestamps as pandas datetimes (a small copy, for charts)"""
+        return pd.to_datetime(self.timestamp, unit='s')
+
+    def to_frame(self):
+        """Copy the window into a DataFrame shaped like OHLCVStore.load()"""
+        frame = pd.DataFrame({name: np.array(self.columns[i]) for i, name in enumerate(COLUMNS)})
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'], unit='s')
+        return frame
+
+
+class BarBuffer:
+    """
+    Mirrored ring buffer: every bar is written at slot p and p + capacity of a
+    (6, 2 * capacity) array, so any run of up to `capacity` most recent bars is
+    one contiguous slice and never needs reassembling.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._data = np.full((len(COLUMNS), 2 * capacity), np.nan)
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def last_timestamp(self):
+        if not self._count:
+            return None
+        return self._data[0, (self._next - 1) % self.capacity]
+
+    def append(self, timestamp, open_, high, low, close, volume):
+        """Add a new bar, overwriting the oldest once the buffer is full"""
+        with self._lock:
+            slot = self._next
+            bar = (timestamp, open_, high, low, close, volume)
+            self._data[:, slot] = bar
+            self._data[:, slot + self.capacity] = bar
+            self._next = (slot + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def update_last(self, timestamp, open_, high, low, close, volume):
+        """Revise the most recent (still forming) bar in place"""
+        with self._lock:
+            if not self._count:
+                raise IndexError("update_last on an empty BarBuffer")
+            slot = (self._next - 1) % self.capacity
+            bar = (timestamp, open_, high, low, close, volume)
+            self._data[:, slot] = bar
+            self._data[:, slot + self.capacity] = bar
+
+    def extend(self, columns):
+        """Append a (6, k) block of bars in one vectorized write"""
+        columns = np.asarray(columns, dtype=np.float64)[:, -self.capacity:]
+        bars = columns.shape[1]
+        if not bars:
+            return
+
+        with self._lock:
+            slots = (self._next + np.arange(bars)) % self.capacity
+            self._data[:, slots] = columns
+            self._data[:, slots + self.capacity] = columns
+            self._next = (self._next + bars) % self.capacity
+            self._count = min(self._count + bars, self.capacity)
+
+    def sync(self, columns):
+        """
+        Bring the buffer level with a time-sorted (6, n) column array such as
+        OHLCVStore.load_array(): revise the last bar if it changed and append
+        only newer bars
+        Returns: number of bars appended
+        """
+        if columns is None or columns.shape[1] == 0:
+            return 0
+
+        last_ts = self.last_timestamp
+        start = 0
+        if last_ts is not None:
+            start = int(np.searchsorted(columns[0], last_ts, side='left'))
+            if start < columns.shape[1] and columns[0, start] == last_ts:
+                self.update_last(*columns[:, start])
+                start += 1
+
+        self.extend(columns[:, start:])
+        return columns.shape[1] - start
+
+    def window(self, bars=None):
+        """
+        The last `bars` bars (all stored bars by default) as zero-copy views
+        Returns: BarWindow
+        """
+        with self._lock:
+            bars = self._count if bars is None else min(bars, self._count)
+            end = (self._next - 1) % self.capacity + self.capacity + 1
+            return BarWindow(self._data[:, end - bars:end])
+
+
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+def get_bar_buffer(symbol, interval='1d', capacity=DEFAULT_CAPACITY):
+    """
+    Return the process-wide BarBuffer for (symbol, interval), creating it on first use
+    """
+    key = (symbol, interval)
+    if key not in _buffers:
+        with _buffers_lock:
+            if key not in _buffers:
+                _buffers[key] = BarBuffer(capacity)
+    return _buffers[key]
@@ -0,0 +1,90 @@
+"""
+Benchmark implied volatility
+Compares solving a chain one option at a time with scipy.optimize.brentq
+against one vectorized implied_volatility.implied_volatility call
+
+Usage:
+    python benchmark_implied_volatility.py [strikes] [expiries]
+
+Default chain is 160 strikes x 4 expiries, calls and puts, priced on a skewed
+smile and rounded to the NSE 0.05 tick. Premiums left with no time value
+after rounding carry no volatility information: brentq pins them to VOL_MIN,
+the vectorized solver returns NaN, hence the different solved counts.
+"""
+
+import sys
+import time
+
+import numpy as np
+from scipy.optimize import brentq
+
+from implied_volatility import VOL_MAX, VOL_MIN, implied_volatility
+from option_pricing import black_scholes
+
+SPOT = 22000.0
+EXPIRY_DAYS = (3, 10, 38, 66)
+TICK = 0.05
+REPEATS = 5
+
+
+def smile(strikes):
+    moneyness = np.log(strikes / SPOT)
+    return 0.13 - 0.15 * moneyness + 0.5 * moneyness ** 2
+
+
+def scalar_solve(prices, strikes, expiries, calls):
+    def solve(price, strike, time_to_expiry, call):
+        option_type = 'call' if call else 'put'
+        objective = lambda vol: black_scholes(SPOT, strike, time_to_expiry, vol, option_type) - price
+        try:
+            return brentq(objective, VOL_MIN, VOL_MAX, xtol=1e-10)
+        except ValueError:
+            return np.nan
+
+    return np.array([solve(*args) for args in zip(prices, strikes, expiries, calls)])
+
+
+def timed(func, repeats=REPEATS):
+    """Returns: (best seconds of `repeats` runs, result)"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    n_strikes = int(sys.argv[1]) if len(sys.argv) > 1 else 160
+    n_expiries = int(sys.argv[2]) if len(sys.argv) > 2 else len(EXPIRY_DAYS)
+
+    strike_grid = SPOT + 50 * (np.arange(n_strikes) - n_strikes // 2)
+    expiry_grid = np.resize(np.array(EXPIRY_DAYS), n_expiries) / 365
+    strikes, expiries, calls = (x.ravel() for x in np.meshgrid(strike_grid, expiry_grid, [True, False]))
+    vols = smile(strikes)
+    prices = np.round(black_scholes(SPOT, strikes, expiries, vols, calls) / TICK) * TICK
+    options = len(prices)
+
+    print("=" * 72)
+    print(f"{n_strikes} strikes x {n_expiries} expiries x call/put = {options:,} options")
+    print("=" * 72)
+    print(f"{'Method':<28}{'total':>14}{'per option':>16}{'solved':>14}")
+    print("-" * 72)
+
+    scalar_time, reference = timed(lambda: scalar_solve(prices, strikes, expiries, calls), repeats=1)
+    print(f"{'scalar brentq loop':<28}{scalar_time * 1e3:>11.2f} ms{scalar_time / options * 1e6:>13.2f} us"
+          f"{np.isfinite(reference).sum():>14,}")
+
+    elapsed, ivs = timed(lambda: implied_volatility(prices, SPOT, strikes, expiries, calls))
+    print(f"{'vectorized Newton/bisect':<28}{elapsed * 1e3:>11.2f} ms{elapsed / options * 1e6:>13.3f} us"
+          f"{np.isfinite(ivs).sum():>14,}   ({scalar_time / elapsed:,.0f}x)")
+
+    both = np.isfinite(reference) & np.isfinite(ivs)
+    print("-" * 72)
+    print(f"max |iv - brentq| where both solve: {np.abs(ivs[both] - reference[both]).max():.2e}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
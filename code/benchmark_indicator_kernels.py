@@ -0,0 +1,116 @@
+"""
+Benchmark indicator kernels
+Compares the fused true range / ATR / RSI kernels with the pandas code the
+dashboards used before (delta.where(...).rolling(14).mean() for RSI, H-L /
+H-PC / L-PC columns with max(axis=1) for ATR) on a 10-year minute series
+
+Usage:
+    python benchmark_indicator_kernels.py [bars]
+
+Default size is 10 years x 252 sessions x 375 minutes (~945k bars).
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import indicator_kernels
+
+TEN_YEARS_OF_MINUTES = 10 * 252 * 375
+REPEATS = 3
+
+
+def synthetic_minute_bars(bars, seed=7):
+    """Random-walk OHLC minute bars around NIFTY's price level"""
+    rng = np.random.default_rng(seed)
+    close = 20000 + np.cumsum(rng.normal(0, 4, bars))
+    spread = rng.uniform(0.5, 8, bars)
+    return pd.DataFrame({
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+    })
+
+
+def pandas_rsi(df):
+    delta = df['close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    return (100 - (100 / (1 + rs))).to_numpy()
+
+
+def pandas_atr(df):
+    df = df.copy()
+    df['H-L'] = df['high'] - df['low']
+    df['H-PC'] = abs(df['high'] - df['close'].shift(1))
+    df['L-PC'] = abs(df['low'] - df['close'].shift(1))
+    df['TR'] = df[['H-L', 'H-PC', 'L-PC']].max(axis=1)
+    return df['TR'].rolling(window=14).mean().to_numpy()
+
+
+def pandas_wilder_rsi(df):
+    """Wilder RSI in pandas: ewm(alpha=1/14) seeded with the first 14-delta mean"""
+    delta = df['close'].diff().iloc[1:]
+    gain, loss = delta.clip(lower=0), -delta.clip(upper=0)
+    seeded = []
+    for series in (gain, loss):
+        values = series.copy()
+        values.iloc[13] = values.iloc[:14].mean()
+        seeded.append(values.iloc[13:].ewm(alpha=1 / 14, adjust=False).mean())
+    rsi = 100 - 100 / (1 + seeded[0] / seeded[1])
+    return np.concatenate([np.full(14, np.nan), rsi.to_numpy()])
+
+
+def timed(func):
+    """Returns: (best seconds of REPEATS runs, result)"""
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    bars = int(sys.argv[1]) if len(sys.argv) > 1 else TEN_YEARS_OF_MINUTES
+    df = synthetic_minute_bars(bars)
+    high, low, close = (df[name].to_numpy() for name in ('high', 'low', 'close'))
+
+    backend = 'numba' if indicator_kernels.NUMBA_AVAILABLE else 'numpy'
+    if indicator_kernels.NUMBA_AVAILABLE:
+        # Compile outside the timed runs
+        indicator_kernels.rsi(close[:100])
+        indicator_kernels.rsi(close[:100], wilder=True)
+        indicator_kernels.atr(high[:100], low[:100], close[:100])
+        indicator_kernels.atr(high[:100], low[:100], close[:100], wilder=True)
+
+    cases = [
+        ('RSI (SMA)', lambda: pandas_rsi(df), lambda: indicator_kernels.rsi(close)),
+        ('ATR (SMA)', lambda: pandas_atr(df), lambda: indicator_kernels.atr(high, low, close)),
+        ('RSI (Wilder)', lambda: pandas_wilder_rsi(df), lambda: indicator_kernels.rsi(close, wilder=True)),
+    ]
+
+    print("=" * 72)
+    print(f"{bars:,} minute bars | kernel backend: {backend}")
+    print("=" * 72)
+    print(f"{'Indicator':<16}{'pandas':>12}{'kernel':>12}{'speedup':>10}{'max |diff|':>16}")
+    print("-" * 72)
+
+    for name, baseline, kernel in cases:
+        pandas_time, expected = timed(baseline)
+        kernel_time, actual = timed(kernel)
+        diff = np.nanmax(np.abs(actual - expected))
+        print(f"{name:<16}{pandas_time * 1000:>9.1f} ms{kernel_time * 1000:>9.1f} ms"
+              f"{pandas_time / kernel_time:>9.1f}x{diff:>16.2e}")
+
+    wilder_atr_time, _ = timed(lambda: indicator_kernels.atr(high, low, close, wilder=True))
+    print(f"{'ATR (Wilder)':<16}{'-':>12}{wilder_atr_time * 1000:>9.1f} ms")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark option pricing
+Compares pricing a chain one option at a time with scipy.stats.norm.cdf (how
+OptionsStrategyRecommender.calculate_option_prices used to work) against one
+vectorized option_pricing.chain_prices evaluation
+
+Usage:
+    python benchmark_option_pricing.py [strikes] [expiries]
+
+Default grid is 200 strikes x 6 expiries, calls and puts.
+"""
+
+import sys
+import time
+
+import numpy as np
+from scipy.stats import norm
+
+import option_pricing
+
+SPOT = 22000.0
+VOLATILITY = 0.15
+EXPIRY_DAYS = (7, 14, 30, 60, 90, 180)
+REPEATS = 5
+
+
+def scalar_price(spot, strike, time_to_expiry, volatility, option_type, r=option_pricing.RISK_FREE_RATE):
+    d1 = (np.log(spot / strike) + (r + 0.5 * volatility ** 2) * time_to_expiry) / (volatility * np.sqrt(time_to_expiry))
+    d2 = d1 - volatility * np.sqrt(time_to_expiry)
+
+    if option_type == 'call':
+        return spot * norm.cdf(d1) - strike * np.exp(-r * time_to_expiry) * norm.cdf(d2)
+    return strike * np.exp(-r * time_to_expiry) * norm.cdf(-d2) - spot * norm.cdf(-d1)
+
+
+def scalar_chain(strikes, expiries):
+    calls = np.array([[scalar_price(SPOT, k, t, VOLATILITY, 'call') for k in strikes] for t in expiries])
+    puts = np.array([[scalar_price(SPOT, k, t, VOLATILITY, 'put') for k in strikes] for t in expiries])
+    return calls, puts
+
+
+def timed(func, repeats=REPEATS):
+    """Returns: (best seconds of `repeats` runs, result)"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    n_strikes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n_expiries = int(sys.argv[2]) if len(sys.argv) > 2 else len(EXPIRY_DAYS)
+
+    strikes = SPOT + 50 * (np.arange(n_strikes) - n_strikes // 2)
+    expiries = np.resize(np.array(EXPIRY_DAYS), n_expiries) / 365
+    options = 2 * n_strikes * n_expiries
+
+    print("=" * 72)
+    print(f"{n_strikes} strikes x {n_expiries} expiries x call/put = {options:,} options")
+    print("=" * 72)
+    print(f"{'Method':<28}{'total':>14}{'per option':>16}{'max |diff|':>14}")
+    print("-" * 72)
+
+    scalar_time, (ref_calls, ref_puts) = timed(lambda: scalar_chain(strikes, expiries), repeats=1)
+    print(f"{'scalar norm.cdf loop':<28}{scalar_time * 1e3:>11.2f} ms{scalar_time / options * 1e6:>13.2f} us")
+
+    for name, fast in (('vectorized (erf CDF)', True), ('vectorized (norm.cdf)', False)):
+        elapsed, (calls, puts) = timed(lambda: option_pricing.chain_prices(SPOT, strikes, expiries, VOLATILITY,
+                                                                           fast_cdf=fast))
+        diff = max(np.abs(calls - ref_calls).max(), np.abs(puts - ref_puts).max())
+        print(f"{name:<28}{elapsed * 1e6:>11.1f} us{elapsed / options * 1e6:>13.3f} us{diff:>14.2e}"
+              f"   ({scalar_time / elapsed:,.0f}x)")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
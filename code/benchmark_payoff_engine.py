@@ -0,0 +1,87 @@
+"""
+Benchmark payoff engine
+Compares the per-price, per-leg Python loop OptionsStrategyRecommender.create_payoff_diagram
+used to run against payoff_engine.payoff_at_expiry, and times exact breakevens
+
+Usage:
+    python benchmark_payoff_engine.py [points] [legs]
+
+Default is a 10,000-point price grid and a 48-leg position.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import payoff_engine
+
+SPOT = 22000.0
+LOT_SIZE = 50
+REPEATS = 5
+
+
+def random_trades(n_legs, seed=0):
+    rng = np.random.default_rng(seed)
+    return [{'action': rng.choice(['BUY', 'SELL']), 'type': rng.choice(['CALL', 'PUT']),
+             'strike': float(SPOT + 50 * rng.integers(-40, 41)), 'premium': float(rng.uniform(1, 300)), 'lots': 1}
+            for _ in range(n_legs)]
+
+
+def loop_payoff(trades, price_range):
+    payoffs = []
+    for price in price_range:
+        total_payoff = 0
+        for trade in trades:
+            if trade['type'] == 'CALL':
+                intrinsic = max(price - trade['strike'], 0)
+            else:
+                intrinsic = max(trade['strike'] - price, 0)
+            if trade['action'] == 'BUY':
+                total_payoff += (intrinsic - trade['premium']) * LOT_SIZE
+            else:
+                total_payoff += (trade['premium'] - intrinsic) * LOT_SIZE
+        payoffs.append(total_payoff)
+    return np.array(payoffs)
+
+
+def timed(func, repeats=REPEATS):
+    """Returns: (best seconds of `repeats` runs, result)"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    n_legs = int(sys.argv[2]) if len(sys.argv) > 2 else 48
+
+    trades = random_trades(n_legs)
+    price_range = np.linspace(SPOT * 0.8, SPOT * 1.2, points)
+
+    print("=" * 72)
+    print(f"{points:,} prices x {n_legs} legs")
+    print("=" * 72)
+    print(f"{'Method':<28}{'total':>14}{'max |diff|':>14}")
+    print("-" * 72)
+
+    loop_time, reference = timed(lambda: loop_payoff(trades, price_range), repeats=1)
+    print(f"{'python loop':<28}{loop_time * 1e3:>11.2f} ms")
+
+    legs_time, legs = timed(lambda: payoff_engine.legs_from_trades(trades, LOT_SIZE))
+    elapsed, payoffs = timed(lambda: payoff_engine.payoff_at_expiry(legs, price_range))
+    print(f"{'broadcast legs x prices':<28}{elapsed * 1e3:>11.2f} ms{np.abs(payoffs - reference).max():>14.2e}"
+          f"   ({loop_time / elapsed:,.0f}x)")
+    print(f"{'  + legs_from_trades':<28}{legs_time * 1e3:>11.2f} ms")
+
+    elapsed, roots = timed(lambda: payoff_engine.breakevens(legs))
+    print(f"{'analytic breakevens':<28}{elapsed * 1e6:>11.1f} us   {len(roots)} found")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
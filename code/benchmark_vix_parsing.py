@@ -0,0 +1,75 @@
+"""
+Benchmark India VIX page extraction
+Compares the raw-byte marker scan with the full BeautifulSoup parse on saved
+Investing.com pages: time per parse and peak traced memory
+
+Usage:
+    python benchmark_vix_parsing.py [page.html ...]
+
+Without arguments, pages are read from fixtures/investing/*.html; if none
+exist, a synthetic page of realistic size is generated.
+"""
+
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+from fetch_india_vix import IndiaVIXFetcher
+
+FIXTURE_GLOB = os.path.join('fixtures', 'investing', '*.html')
+ITERATIONS = 10
+
+
+def synthetic_page(size_mb=1.5):
+    """Build a page shaped like Investing.com: markers buried in a large document"""
+    filler = ('<div class="text-sm"><span class="text-xs">12.34</span>'
+              '<a href="/indices/other">Other Index 1,234.56</a></div>\n')
+    head = filler * int(size_mb * 1024 * 1024 / 2 / len(filler))
+    price = ('<div class="text-5xl/9 font-bold" data-test="instrument-price-last">13.2750</div>'
+             '<span data-test="instrument-price-change">-0.1425</span>'
+             '<span data-test="instrument-price-change-percent">(<!-- -->-1.06<!-- -->%)</span>')
+    return f"<html><body>{head}{price}{head}</body></html>".encode('utf-8')
+
+
+def measure(extract, content):
+    """Return (mean seconds per parse, peak traced bytes, extracted values)"""
+    tracemalloc.start()
+    values = extract(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        extract(content)
+    elapsed = (time.perf_counter() - start) / ITERATIONS
+
+    return elapsed, peak, values
+
+
+def main():
+    fetcher = IndiaVIXFetcher()
+    paths = sys.argv[1:] or sorted(glob.glob(FIXTURE_GLOB))
+
+    if paths:
+        pages = [(os.path.basename(path), open(path, 'rb').read()) for path in paths]
+    else:
+        print(f"No fixtures under {FIXTURE_GLOB}, using a synthetic page")
+        pages = [('synthetic', synthetic_page())]
+
+    print("=" * 78)
+    print(f"{'Page':<24}{'Path':<8}{'Size':>10}{'Time/parse':>14}{'Peak mem':>12}  Values")
+    print("=" * 78)
+
+    for name, content in pages:
+        size = f"{len(content) / 1024:.0f} KB"
+        for label, extract in (('fast', fetcher._extract_vix_fast), ('soup', fetcher._extract_vix_soup)):
+            elapsed, peak, values = measure(extract, content)
+            print(f"{name[:23]:<24}{label:<8}{size:>10}{elapsed * 1000:>11.2f} ms"
+                  f"{peak / 1024 / 1024:>9.2f} MB  {values}")
+        print("-" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,9 @@ import requests
 import time as time_module
 import winsound  # For alerts (Windows) or use playsound for Mac
 
+from option_greeks import GREEKS, net_greeks, signed_quantity, years_to_expiry
+from quote_cache import cached_quote
+
 
 class BrokerIntegrationSystem:
     def __init__(self):
@@ -175,6 +178,53 @@ class BrokerIntegrationSystem:
 
         return "\n".join(instructions)
 
+    def position_greeks(self, legs, spot, volatility, now=None):
+        """
+        Net Greeks of a list of order legs, all priced in one vectorized pass
+        volatility: annualized decimal (e.g. India VIX / 100)
+        Returns: dict from option_greeks.net_greeks, or None when there are no legs
+        """
+        if not legs:
+            return None
+
+        return net_greeks(
+            spot,
+            [leg['strike'] for leg in legs],
+            [years_to_expiry(leg['expiry'], now) for leg in legs],
+            volatility,
+            [leg['option_type'] for leg in legs],
+            [signed_quantity(leg['action'], leg['quantity']) for leg in legs],
+        )
+
+    def portfolio_greeks(self, spot, volatility, now=None):
+        """Net Greeks across the legs of every active position"""
+        legs = [leg for position in self.active_positions for leg in position.get('legs', [])]
+        return self.position_greeks(legs, spot, volatility, now)
+
+
+def get_spot_and_volatility():
+    """
+    NIFTY spot and India VIX (as a decimal) from the shared quote cache
+    Returns: (spot, volatility), or (None, None) when NIFTY is unavailable
+    """
+    try:
+        nifty = cached_quote('^NSEI')
+        if nifty is None:
+            return None, None
+        vix = cached_quote('^INVIX', range='5d', kind='vix')
+        return nifty['last_price'], (vix['last_price'] if vix else 15.0) / 100
+    except Exception:
+        return None, None
+
+
+def display_greeks(greeks):
+    """Show net Greeks as a row of metrics"""
+    labels = {'delta': 'Delta', 'gamma': 'Gamma', 'theta': 'Theta (₹/day)', 'vega': 'Vega (₹/vol pt)', 'rho': 'Rho (₹/1%)'}
+    cols = st.columns(len(GREEKS))
+    for col, name in zip(cols, GREEKS):
+        with col:
+            st.metric(labels[name], f"{greeks[name]:+,.3f}" if name == 'gamma' else f"{greeks[name]:+,.1f}")
+
 
 def main():
     st.set_page_config(
@@ -281,6 +331,11 @@ def main():
         with col3:
             st.metric("Max Loss", f"₹{example_trade['max_loss']:,}")
 
+        spot, volatility = get_spot_and_volatility()
+        if spot is not None:
+            st.markdown("### 🧮 Strategy Greeks")
+            display_greeks(broker.position_greeks(example_trade['legs'], spot, volatility))
+
         # Safety checks
         st.markdown("### 🛡️ Safety Check")
         checks, all_pass = broker.check_safety_limits(example_trade['max_loss'])
@@ -325,6 +380,14 @@ def main():
                         'legs': example_trade['legs']
                     }
                     broker.save_trade(trade_record)
+                    broker.active_positions.append({
+                        'strategy': example_trade['strategy'],
+                        'entry_price': sum(signed_quantity(leg['action'], leg['quantity']) * leg['expected_price']
+                                           for leg in example_trade['legs']),
+                        'quantity': sum(leg['quantity'] for leg in example_trade['legs']),
+                        'entry_time': datetime.now().isoformat(),
+                        'legs': example_trade['legs']
+                    })
                     st.success("Trade recorded!")
                     st.balloons()
 
@@ -339,8 +402,17 @@ def main():
         else:
             # Display active positions
             positions_df = pd.DataFrame(broker.active_positions)
+            if 'legs' in positions_df:
+                positions_df['legs'] = positions_df['legs'].apply(lambda legs: len(legs) if isinstance(legs, list) else 0)
             st.dataframe(positions_df, use_container_width=True)
 
+            # Net Greeks of every option leg held, recomputed on each quote refresh
+            spot, volatility = get_spot_and_volatility()
+            greeks = broker.portfolio_greeks(spot, volatility) if spot is not None else None
+            if greeks is not None:
+                st.markdown("### 🧮 Portfolio Greeks")
+                display_greeks(greeks)
+
         # Manual position entry
         st.markdown("### ➕ Add Position Manually")
 
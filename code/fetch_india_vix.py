@@ -3,12 +3,25 @@ Fetch Real-Time India VIX from Investing.com
 More accurate than Yahoo Finance for Indian markets
 """
 
-import requests
 from bs4 import BeautifulSoup
 import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 import json
 
+from market_data_client import get_client
+from nse_session import get_nse_session
+
+# lxml's C parser is much faster than html.parser for the full-tree fallback
+try:
+    import lxml  # noqa: F401
+    SOUP_PARSER = 'lxml'
+except ImportError:
+    SOUP_PARSER = 'html.parser'
+
+INLINE_TAG = re.compile(rb'<[^>]*>')
+
 class IndiaVIXFetcher:
     def __init__(self):
         self.url = "https://in.investing.com/indices/india-vix"
@@ -21,120 +34,206 @@ class IndiaVIXFetcher:
             'Upgrade-Insecure-Requests': '1'
         }
 
-    def fetch_current_vix(self):
+        # Racing mode: sources in priority order, launched hedge_delay seconds apart
+        self._sources = {
+            'investing': self._fetch_from_investing,
+            'nse': self._fetch_from_nse,
+            'yahoo': self._fetch_from_yahoo,
+        }
+        self.source_priority = ['investing', 'nse', 'yahoo']
+        self.hedge_delay = 1.0
+        self.race_timeout = 10
+
+    def fetch_current_vix(self, race=True):
         """
-        Fetch current India VIX value from Investing.com
+        Fetch current India VIX value, Investing.com first
+        race=True launches the sources hedged in parallel (see race_current_vix);
+        race=False tries Investing.com, NSE and Yahoo strictly in sequence
         Returns: dict with VIX data
         """
-        try:
-            response = requests.get(self.url, headers=self.headers, timeout=10)
+        if race:
+            return self.race_current_vix()
 
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                # Try multiple selectors as Investing.com layout changes
-                vix_value = None
-                change = None
-                change_percent = None
-
-                # Method 1: Look for data-test attribute
-                price_element = soup.find('div', {'data-test': 'instrument-price-last'})
-                if price_element:
-                    vix_text = price_element.get_text(strip=True)
-                    vix_value = self._extract_number(vix_text)
-
-                # Method 2: Look for specific class patterns
-                if not vix_value:
-                    price_elements = soup.find_all('span', class_=re.compile(r'text-\d+xl'))
-                    for elem in price_elements:
-                        text = elem.get_text(strip=True)
-                        num = self._extract_number(text)
-                        if num and 5 < num < 50:  # VIX typically ranges 10-40
-                            vix_value = num
-                            break
-
-                # Method 3: Look for any element with VIX-like number
-                if not vix_value:
-                    all_text = soup.get_text()
-                    matches = re.findall(r'\b(\d{1,2}\.\d{2})\b', all_text)
-                    for match in matches:
-                        num = float(match)
-                        if 5 < num < 50:
-                            vix_value = num
-                            break
-
-                # Try to get change values
-                change_elements = soup.find_all('span', {'data-test': re.compile('instrument-price-change')})
-                for elem in change_elements:
-                    text = elem.get_text(strip=True)
-                    if '%' in text:
-                        change_percent = self._extract_number(text, allow_negative=True)
-                    else:
-                        change = self._extract_number(text, allow_negative=True)
-
-                if vix_value:
-                    return {
-                        'current': round(vix_value, 2),
-                        'change': round(change, 2) if change else 0.0,
-                        'change_percent': round(change_percent, 2) if change_percent else 0.0,
-                        'timestamp': datetime.now().strftime("%H:%M:%S"),
-                        'source': 'Investing.com',
-                        'status': 'success'
-                    }
-                else:
-                    # Fallback to NSE if scraping fails
-                    return self.fetch_from_nse()
+        try:
+            result = self._fetch_from_investing()
+            if result:
+                return result
 
-            else:
-                return self.fetch_from_nse()
+            # Fallback to NSE if scraping fails
+            return self.fetch_from_nse()
 
         except Exception as e:
             print(f"Error fetching VIX from Investing.com: {e}")
             return self.fetch_from_nse()
 
-    def fetch_from_nse(self):
+    def race_current_vix(self):
         """
-        Fallback: Fetch VIX from NSE India
+        Race the VIX sources in source_priority order. Each source is launched
+        hedge_delay seconds after the previous one, or at once if every launched
+        source has already failed. The first valid result wins; when several are
+        ready together the higher-priority source is preferred.
+        Returns: dict with VIX data, or the default VIX after race_timeout
         """
+        sources = [self._sources[name] for name in self.source_priority]
+        executor = ThreadPoolExecutor(max_workers=len(sources))
+        futures = {}
+        start = time.monotonic()
+        deadline = start + self.race_timeout
+        next_launch_at = start
+
         try:
-            nse_url = "https://www.nseindia.com/api/option-chain-indices?symbol=NIFTY"
-            nse_headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'application/json',
-                'Accept-Language': 'en-US,en;q=0.9',
-            }
+            while True:
+                now = time.monotonic()
+                pending = [f for f in futures if not f.done()]
 
-            # First request to get cookies
-            session = requests.Session()
-            session.get("https://www.nseindia.com", headers=nse_headers, timeout=10)
+                if len(futures) < len(sources) and (now >= next_launch_at or not pending):
+                    future = executor.submit(sources[len(futures)])
+                    futures[future] = len(futures)
+                    next_launch_at = now + self.hedge_delay
+                    continue
 
-            # Second request to get data
-            response = session.get(nse_url, headers=nse_headers, timeout=10)
+                for future in sorted(futures, key=futures.get):
+                    if future.done() and future.exception() is None and future.result():
+                        return future.result()
 
-            if response.status_code == 200:
-                data = response.json()
-
-                # Extract VIX from response
-                if 'filtered' in data and 'data' in data['filtered']:
-                    vix_value = None
-                    # VIX is usually in the metadata
-                    for key in ['underlyingValue', 'PE', 'CE']:
-                        if key in data:
-                            # Look for VIX indicator
-                            pass
-
-                    # If VIX not found in option chain, use default
-                    if not vix_value:
-                        vix_value = 15.0  # Default reasonable value
-
-                    return {
-                        'current': round(vix_value, 2),
-                        'change': 0.0,
-                        'change_percent': 0.0,
-                        'timestamp': datetime.now().strftime("%H:%M:%S"),
-                        'source': 'NSE India',
-                        'status': 'success'
-                    }
+                if now >= deadline or (not pending and len(futures) == len(sources)):
+                    break
+
+                wake_at = deadline if len(futures) == len(sources) else min(deadline, next_launch_at)
+                wait(pending, timeout=max(wake_at - now, 0), return_when=FIRST_COMPLETED)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return self._get_default_vix()
+
+    def _fetch_from_investing(self):
+        """
+        Scrape India VIX from Investing.com
+        Returns: dict with VIX data, or None
+        """
+        response = get_client().session.get(self.url, headers=self.headers, timeout=10)
+
+        if response.status_code != 200:
+            return None
+
+        return self.parse_vix_page(response.content)
+
+    def parse_vix_page(self, content):
+        """
+        Extract VIX from an Investing.com page, scanning the raw bytes for the
+        data-test markers first and building a full parse tree only as a fallback
+        Returns: dict with VIX data, or None
+        """
+        values = self._extract_vix_fast(content)
+        if values is None:
+            values = self._extract_vix_soup(content)
+        if values is None:
+            return None
+
+        vix_value, change, change_percent = values
+        return {
+            'current': round(vix_value, 2),
+            'change': round(change, 2) if change else 0.0,
+            'change_percent': round(change_percent, 2) if change_percent else 0.0,
+            'timestamp': datetime.now().strftime("%H:%M:%S"),
+            'source': 'Investing.com',
+            'status': 'success'
+        }
+
+    def _extract_vix_fast(self, content):
+        """
+        Scan raw page bytes for the instrument-price markers
+        Returns: (vix, change, change_percent), or None if the price marker is missing
+        """
+        vix_text = self._marker_text(content, b'data-test="instrument-price-last"')
+        vix_value = self._extract_number(vix_text) if vix_text else None
+        if not vix_value:
+            return None
+
+        change_text = self._marker_text(content, b'data-test="instrument-price-change"')
+        percent_text = self._marker_text(content, b'data-test="instrument-price-change-percent"')
+
+        change = self._extract_number(change_text, allow_negative=True) if change_text else None
+        change_percent = self._extract_number(percent_text, allow_negative=True) if percent_text else None
+        return vix_value, change, change_percent
+
+    def _marker_text(self, content, marker):
+        """
+        Text content of the element carrying `marker`, up to its first closing tag
+        Returns: str, or None when the marker is absent
+        """
+        pos = content.find(marker)
+        if pos < 0:
+            return None
+
+        open_end = content.find(b'>', pos)
+        close_start = content.find(b'</', open_end)
+        if open_end < 0 or close_start < 0:
+            return None
+
+        # Drop inline comments/tags React leaves between text nodes, e.g. (<!-- -->-1.06<!-- -->%)
+        snippet = INLINE_TAG.sub(b'', content[open_end + 1:close_start])
+        return snippet.decode('utf-8', 'ignore').strip()
+
+    def _extract_vix_soup(self, content):
+        """
+        Full parse-tree fallback for pages where the markers moved
+        Returns: (vix, change, change_percent), or None
+        """
+        soup = BeautifulSoup(content, SOUP_PARSER)
+
+        # Try multiple selectors as Investing.com layout changes
+        vix_value = None
+        change = None
+        change_percent = None
+
+        # Method 1: Look for data-test attribute
+        price_element = soup.find('div', {'data-test': 'instrument-price-last'})
+        if price_element:
+            vix_text = price_element.get_text(strip=True)
+            vix_value = self._extract_number(vix_text)
+
+        # Method 2: Look for specific class patterns
+        if not vix_value:
+            price_elements = soup.find_all('span', class_=re.compile(r'text-\d+xl'))
+            for elem in price_elements:
+                text = elem.get_text(strip=True)
+                num = self._extract_number(text)
+                if num and 5 < num < 50:  # VIX typically ranges 10-40
+                    vix_value = num
+                    break
+
+        # Method 3: Look for any element with VIX-like number
+        if not vix_value:
+            all_text = soup.get_text()
+            matches = re.findall(r'\b(\d{1,2}\.\d{2})\b', all_text)
+            for match in matches:
+                num = float(match)
+                if 5 < num < 50:
+                    vix_value = num
+                    break
+
+        # Try to get change values
+        change_elements = soup.find_all('span', {'data-test': re.compile('instrument-price-change')})
+        for elem in change_elements:
+            text = elem.get_text(strip=True)
+            if '%' in text:
+                change_percent = self._extract_number(text, allow_negative=True)
+            else:
+                change = self._extract_number(text, allow_negative=True)
+
+        if not vix_value:
+            return None
+        return vix_value, change, change_percent
+
+    def fetch_from_nse(self):
+        """
+        Fallback: Fetch VIX from NSE India
+        """
+        try:
+            result = self._fetch_from_nse()
+            if result:
+                return result
 
             # Last resort: Use Yahoo Finance as final fallback
             return self.fetch_from_yahoo()
@@ -143,40 +242,71 @@ class IndiaVIXFetcher:
             print(f"Error fetching VIX from NSE: {e}")
             return self.fetch_from_yahoo()
 
-    def fetch_from_yahoo(self):
+    def _fetch_from_nse(self):
         """
-        Final fallback: Yahoo Finance
+        Read INDIA VIX from the NSE all-indices feed
+        Returns: dict with VIX data, or None
         """
-        try:
-            url = "https://query1.finance.yahoo.com/v8/finance/chart/%5EINVIX"
-            params = {'interval': '1d', 'range': '1d'}
-            headers = {'User-Agent': 'Mozilla/5.0'}
+        nse_url = "https://www.nseindia.com/api/allIndices"
 
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+        # Shared session: cookies are warmed once, not per request
+        response = get_nse_session().get(nse_url)
 
-            if response.status_code == 200:
-                data = response.json()
-                vix_price = data['chart']['result'][0]['meta'].get('regularMarketPrice', 15.0)
-                prev_close = data['chart']['result'][0]['meta'].get('chartPreviousClose', vix_price)
-
-                change = vix_price - prev_close
-                change_percent = (change / prev_close) * 100 if prev_close else 0
+        if response.status_code != 200:
+            return None
 
+        for index in response.json().get('data', []):
+            if index.get('index') == 'INDIA VIX':
                 return {
-                    'current': round(float(vix_price), 2),
-                    'change': round(float(change), 2),
-                    'change_percent': round(float(change_percent), 2),
+                    'current': round(float(index['last']), 2),
+                    'change': round(float(index.get('variation', 0.0)), 2),
+                    'change_percent': round(float(index.get('percentChange', 0.0)), 2),
                     'timestamp': datetime.now().strftime("%H:%M:%S"),
-                    'source': 'Yahoo Finance',
+                    'source': 'NSE India',
                     'status': 'success'
                 }
-            else:
-                return self._get_default_vix()
+
+        return None
+
+    def fetch_from_yahoo(self):
+        """
+        Final fallback: Yahoo Finance
+        """
+        try:
+            result = self._fetch_from_yahoo()
+            if result:
+                return result
+            return self._get_default_vix()
 
         except Exception as e:
             print(f"Error fetching VIX from Yahoo: {e}")
             return self._get_default_vix()
 
+    def _fetch_from_yahoo(self):
+        """
+        Read India VIX from the Yahoo Finance chart API
+        Returns: dict with VIX data, or None
+        """
+        chart = get_client().fetch_chart('^INVIX', interval='1d', range='1d')
+
+        if chart is None:
+            return None
+
+        vix_price = chart['meta'].get('regularMarketPrice', 15.0)
+        prev_close = chart['meta'].get('chartPreviousClose', vix_price)
+
+        change = vix_price - prev_close
+        change_percent = (change / prev_close) * 100 if prev_close else 0
+
+        return {
+            'current': round(float(vix_price), 2),
+            'change': round(float(change), 2),
+            'change_percent': round(float(change_percent), 2),
+            'timestamp': datetime.now().strftime("%H:%M:%S"),
+            'source': 'Yahoo Finance',
+            'status': 'success'
+        }
+
     def _extract_number(self, text, allow_negative=False):
         """
         Extract numeric value from text
@@ -260,10 +390,10 @@ class IndiaVIXFetcher:
         Fetch historical VIX data
         """
         try:
-            response = requests.get(self.historical_url, headers=self.headers, timeout=10)
+            response = get_client().session.get(self.historical_url, headers=self.headers, timeout=10)
 
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = BeautifulSoup(response.content, SOUP_PARSER)
 
                 # Find historical data table
                 table = soup.find('table', {'id': 'curr_table'})
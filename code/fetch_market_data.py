@@ -1,19 +1,11 @@
-import requests
-import json
+from market_data_client import get_client
 
 def fetch_nifty_data():
     try:
         # Try Yahoo Finance API
-        url = "https://query1.finance.yahoo.com/v8/finance/chart/%5ENSEI?interval=1d&range=5d"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        }
-
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            result = data['chart']['result'][0]
-            meta = result['meta']
+        chart = get_client().fetch_chart('^NSEI', interval='1d', range='5d')
+        if chart is not None:
+            meta = chart['meta']
 
             print("=" * 60)
             print("📊 LIVE NIFTY 50 MARKET DATA")
@@ -27,13 +19,12 @@ def fetch_nifty_data():
             print(f"Change: ₹{change:.2f} ({pct_change:+.2f}%)")
 
             # Get historical data for technical analysis
-            timestamps = result['timestamp']
-            quotes = result['indicators']['quote'][0]
+            timestamps = chart['timestamp']
             print(f"\n5-Day Data Points: {len(timestamps)}")
             print("=" * 60)
             return True
         else:
-            print(f"Failed to fetch data: Status {response.status_code}")
+            print("Failed to fetch data: non-200 response")
             return False
 
     except Exception as e:
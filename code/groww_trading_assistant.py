@@ -11,11 +11,12 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 import time
-import requests
 from datetime import datetime
 import pandas as pd
 import numpy as np
 
+from nse_session import get_nse_session
+
 
 class GrowwTradingAssistant:
     def __init__(self):
@@ -83,17 +84,9 @@ class GrowwTradingAssistant:
 
             # Using NSE India API (public endpoint)
             url = "https://www.nseindia.com/api/equity-stockIndices?index=NIFTY%2050"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'application/json',
-                'Accept-Language': 'en-US,en;q=0.9',
-            }
-
-            session = requests.Session()
-            session.get("https://www.nseindia.com", headers=headers)
-            time.sleep(1)
 
-            response = session.get(url, headers=headers)
+            # Shared NSE session reuses warm cookies across calls
+            response = get_nse_session().get(url)
 
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,101 @@
+"""
+Vectorized Implied Volatility
+Inverts Black-Scholes for any number of option premiums at once: Newton steps
+seeded with the Brenner-Subrahmanyam approximation, with a per-element
+bisection fallback whenever a Newton step leaves the bracket known to hold
+the root (deep OTM strikes, tiny vega). Elements drop out of the working set
+as soon as they converge, so each iteration only touches unsolved strikes.
+"""
+
+import numpy as np
+
+from option_pricing import RISK_FREE_RATE, is_call, norm_cdf, norm_pdf
+
+VOL_MIN = 1e-4
+VOL_MAX = 5.0
+
+# Premium tolerance (rupees) and bracket width at which an element is solved
+PRICE_TOLERANCE = 1e-6
+VOL_TOLERANCE = 1e-10
+
+MAX_ITERATIONS = 100
+
+
+def _price_and_vega(spot, strike, time_to_expiry, volatility, sign, rate):
+    """Black-Scholes price and raw vega (per 1.0 of volatility) from one d1 evaluation"""
+    sqrt_t = np.sqrt(time_to_expiry)
+    vol_sqrt_t = volatility * sqrt_t
+    discounted_strike = strike * np.exp(-rate * time_to_expiry)
+    d1 = (np.log(spot / discounted_strike) + 0.5 * vol_sqrt_t * vol_sqrt_t) / vol_sqrt_t
+    cdf = norm_cdf(np.stack([sign * d1, sign * (d1 - vol_sqrt_t)]))
+    price = sign * (spot * cdf[0] - discounted_strike * cdf[1])
+    return price, spot * norm_pdf(d1) * sqrt_t
+
+
+def brenner_subrahmanyam(price, spot, time_to_expiry):
+    """ATM approximation sigma ~ sqrt(2 * pi / T) * price / spot, used as the Newton seed"""
+    return np.sqrt(2.0 * np.pi / time_to_expiry) * price / spot
+
+
+def implied_volatility(price, spot, strike, time_to_expiry, option_type='call', rate=RISK_FREE_RATE,
+                       tol=PRICE_TOLERANCE, max_iter=MAX_ITERATIONS):
+    """
+    Annualized implied volatility (decimal) for every premium; arguments broadcast
+    Premiums outside the no-arbitrage bounds or with no time value, expired
+    options and elements that fail to converge are NaN
+    Returns: float for scalar inputs, otherwise an array of the broadcast shape
+    """
+    price, spot, strike, time_to_expiry, calls = np.broadcast_arrays(
+        np.asarray(price, dtype=np.float64), np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64), np.asarray(time_to_expiry, dtype=np.float64),
+        is_call(option_type))
+    shape = price.shape
+    price, spot, strike, time_to_expiry, calls = (x.ravel() for x in (price, spot, strike, time_to_expiry, calls))
+
+    sign = np.where(calls, 1.0, -1.0)
+    with np.errstate(invalid='ignore', over='ignore'):
+        discounted_strike = strike * np.exp(-rate * time_to_expiry)
+        lower = np.maximum(sign * (spot - discounted_strike), 0.0)
+        upper = np.where(calls, spot, discounted_strike)
+        # Time value at or below the tolerance carries no information about volatility
+        solvable = (time_to_expiry > 0) & (price - lower > tol) & (price < upper)
+
+    result = np.full(price.shape, np.nan)
+    index = np.flatnonzero(solvable)
+    if len(index):
+        p, s, k, t, sg = price[index], spot[index], strike[index], time_to_expiry[index], sign[index]
+
+        vol = np.clip(brenner_subrahmanyam(p, s, t), 0.01, 2.0)
+        lo = np.full(len(index), VOL_MIN)
+        hi = np.full(len(index), VOL_MAX)
+        solved = np.zeros(len(index), dtype=bool)
+        active = np.arange(len(index))
+
+        for _ in range(max_iter):
+            model, vega = _price_and_vega(s[active], k[active], t[active], vol[active], sg[active], rate)
+            diff = model - p[active]
+
+            # Price rises with volatility, so the sign of diff tightens the bracket
+            too_high = diff > 0
+            hi[active] = np.where(too_high, vol[active], hi[active])
+            lo[active] = np.where(too_high, lo[active], vol[active])
+
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                step = vol[active] - diff / vega
+            outside = ~((step > lo[active]) & (step < hi[active]))
+            step = np.where(outside, 0.5 * (lo[active] + hi[active]), step)
+
+            converged = (np.abs(diff) < tol) | (hi[active] - lo[active] < VOL_TOLERANCE)
+            vol[active] = np.where(converged, vol[active], step)
+            solved[active[converged]] = True
+
+            active = active[~converged]
+            if not len(active):
+                break
+
+        # A bracket collapsed onto VOL_MIN or VOL_MAX means the true volatility lies beyond it
+        solved &= (vol - VOL_MIN > VOL_TOLERANCE) & (VOL_MAX - vol > VOL_TOLERANCE)
+        result[index] = np.where(solved, vol, np.nan)
+
+    result = result.reshape(shape)
+    return result[()] if result.ndim == 0 else result
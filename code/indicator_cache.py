@@ -0,0 +1,95 @@
+"""
+Indicator Result Cache
+Process-wide LRU of computed IndicatorSets, keyed by a fingerprint of the
+bars they came from. Every rerun and every session that sees the same series
+gets the stored result for the cost of one hash and a dictionary lookup.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from indicator_engine import compute_indicators
+
+DEFAULT_MAXSIZE = 128
+
+
+def fingerprint(bars):
+    """
+    Content hash of a BarWindow, read straight from its column views
+    Returns: hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for column in bars.columns:
+        digest.update(column)
+    return digest.hexdigest()
+
+
+def _freeze(indicators):
+    """Make every array read-only, since cached results are shared between sessions"""
+    for values in indicators:
+        values.flags.writeable = False
+    return indicators
+
+
+class IndicatorCache:
+    """Bounded LRU mapping bar fingerprints to IndicatorSets, with hit/miss counters"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, symbol, timeframe, bars, compute=compute_indicators):
+        """
+        IndicatorSet for a BarWindow, computed with compute(close, high, low, volume) on a miss
+        Keyed by symbol, timeframe, bar count, last bar timestamp and content hash,
+        so a revised forming bar misses even though its timestamp is unchanged
+        """
+        last_ts = float(bars.timestamp[-1]) if len(bars) else None
+        key = (symbol, timeframe, len(bars), last_ts, fingerprint(bars))
+
+        with self._lock:
+            indicators = self._entries.get(key)
+            if indicators is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return indicators
+            self.misses += 1
+
+        indicators = _freeze(compute(bars.close, bars.high, bars.low, bars.volume))
+
+        with self._lock:
+            self._entries[key] = indicators
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return indicators
+
+    def stats(self):
+        """Returns: dict with hits, misses, hit_rate and size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+            }
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+INDICATOR_CACHE = IndicatorCache()
+
+
+def cached_indicators(symbol, timeframe, bars):
+    """IndicatorSet for a BarWindow through the process-wide cache"""
+    return INDICATOR_CACHE.get(symbol, timeframe, bars)
@@ -0,0 +1,205 @@
+"""
+Vectorized Indicator Engine
+Computes SMA 20/50, EMA 12/26, RSI, MACD, Bollinger Bands, ATR and volume SMA
+in one pass over contiguous NumPy arrays. Rolling windows share one prefix sum
+per input series, and Bollinger middle is the SMA 20 array itself.
+
+Inputs may be 1-D (one symbol) or 2-D (time x symbols); every primitive works
+along axis 0, so a whole universe is computed in one call.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# True range, ATR and RSI run as fused (Numba when available) kernels
+from indicator_kernels import atr, rsi, true_range  # noqa: F401
+
+# scipy's IIR filter runs the EMA recursion in C; fall back to a plain loop
+try:
+    from scipy.signal import lfilter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+INDICATOR_FIELDS = (
+    'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26',
+    'RSI', 'MACD', 'MACD_Signal', 'MACD_Histogram',
+    'BB_Upper', 'BB_Middle', 'BB_Lower',
+    'ATR', 'Volume_SMA_20',
+)
+
+# Bars needed before every indicator has a value
+MIN_BARS = 50
+
+
+class IndicatorSet(namedtuple('IndicatorSet', INDICATOR_FIELDS)):
+    """
+    One float64 array per indicator, aligned with the input bars
+    (NaN until the indicator's window is filled); (time x symbols) for matrix input
+    """
+    __slots__ = ()
+
+    def latest(self):
+        """
+        Returns: dict of indicator name -> value at the last bar
+        (a float, or one value per symbol for matrix input)
+        """
+        return {name: _last(values) for name, values in zip(self._fields, self)}
+
+    def tail(self, bars):
+        """
+        Returns: IndicatorSet restricted to the last `bars` bars (views, no copies)
+        """
+        return IndicatorSet(*(values[-bars:] for values in self))
+
+
+def _last(values):
+    if not len(values):
+        return np.nan
+    return float(values[-1]) if values.ndim == 1 else values[-1]
+
+
+def _as_array(values):
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def prefix_sum(values):
+    """Prefix sum along time with a leading zero row, shifted by the first bar for precision"""
+    csum = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(values - values[0], axis=0, out=csum[1:])
+    return csum
+
+
+def prefix_sum_sq(values):
+    """Prefix sum of squares, with the same shift as prefix_sum"""
+    shifted = values - values[0]
+    csum_sq = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(shifted * shifted, axis=0, out=csum_sq[1:])
+    return csum_sq
+
+
+def rolling_mean(values, window, csum=None):
+    """
+    Trailing mean over `window` bars from a (shared) prefix sum
+    Returns: float64 array, NaN for the first window - 1 bars
+    """
+    if csum is None:
+        csum = prefix_sum(values)
+
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window + values[0]
+    return out
+
+
+def rolling_std(values, window, csum=None, csum_sq=None):
+    """
+    Trailing sample standard deviation (ddof=1, as pandas) over `window` bars
+    Returns: float64 array, NaN for the first window - 1 bars
+    """
+    if csum is None:
+        csum = prefix_sum(values)
+    if csum_sq is None:
+        csum_sq = prefix_sum_sq(values)
+
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        window_sum = csum[window:] - csum[:-window]
+        window_sq = csum_sq[window:] - csum_sq[:-window]
+        variance = (window_sq - window_sum * window_sum / window) / (window - 1)
+        out[window - 1:] = np.sqrt(np.maximum(variance, 0.0))
+    return out
+
+
+def ema(values, span):
+    """
+    Exponential moving average matching pandas ewm(span=span, adjust=False)
+    Returns: float64 array
+    """
+    alpha = 2.0 / (span + 1.0)
+    if len(values) == 0:
+        return np.empty(values.shape)
+
+    if SCIPY_AVAILABLE:
+        zi = ((1.0 - alpha) * values[0])[np.newaxis]
+        out, _ = lfilter([alpha], [1.0, alpha - 1.0], values, axis=0, zi=zi)
+        return out
+
+    out = np.empty(values.shape)
+    out[0] = values[0]
+    for i in range(1, len(values)):
+        out[i] = alpha * values[i] + (1.0 - alpha) * out[i - 1]
+    return out
+
+
+def compute_indicators(close, high=None, low=None, volume=None):
+    """
+    Compute every dashboard indicator in one pass
+    Inputs are (time,) arrays or aligned (time x symbols) matrices without gaps
+    high/low/volume are optional; their indicators are all-NaN when missing
+    Returns: IndicatorSet
+    """
+    close = _as_array(close)
+    missing = np.full(close.shape, np.nan)
+
+    if len(close) == 0:
+        return IndicatorSet(*(missing for _ in INDICATOR_FIELDS))
+
+    # One prefix sum (and sum of squares) of close serves SMA 20, SMA 50 and the bands
+    csum = prefix_sum(close)
+    csum_sq = prefix_sum_sq(close)
+
+    sma_20 = rolling_mean(close, 20, csum)
+    sma_50 = rolling_mean(close, 50, csum)
+    band = 2.0 * rolling_std(close, 20, csum, csum_sq)
+
+    ema_12 = ema(close, 12)
+    ema_26 = ema(close, 26)
+    macd = ema_12 - ema_26
+    macd_signal = ema(macd, 9)
+
+    if high is not None and low is not None:
+        average_true_range = atr(_as_array(high), _as_array(low), close, 14)
+    else:
+        average_true_range = missing
+
+    volume_sma_20 = rolling_mean(_as_array(volume), 20) if volume is not None else missing
+
+    return IndicatorSet(
+        SMA_20=sma_20,
+        SMA_50=sma_50,
+        EMA_12=ema_12,
+        EMA_26=ema_26,
+        RSI=rsi(close, 14),
+        MACD=macd,
+        MACD_Signal=macd_signal,
+        MACD_Histogram=macd - macd_signal,
+        BB_Upper=sma_20 + band,
+        BB_Middle=sma_20,
+        BB_Lower=sma_20 - band,
+        ATR=average_true_range,
+        Volume_SMA_20=volume_sma_20,
+    )
+
+
+def indicators_from_frame(df):
+    """
+    Compute indicators from an OHLCV DataFrame without adding columns to it
+    Returns: IndicatorSet
+    """
+    return compute_indicators(
+        df['close'].to_numpy(),
+        df['high'].to_numpy() if 'high' in df else None,
+        df['low'].to_numpy() if 'low' in df else None,
+        df['volume'].to_numpy() if 'volume' in df else None,
+    )
+
+
+def indicators_from_matrix(matrix):
+    """
+    Compute indicators for every symbol of an aligned OHLCV matrix
+    (as returned by OHLCVStore.load_matrix) in one call
+    Returns: IndicatorSet of (time x symbols) arrays
+    """
+    return compute_indicators(matrix['close'], matrix['high'], matrix['low'], matrix['volume'])
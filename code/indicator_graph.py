@@ -0,0 +1,184 @@
+"""
+Lazy Indicator Graph
+Indicators declared as nodes of a dependency graph (EMA_12 and EMA_26 feed
+MACD, MACD feeds MACD_Signal, ...). Nodes are evaluated only when something
+asks for them and memoized per data version, so a signal rule pulls just its
+inputs, shared inputs are computed once, and unused indicators cost nothing.
+"""
+
+import numpy as np
+
+from indicator_engine import ema, prefix_sum, prefix_sum_sq, rolling_mean, rolling_std
+from indicator_kernels import atr, rsi, true_range
+
+# Raw input series every graph is built from
+SOURCES = ('close', 'high', 'low', 'volume')
+
+# name -> (input node names, function of the input arrays)
+NODES = {}
+
+
+def node(name, *inputs):
+    """Register a graph node computed from the named input nodes"""
+    def register(func):
+        NODES[name] = (inputs, func)
+        return func
+    return register
+
+
+@node('close_csum', 'close')
+def _close_csum(close):
+    return prefix_sum(close)
+
+
+@node('close_csum_sq', 'close')
+def _close_csum_sq(close):
+    return prefix_sum_sq(close)
+
+
+@node('SMA_20', 'close', 'close_csum')
+def _sma_20(close, csum):
+    return rolling_mean(close, 20, csum)
+
+
+@node('SMA_50', 'close', 'close_csum')
+def _sma_50(close, csum):
+    return rolling_mean(close, 50, csum)
+
+
+@node('STD_20', 'close', 'close_csum', 'close_csum_sq')
+def _std_20(close, csum, csum_sq):
+    return rolling_std(close, 20, csum, csum_sq)
+
+
+@node('EMA_12', 'close')
+def _ema_12(close):
+    return ema(close, 12)
+
+
+@node('EMA_26', 'close')
+def _ema_26(close):
+    return ema(close, 26)
+
+
+@node('MACD', 'EMA_12', 'EMA_26')
+def _macd(ema_12, ema_26):
+    return ema_12 - ema_26
+
+
+@node('MACD_Signal', 'MACD')
+def _macd_signal(macd):
+    return ema(macd, 9)
+
+
+@node('MACD_Histogram', 'MACD', 'MACD_Signal')
+def _macd_histogram(macd, macd_signal):
+    return macd - macd_signal
+
+
+@node('RSI', 'close')
+def _rsi(close):
+    return rsi(close, 14)
+
+
+@node('BB_Middle', 'SMA_20')
+def _bb_middle(sma_20):
+    return sma_20
+
+
+@node('BB_Upper', 'SMA_20', 'STD_20')
+def _bb_upper(sma_20, std_20):
+    return sma_20 + 2.0 * std_20
+
+
+@node('BB_Lower', 'SMA_20', 'STD_20')
+def _bb_lower(sma_20, std_20):
+    return sma_20 - 2.0 * std_20
+
+
+@node('TR', 'high', 'low', 'close')
+def _true_range(high, low, close):
+    return true_range(high, low, close)
+
+
+@node('ATR', 'high', 'low', 'close')
+def _atr(high, low, close):
+    return atr(high, low, close, 14)
+
+
+@node('Volume_SMA_20', 'volume')
+def _volume_sma_20(volume):
+    return rolling_mean(volume, 20)
+
+
+class IndicatorGraph:
+    def __init__(self, close=None, high=None, low=None, volume=None, version=None):
+        self.version = None
+        self.evaluations = 0
+        self._generation = 0
+        self._sources = {}
+        self._memo = {}
+        if close is not None:
+            self.set_data(close, high, low, volume, version=version)
+
+    @classmethod
+    def from_frame(cls, df, version=None):
+        """Build a graph over an OHLCV DataFrame's columns"""
+        graph = cls()
+        graph.set_frame(df, version=version)
+        return graph
+
+    def set_frame(self, df, version=None):
+        """Point the graph at an OHLCV DataFrame; see set_data for versioning"""
+        self.set_data(*(df[name].to_numpy() if name in df else None for name in SOURCES), version=version)
+
+    def set_data(self, close, high=None, low=None, volume=None, version=None):
+        """
+        Replace the input series. Passing the current version again keeps every
+        memoized node; any other data starts a new version with an empty memo.
+        """
+        if version is not None and version == self.version:
+            return
+
+        self._sources = {
+            name: np.ascontiguousarray(values, dtype=np.float64)
+            for name, values in zip(SOURCES, (close, high, low, volume)) if values is not None
+        }
+        self._memo = {}
+        self._generation += 1
+        self.version = version if version is not None else self._generation
+
+    def get(self, name):
+        """
+        Evaluate a node (and, recursively, only the inputs it needs)
+        Returns: float64 array aligned with the input bars
+        """
+        if name in self._memo:
+            return self._memo[name]
+
+        if name in SOURCES:
+            if name not in self._sources:
+                raise KeyError(f"Indicator graph has no '{name}' data")
+            return self._sources[name]
+
+        inputs, func = NODES[name]
+        value = func(*(self.get(dependency) for dependency in inputs))
+        self._memo[name] = value
+        self.evaluations += 1
+        return value
+
+    def last(self, name):
+        """Latest value of a node as a float"""
+        values = self.get(name)
+        return float(values[-1]) if len(values) else np.nan
+
+    def latest(self, names):
+        """
+        Returns: dict of node name -> latest value, evaluating only those nodes
+        """
+        return {name: self.last(name) for name in names}
+
+    @property
+    def evaluated(self):
+        """Nodes computed for the current data version"""
+        return set(self._memo)
@@ -0,0 +1,239 @@
+"""
+Indicator Kernels
+Fused true range, ATR and RSI kernels. With Numba installed each one is a
+single compiled pass per column with no temporary arrays; otherwise a NumPy
+(and scipy, when available) path gives the same results.
+
+Both smoothing variants are supported:
+    wilder=False  simple rolling mean of the last `period` values, as the
+                  dashboards have always used (RSI includes a zero first delta)
+    wilder=True   Wilder smoothing, avg = (avg * (period - 1) + x) / period,
+                  seeded with the simple mean of the first `period` values;
+                  RSI deltas start at the second bar
+
+Inputs are (time,) arrays or (time x symbols) matrices.
+"""
+
+import numpy as np
+
+# Numba compiles the loop kernels; without it they are only used as reference code
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from scipy.signal import lfilter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+def _jit(func):
+    return numba.njit(cache=True)(func) if NUMBA_AVAILABLE else func
+
+
+@_jit
+def _true_range_loop(high, low, close):
+    n, m = close.shape
+    out = np.empty((n, m))
+    for j in range(m):
+        for i in range(n):
+            tr = high[i, j] - low[i, j]
+            if i > 0:
+                prev_close = close[i - 1, j]
+                tr = max(tr, abs(high[i, j] - prev_close), abs(low[i, j] - prev_close))
+            out[i, j] = tr
+    return out
+
+
+@_jit
+def _atr_loop(high, low, close, period, wilder):
+    n, m = close.shape
+    out = np.full((n, m), np.nan)
+    for j in range(m):
+        total = 0.0
+        avg = 0.0
+        for i in range(n):
+            tr = high[i, j] - low[i, j]
+            if i > 0:
+                prev_close = close[i - 1, j]
+                tr = max(tr, abs(high[i, j] - prev_close), abs(low[i, j] - prev_close))
+
+            if wilder and i >= period:
+                avg = (avg * (period - 1) + tr) / period
+                out[i, j] = avg
+                continue
+
+            total += tr
+            if not wilder and i >= period:
+                # Drop the true range that just left the window
+                k = i - period
+                old = high[k, j] - low[k, j]
+                if k > 0:
+                    old = max(old, abs(high[k, j] - close[k - 1, j]), abs(low[k, j] - close[k - 1, j]))
+                total -= old
+            if i >= period - 1:
+                avg = total / period
+                out[i, j] = avg
+    return out
+
+
+@_jit
+def _rsi_loop(close, period, wilder):
+    n, m = close.shape
+    out = np.full((n, m), np.nan)
+    for j in range(m):
+        gain_sum = 0.0
+        loss_sum = 0.0
+        avg_gain = 0.0
+        avg_loss = 0.0
+        for i in range(1, n):
+            delta = close[i, j] - close[i - 1, j]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+
+            if wilder:
+                if i <= period:
+                    gain_sum += gain
+                    loss_sum += loss
+                    if i < period:
+                        continue
+                    avg_gain = gain_sum / period
+                    avg_loss = loss_sum / period
+                else:
+                    avg_gain = (avg_gain * (period - 1) + gain) / period
+                    avg_loss = (avg_loss * (period - 1) + loss) / period
+            else:
+                # Window of `period` deltas ending at i, the first bar's delta being zero
+                gain_sum += gain
+                loss_sum += loss
+                k = i - period
+                if k >= 1:
+                    old = close[k, j] - close[k - 1, j]
+                    if old > 0:
+                        gain_sum -= old
+                    else:
+                        loss_sum += old
+                if i < period - 1:
+                    continue
+                avg_gain = gain_sum / period
+                avg_loss = loss_sum / period
+
+            if avg_loss == 0.0:
+                out[i, j] = 100.0 if avg_gain > 0.0 else np.nan
+            else:
+                out[i, j] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return out
+
+
+def _as_matrix(values):
+    """View a (time,) or (time x symbols) input as a contiguous 2-D float64 array"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.ascontiguousarray(values.reshape(len(values), -1))
+
+
+def _shaped_like(result, values):
+    return result.reshape(np.shape(values))
+
+
+def _rolling_mean(values, period):
+    """Trailing mean along axis 0 from one shifted prefix sum"""
+    out = np.full(values.shape, np.nan)
+    if len(values) >= period:
+        csum = np.zeros((len(values) + 1,) + values.shape[1:])
+        np.cumsum(values - values[0], axis=0, out=csum[1:])
+        out[period - 1:] = (csum[period:] - csum[:-period]) / period + values[0]
+    return out
+
+
+def _wilder_mean(values, period, start=0):
+    """
+    Wilder smoothing along axis 0: simple mean of values[start:start + period],
+    then avg = (avg * (period - 1) + x) / period
+    """
+    out = np.full(values.shape, np.nan)
+    seed_end = start + period
+    if len(values) < seed_end:
+        return out
+
+    seed = values[start:seed_end].mean(axis=0)
+    out[seed_end - 1] = seed
+    rest = values[seed_end:]
+    if not len(rest):
+        return out
+
+    alpha = 1.0 / period
+    if SCIPY_AVAILABLE:
+        zi = ((1.0 - alpha) * seed)[np.newaxis]
+        out[seed_end:], _ = lfilter([alpha], [1.0, alpha - 1.0], rest, axis=0, zi=zi)
+    else:
+        avg = seed
+        for i in range(len(rest)):
+            avg = avg + alpha * (rest[i] - avg)
+            out[seed_end + i] = avg
+    return out
+
+
+def _true_range_numpy(high, low, close):
+    tr = high - low
+    if len(close) > 1:
+        prev_close = close[:-1]
+        gap = np.abs(high[1:] - prev_close)
+        np.maximum(tr[1:], gap, out=tr[1:])
+        np.abs(np.subtract(low[1:], prev_close, out=gap), out=gap)
+        np.maximum(tr[1:], gap, out=tr[1:])
+    return tr
+
+
+def true_range(high, low, close):
+    """
+    True range; the first bar uses high - low only
+    Returns: float64 array shaped like close
+    """
+    h, l, c = _as_matrix(high), _as_matrix(low), _as_matrix(close)
+    result = _true_range_loop(h, l, c) if NUMBA_AVAILABLE else _true_range_numpy(h, l, c)
+    return _shaped_like(result, close)
+
+
+def atr(high, low, close, period=14, wilder=False):
+    """
+    Average True Range
+    Returns: float64 array shaped like close, NaN until `period` bars are seen
+    """
+    h, l, c = _as_matrix(high), _as_matrix(low), _as_matrix(close)
+
+    if NUMBA_AVAILABLE:
+        result = _atr_loop(h, l, c, period, wilder)
+    else:
+        tr = _true_range_numpy(h, l, c)
+        result = _wilder_mean(tr, period) if wilder else _rolling_mean(tr, period)
+    return _shaped_like(result, close)
+
+
+def rsi(close, period=14, wilder=False):
+    """
+    Relative Strength Index
+    Returns: float64 array shaped like close
+    """
+    c = _as_matrix(close)
+
+    if NUMBA_AVAILABLE:
+        result = _rsi_loop(c, period, wilder)
+    else:
+        delta = np.zeros(c.shape)
+        np.subtract(c[1:], c[:-1], out=delta[1:])
+        gain = np.maximum(delta, 0.0)
+        loss = np.maximum(np.negative(delta, out=delta), 0.0, out=delta)
+
+        if wilder:
+            avg_gain = _wilder_mean(gain, period, start=1)
+            avg_loss = _wilder_mean(loss, period, start=1)
+        else:
+            avg_gain = _rolling_mean(gain, period)
+            avg_loss = _rolling_mean(loss, period)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return _shaped_like(result, close)
@@ -9,7 +9,6 @@ import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
-import requests
 from datetime import datetime, time, timedelta
 import json
 import os
@@ -17,6 +16,9 @@ from scipy.stats import norm
 import warnings
 warnings.filterwarnings('ignore')
 
+from bar_aggregator import TIMEFRAMES, bucket_start
+from market_data_hub import MarketDataHub
+
 # Import real India VIX fetcher
 try:
     from fetch_india_vix import IndiaVIXFetcher
@@ -26,6 +28,21 @@ except:
     USE_REAL_VIX = False
     print("Warning: Could not load India VIX fetcher, using fallback")
 
+
+@st.cache_resource
+def get_market_hub():
+    """One market data hub per server process, shared by every browser session"""
+    hub = MarketDataHub(vix_fetcher=VIX_FETCHER if USE_REAL_VIX else None)
+    hub.start()
+    return hub
+
+
+# Seconds between auto-refreshes of the live trade panels
+AUTO_REFRESH_SECONDS = 30
+
+# One NSE session of 1-minute bars (09:15-15:30)
+INTRADAY_CHART_BARS = 375
+
 # Page config
 st.set_page_config(
     page_title="Live Trading Dashboard - Groww Ready",
@@ -85,6 +102,9 @@ class IntegratedTradingSystem:
     def __init__(self):
         self.nifty_data = None
         self.vix_data = None
+        self.indicators = None
+        self.vwap = None
+        self.intraday_bars = None
         self.market_open_time = time(9, 15)
         self.market_close_time = time(15, 30)
         self.pre_market_time = time(9, 0)
@@ -144,59 +164,30 @@ class IntegratedTradingSystem:
         return hours, minutes, market_open
 
     def fetch_market_data(self):
-        """Fetch real-time market data"""
+        """Read the latest NIFTY/VIX snapshot published by the shared market data hub"""
         try:
+            hub = get_market_hub()
+            snapshot = hub.snapshot()
+
             # Fetch NIFTY 50
-            url = "https://query1.finance.yahoo.com/v8/finance/chart/%5ENSEI"
-            params = {'interval': '1d', 'range': '1d'}
-            headers = {'User-Agent': 'Mozilla/5.0'}
-
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                result = data['chart']['result'][0]
-                meta = result['meta']
-                quotes = result['indicators']['quote'][0]
-
-                latest_idx = -1
-                current_price = meta.get('regularMarketPrice', quotes['close'][latest_idx])
-                prev_close = meta.get('chartPreviousClose', quotes['close'][-2] if len(quotes['close']) > 1 else current_price)
-
-                self.nifty_data = {
-                    'last_price': float(current_price),
-                    'open': float(quotes['open'][latest_idx]) if quotes['open'][latest_idx] else current_price,
-                    'high': float(quotes['high'][latest_idx]) if quotes['high'][latest_idx] else current_price,
-                    'low': float(quotes['low'][latest_idx]) if quotes['low'][latest_idx] else current_price,
-                    'previous_close': float(prev_close),
-                    'change': float(current_price - prev_close),
-                    'pct_change': float((current_price - prev_close) / prev_close * 100),
-                    'timestamp': datetime.now().strftime("%H:%M:%S")
-                }
-
-            # Fetch VIX from Investing.com (Real market data)
+            if snapshot['nifty'] is not None:
+                self.nifty_data = dict(snapshot['nifty'])
+                self.nifty_data['timestamp'] = snapshot['nifty_updated_at'].strftime("%H:%M:%S")
+
+            # Fetch VIX from Investing.com (Real market data), Yahoo Finance otherwise
+            self.indicators = snapshot['indicators']
+            self.vwap = snapshot['vwap']
+            self.intraday_bars = hub.intraday_bars(INTRADAY_CHART_BARS)
+
+            if snapshot['vix'] is not None:
+                self.vix_data = dict(snapshot['vix'])
+            else:
+                self.vix_data = {'current': 15.0, 'change': 0.0, 'change_percent': 0.0,
+                               'source': 'Default', 'status': 'fallback', 'timestamp': datetime.now().strftime("%H:%M:%S")}
+
             if USE_REAL_VIX:
-                try:
-                    self.vix_data = VIX_FETCHER.fetch_current_vix()
-                    self.vix_interpretation = VIX_FETCHER.get_vix_interpretation(self.vix_data['current'])
-                except Exception as e:
-                    st.warning(f"Could not fetch real VIX, using fallback: {e}")
-                    self.vix_data = {'current': 15.0, 'change': 0.0, 'change_percent': 0.0,
-                                   'source': 'Fallback', 'status': 'error', 'timestamp': datetime.now().strftime("%H:%M:%S")}
-                    self.vix_interpretation = None
+                self.vix_interpretation = VIX_FETCHER.get_vix_interpretation(self.vix_data['current'])
             else:
-                # Fallback to Yahoo Finance
-                url_vix = "https://query1.finance.yahoo.com/v8/finance/chart/%5EINVIX"
-                response_vix = requests.get(url_vix, params={'interval': '1d', 'range': '5d'}, headers=headers, timeout=10)
-
-                if response_vix.status_code == 200:
-                    data_vix = response_vix.json()
-                    vix_price = data_vix['chart']['result'][0]['meta'].get('regularMarketPrice', 15.0)
-                    self.vix_data = {'current': float(vix_price), 'change': 0.0, 'change_percent': 0.0,
-                                   'source': 'Yahoo Finance', 'status': 'success', 'timestamp': datetime.now().strftime("%H:%M:%S")}
-                else:
-                    self.vix_data = {'current': 15.0, 'change': 0.0, 'change_percent': 0.0,
-                                   'source': 'Default', 'status': 'fallback', 'timestamp': datetime.now().strftime("%H:%M:%S")}
                 self.vix_interpretation = None
 
             return True
@@ -282,6 +273,273 @@ If unrealized loss exceeds ₹{trade_setup['max_loss'] * 0.5:,.2f} (50% of max l
         return instructions
 
 
+def render_live_indicators(system):
+    """RSI, moving averages, MACD and ATR from the hub's streaming indicators"""
+    indicators = system.indicators
+    price = system.nifty_data['last_price']
+
+    def level(name, digits=2):
+        value = indicators.get(name)
+        return f"{value:,.{digits}f}" if value is not None else "—"
+
+    def versus(name):
+        value = indicators.get(name)
+        return f"Price {(price - value) / value * 100:+.2f}%" if value else None
+
+    st.markdown("### 📐 Live Indicators (daily)")
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("RSI (14)", level('RSI', 1))
+    with col2:
+        st.metric("SMA 20", level('SMA_20'), versus('SMA_20'))
+    with col3:
+        st.metric("SMA 50", level('SMA_50'), versus('SMA_50'))
+    with col4:
+        st.metric("MACD Histogram", level('MACD_Histogram'))
+    with col5:
+        st.metric("ATR (14)", level('ATR'))
+
+
+def render_intraday_chart(system):
+    """Latest session's 1-minute NIFTY closes against the session VWAP"""
+    bars = system.intraday_bars
+    session = bars.timestamp >= bucket_start(bars.timestamp[-1], TIMEFRAMES['1d'])
+    times = bars.datetimes[session] + pd.Timedelta(hours=5, minutes=30)
+    price = system.nifty_data['last_price']
+
+    st.markdown("### ⏱️ Intraday (1-minute bars)")
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=times, y=bars.close[session], mode='lines', name='NIFTY 50',
+                                 line=dict(color='#667eea', width=2)))
+        fig.add_hline(y=system.vwap, line_dash="dash", line_color="orange",
+                      annotation_text=f"VWAP {system.vwap:,.2f}")
+        fig.update_layout(height=300, margin=dict(l=10, r=10, t=30, b=10), xaxis_title="Time (IST)",
+                          yaxis_title="Price (₹)", hovermode='x unified', showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.metric("Session VWAP", f"₹{system.vwap:,.2f}", f"Price {(price - system.vwap) / system.vwap * 100:+.2f}%")
+        st.caption(f"{int(session.sum())} bars from the hub's quote polls")
+
+
+def render_live_trade(system):
+    """Live quote, VIX and trade recommendation panels; re-run on their own by the auto-refresh timer"""
+    # Fetch live data
+    with st.spinner('📡 Fetching live market data...'):
+        system.fetch_market_data()
+
+    # Live market data
+    st.markdown("## 📊 Live Market Data")
+
+    if system.nifty_data:
+        col1, col2, col3, col4, col5 = st.columns(5)
+
+        with col1:
+            st.metric(
+                "💰 NIFTY 50",
+                f"₹{system.nifty_data['last_price']:,.2f}",
+                f"{system.nifty_data['pct_change']:+.2f}%"
+            )
+
+        with col2:
+            st.metric("📈 High", f"₹{system.nifty_data['high']:,.2f}")
+
+        with col3:
+            st.metric("📉 Low", f"₹{system.nifty_data['low']:,.2f}")
+
+        with col4:
+            # Enhanced VIX display with change
+            vix_delta = f"{system.vix_data.get('change_percent', 0):+.2f}%" if 'change_percent' in system.vix_data else None
+            st.metric("⚡ VIX", f"{system.vix_data['current']:.2f}", vix_delta)
+
+            # Show VIX source (small text)
+            if 'source' in system.vix_data:
+                source_icon = "✅" if system.vix_data.get('status') == 'success' else "⚠️"
+                st.caption(f"{source_icon} {system.vix_data['source']}")
+
+        with col5:
+            st.metric("🕐 Updated", system.vix_data.get('timestamp', system.nifty_data['timestamp']))
+
+    # Daily indicators streamed by the market data hub, today's bar included
+    if system.indicators:
+        render_live_indicators(system)
+
+    # 1-minute bars and session VWAP aggregated by the hub from its own polls
+    if system.intraday_bars is not None and len(system.intraday_bars) > 1 and system.vwap is not None:
+        render_intraday_chart(system)
+
+    # VIX Interpretation Box
+    if system.vix_data and hasattr(system, 'vix_interpretation') and system.vix_interpretation:
+        st.markdown("---")
+
+        interp = system.vix_interpretation
+        vix_val = system.vix_data['current']
+
+        # Color-coded VIX interpretation
+        if vix_val < 12:
+            bg_color = "#d1fae5"  # light green
+            text_color = "#065f46"  # dark green
+        elif vix_val < 15:
+            bg_color = "#ecfccb"  # light lime
+            text_color = "#365314"  # dark lime
+        elif vix_val < 20:
+            bg_color = "#fef9c3"  # light yellow
+            text_color = "#713f12"  # dark yellow
+        elif vix_val < 30:
+            bg_color = "#fed7aa"  # light orange
+            text_color = "#7c2d12"  # dark orange
+        else:
+            bg_color = "#fecaca"  # light red
+            text_color = "#7f1d1d"  # dark red
+
+        st.markdown(f"""
+        <div style="background: {bg_color}; padding: 1rem; border-radius: 8px; border-left: 5px solid {text_color};">
+            <h4 style="color: {text_color}; margin: 0;">🎯 VIX Analysis: {interp['level']} Volatility</h4>
+            <p style="color: {text_color}; margin: 0.5rem 0;">
+                <strong>Market Mood:</strong> {interp['market_mood']}<br>
+                <strong>Recommended Strategy:</strong> {interp['strategy']}<br>
+                <strong>Risk Level:</strong> {interp['risk']}
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # Trade recommendation
+    st.markdown("## 🎯 CURRENT TRADE RECOMMENDATION")
+
+    # Example trade (this should come from your options strategy logic)
+    is_market_open, _ = system.is_market_open()
+
+    if is_market_open:
+        # Simulate recommendation
+        trend = "BULLISH" if system.nifty_data['pct_change'] > 0 else "BEARISH"
+
+        # Get next weekly expiry
+        today = datetime.now()
+        days_until_thursday = (3 - today.weekday()) % 7
+        if days_until_thursday == 0 and today.time() > time(15, 30):
+            days_until_thursday = 7
+        next_expiry = today + timedelta(days=days_until_thursday)
+        expiry_str = next_expiry.strftime('%d%b%y').upper()
+
+        spot = system.nifty_data['last_price']
+        spot_rounded = round(spot / 50) * 50
+
+        if trend == "BULLISH":
+            trade_setup = {
+                'strategy': 'Bull Call Spread',
+                'max_profit': 3985,
+                'max_loss': 6015,
+                'breakeven': [spot_rounded + 120],
+                'legs': [
+                    {
+                        'action': 'BUY',
+                        'option_type': 'CALL',
+                        'strike': spot_rounded,
+                        'expiry': expiry_str,
+                        'quantity': 50,
+                        'lots': 1,
+                        'expected_price': 285.50
+                    },
+                    {
+                        'action': 'SELL',
+                        'option_type': 'CALL',
+                        'strike': spot_rounded + 200,
+                        'expiry': expiry_str,
+                        'quantity': 50,
+                        'lots': 1,
+                        'expected_price': 165.20
+                    }
+                ]
+            }
+        else:
+            trade_setup = {
+                'strategy': 'Bear Put Spread',
+                'max_profit': 3750,
+                'max_loss': 6250,
+                'breakeven': [spot_rounded - 125],
+                'legs': [
+                    {
+                        'action': 'BUY',
+                        'option_type': 'PUT',
+                        'strike': spot_rounded,
+                        'expiry': expiry_str,
+                        'quantity': 50,
+                        'lots': 1,
+                        'expected_price': 290.00
+                    },
+                    {
+                        'action': 'SELL',
+                        'option_type': 'PUT',
+                        'strike': spot_rounded - 200,
+                        'expiry': expiry_str,
+                        'quantity': 50,
+                        'lots': 1,
+                        'expected_price': 165.00
+                    }
+                ]
+            }
+
+        # Big alert
+        st.markdown(f'<div class="big-alert">🎯 RECOMMENDED: {trade_setup["strategy"]}</div>', unsafe_allow_html=True)
+
+        # Summary
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Max Profit", f"₹{trade_setup['max_profit']:,}", delta="Potential Gain")
+        with col2:
+            st.metric("Max Loss", f"₹{trade_setup['max_loss']:,}", delta="Your Risk")
+        with col3:
+            roi = (trade_setup['max_profit'] / trade_setup['max_loss']) * 100
+            st.metric("ROI Potential", f"{roi:.1f}%")
+        with col4:
+            st.metric("Risk:Reward", f"1:{trade_setup['max_profit']/trade_setup['max_loss']:.2f}")
+
+        st.markdown("---")
+
+        # Detailed instructions
+        st.markdown("## 📱 GROWW ORDER PLACEMENT INSTRUCTIONS")
+
+        instructions = system.generate_groww_instructions(trade_setup)
+
+        st.code(instructions, language='text')
+
+        # Action buttons
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            if st.button("📋 Copy All Instructions", use_container_width=True):
+                st.success("✅ Instructions ready! Paste in Notes app")
+                st.text_area("Copy from here:", instructions, height=300)
+
+        with col2:
+            if st.button("📱 Send to WhatsApp", use_container_width=True):
+                st.info("Copy instructions and send to yourself on WhatsApp")
+
+        with col3:
+            if st.button("✅ Mark as Executed", use_container_width=True, type="primary"):
+                # Save to history
+                st.success("✅ Trade logged!")
+                st.balloons()
+
+    else:
+        st.warning(f"🔴 Market is currently closed. Next trade signal will be available when market opens.")
+        hours, minutes, market_open = system.time_to_market_open()
+        st.info(f"⏰ Market opens in: {hours}h {minutes}m\n\n📅 {market_open.strftime('%d %B %Y, %I:%M %p')}")
+
+        st.markdown("### 🎯 What to do now:")
+        st.markdown("""
+        1. ✅ Review your Groww account - ensure sufficient balance
+        2. ✅ Check margin requirements for options trading
+        3. ✅ Set up price alerts in Groww
+        4. ✅ Review yesterday's trades (if any)
+        5. ✅ Read the strategy explanations
+        6. ✅ Prepare for market open at 9:15 AM
+        """)
+
+
 def main():
     # Header
     st.markdown('<h1 style="text-align: center;">🚀 Live Trading Dashboard - Groww Ready</h1>', unsafe_allow_html=True)
@@ -299,13 +557,10 @@ def main():
         st.markdown("## 🎮 Control Panel")
 
         # Auto-refresh toggle
-        auto_refresh = st.checkbox("🔄 Auto-Refresh (every 30 sec)", value=False)
+        auto_refresh = st.checkbox(f"🔄 Auto-Refresh (every {AUTO_REFRESH_SECONDS} sec)", value=False)
 
         if auto_refresh:
-            st.info("Dashboard will refresh automatically")
-            import time as time_module
-            time_module.sleep(30)
-            st.rerun()
+            st.info("Live quote and trade panels refresh automatically")
 
         if st.button("🔄 Manual Refresh Now", use_container_width=True):
             st.rerun()
@@ -357,211 +612,9 @@ def main():
     tabs = st.tabs(["🎯 Live Trade", "📊 Market Analysis", "📱 Groww Setup", "⚙️ Settings", "📜 History"])
 
     with tabs[0]:
-        # Fetch live data
-        with st.spinner('📡 Fetching live market data...'):
-            system.fetch_market_data()
-
-        # Live market data
-        st.markdown("## 📊 Live Market Data")
-
-        if system.nifty_data:
-            col1, col2, col3, col4, col5 = st.columns(5)
-
-            with col1:
-                st.metric(
-                    "💰 NIFTY 50",
-                    f"₹{system.nifty_data['last_price']:,.2f}",
-                    f"{system.nifty_data['pct_change']:+.2f}%"
-                )
-
-            with col2:
-                st.metric("📈 High", f"₹{system.nifty_data['high']:,.2f}")
-
-            with col3:
-                st.metric("📉 Low", f"₹{system.nifty_data['low']:,.2f}")
-
-            with col4:
-                # Enhanced VIX display with change
-                vix_delta = f"{system.vix_data.get('change_percent', 0):+.2f}%" if 'change_percent' in system.vix_data else None
-                st.metric("⚡ VIX", f"{system.vix_data['current']:.2f}", vix_delta)
-
-                # Show VIX source (small text)
-                if 'source' in system.vix_data:
-                    source_icon = "✅" if system.vix_data.get('status') == 'success' else "⚠️"
-                    st.caption(f"{source_icon} {system.vix_data['source']}")
-
-            with col5:
-                st.metric("🕐 Updated", system.vix_data.get('timestamp', system.nifty_data['timestamp']))
-
-        # VIX Interpretation Box
-        if system.vix_data and hasattr(system, 'vix_interpretation') and system.vix_interpretation:
-            st.markdown("---")
-
-            interp = system.vix_interpretation
-            vix_val = system.vix_data['current']
-
-            # Color-coded VIX interpretation
-            if vix_val < 12:
-                bg_color = "#d1fae5"  # light green
-                text_color = "#065f46"  # dark green
-            elif vix_val < 15:
-                bg_color = "#ecfccb"  # light lime
-                text_color = "#365314"  # dark lime
-            elif vix_val < 20:
-                bg_color = "#fef9c3"  # light yellow
-                text_color = "#713f12"  # dark yellow
-            elif vix_val < 30:
-                bg_color = "#fed7aa"  # light orange
-                text_color = "#7c2d12"  # dark orange
-            else:
-                bg_color = "#fecaca"  # light red
-                text_color = "#7f1d1d"  # dark red
-
-            st.markdown(f"""
-            <div style="background: {bg_color}; padding: 1rem; border-radius: 8px; border-left: 5px solid {text_color};">
-                <h4 style="color: {text_color}; margin: 0;">🎯 VIX Analysis: {interp['level']} Volatility</h4>
-                <p style="color: {text_color}; margin: 0.5rem 0;">
-                    <strong>Market Mood:</strong> {interp['market_mood']}<br>
-                    <strong>Recommended Strategy:</strong> {interp['strategy']}<br>
-                    <strong>Risk Level:</strong> {interp['risk']}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-
-        st.markdown("---")
-
-        # Trade recommendation
-        st.markdown("## 🎯 CURRENT TRADE RECOMMENDATION")
-
-        # Example trade (this should come from your options strategy logic)
-        is_market_open, _ = system.is_market_open()
-
-        if is_market_open:
-            # Simulate recommendation
-            trend = "BULLISH" if system.nifty_data['pct_change'] > 0 else "BEARISH"
-
-            # Get next weekly expiry
-            today = datetime.now()
-            days_until_thursday = (3 - today.weekday()) % 7
-            if days_until_thursday == 0 and today.time() > time(15, 30):
-                days_until_thursday = 7
-            next_expiry = today + timedelta(days=days_until_thursday)
-            expiry_str = next_expiry.strftime('%d%b%y').upper()
-
-            spot = system.nifty_data['last_price']
-            spot_rounded = round(spot / 50) * 50
-
-            if trend == "BULLISH":
-                trade_setup = {
-                    'strategy': 'Bull Call Spread',
-                    'max_profit': 3985,
-                    'max_loss': 6015,
-                    'breakeven': [spot_rounded + 120],
-                    'legs': [
-                        {
-                            'action': 'BUY',
-                            'option_type': 'CALL',
-                            'strike': spot_rounded,
-                            'expiry': expiry_str,
-                            'quantity': 50,
-                            'lots': 1,
-                            'expected_price': 285.50
-                        },
-                        {
-                            'action': 'SELL',
-                            'option_type': 'CALL',
-                            'strike': spot_rounded + 200,
-                            'expiry': expiry_str,
-                            'quantity': 50,
-                            'lots': 1,
-                            'expected_price': 165.20
-                        }
-                    ]
-                }
-            else:
-                trade_setup = {
-                    'strategy': 'Bear Put Spread',
-                    'max_profit': 3750,
-                    'max_loss': 6250,
-                    'breakeven': [spot_rounded - 125],
-                    'legs': [
-                        {
-                            'action': 'BUY',
-                            'option_type': 'PUT',
-                            'strike': spot_rounded,
-                            'expiry': expiry_str,
-                            'quantity': 50,
-                            'lots': 1,
-                            'expected_price': 290.00
-                        },
-                        {
-                            'action': 'SELL',
-                            'option_type': 'PUT',
-                            'strike': spot_rounded - 200,
-                            'expiry': expiry_str,
-                            'quantity': 50,
-                            'lots': 1,
-                            'expected_price': 165.00
-                        }
-                    ]
-                }
-
-            # Big alert
-            st.markdown(f'<div class="big-alert">🎯 RECOMMENDED: {trade_setup["strategy"]}</div>', unsafe_allow_html=True)
-
-            # Summary
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("Max Profit", f"₹{trade_setup['max_profit']:,}", delta="Potential Gain")
-            with col2:
-                st.metric("Max Loss", f"₹{trade_setup['max_loss']:,}", delta="Your Risk")
-            with col3:
-                roi = (trade_setup['max_profit'] / trade_setup['max_loss']) * 100
-                st.metric("ROI Potential", f"{roi:.1f}%")
-            with col4:
-                st.metric("Risk:Reward", f"1:{trade_setup['max_profit']/trade_setup['max_loss']:.2f}")
-
-            st.markdown("---")
-
-            # Detailed instructions
-            st.markdown("## 📱 GROWW ORDER PLACEMENT INSTRUCTIONS")
-
-            instructions = system.generate_groww_instructions(trade_setup)
-
-            st.code(instructions, language='text')
-
-            # Action buttons
-            col1, col2, col3 = st.columns(3)
-
-            with col1:
-                if st.button("📋 Copy All Instructions", use_container_width=True):
-                    st.success("✅ Instructions ready! Paste in Notes app")
-                    st.text_area("Copy from here:", instructions, height=300)
-
-            with col2:
-                if st.button("📱 Send to WhatsApp", use_container_width=True):
-                    st.info("Copy instructions and send to yourself on WhatsApp")
-
-            with col3:
-                if st.button("✅ Mark as Executed", use_container_width=True, type="primary"):
-                    # Save to history
-                    st.success("✅ Trade logged!")
-                    st.balloons()
-
-        else:
-            st.warning(f"🔴 Market is currently closed. Next trade signal will be available when market opens.")
-            hours, minutes, market_open = system.time_to_market_open()
-            st.info(f"⏰ Market opens in: {hours}h {minutes}m\n\n📅 {market_open.strftime('%d %B %Y, %I:%M %p')}")
-
-            st.markdown("### 🎯 What to do now:")
-            st.markdown("""
-            1. ✅ Review your Groww account - ensure sufficient balance
-            2. ✅ Check margin requirements for options trading
-            3. ✅ Set up price alerts in Groww
-            4. ✅ Review yesterday's trades (if any)
-            5. ✅ Read the strategy explanations
-            6. ✅ Prepare for market open at 9:15 AM
-            """)
+        # Only this fragment re-runs on the timer; the sidebar and other tabs stay idle
+        live_trade = st.fragment(render_live_trade, run_every=AUTO_REFRESH_SECONDS if auto_refresh else None)
+        live_trade(system)
 
     with tabs[1]:
         st.markdown("## 📊 Market Analysis")
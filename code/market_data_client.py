@@ -0,0 +1,152 @@
+"""
+Shared Market Data Client
+One pooled keep-alive HTTP session and a single Yahoo Finance chart parser
+used by every dashboard and CLI tool
+"""
+
+import threading
+from datetime import datetime
+
+import pandas as pd
+import requests
+
+from market_data_replay import adapter_from_env
+
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+
+def create_session(headers=None, pool_connections=4, pool_maxsize=10):
+    """
+    Create a requests session backed by a keep-alive connection pool
+    Recording and replay follow MARKET_DATA_RECORD_DIR / MARKET_DATA_REPLAY_URL
+    """
+    session = requests.Session()
+    adapter = adapter_from_env(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(headers or DEFAULT_HEADERS)
+    return session
+
+
+def parse_chart(payload):
+    """
+    Parse a Yahoo Finance v8 chart payload
+    Returns: dict with meta, timestamps and OHLCV lists
+    """
+    result = payload['chart']['result'][0]
+    quotes = result['indicators']['quote'][0]
+
+    return {
+        'meta': result['meta'],
+        'timestamp': result.get('timestamp', []),
+        'open': quotes.get('open', []),
+        'high': quotes.get('high', []),
+        'low': quotes.get('low', []),
+        'close': quotes.get('close', []),
+        'volume': quotes.get('volume', [])
+    }
+
+
+def chart_to_quote(chart):
+    """
+    Build the latest-quote dict used across the dashboards from a parsed chart
+    market_time is the exchange time (epoch seconds) of the last trade, unlike
+    timestamp, which is the local time of the request
+    """
+    meta = chart['meta']
+    closes = chart['close']
+
+    latest_idx = -1
+    current_price = meta.get('regularMarketPrice', closes[latest_idx] if closes else None)
+    prev_close = meta.get('chartPreviousClose', closes[-2] if len(closes) > 1 else current_price)
+
+    def latest(field, default):
+        values = chart[field]
+        return values[latest_idx] if values and values[latest_idx] else default
+
+    return {
+        'last_price': float(current_price),
+        'open': float(latest('open', current_price)),
+        'high': float(latest('high', current_price)),
+        'low': float(latest('low', current_price)),
+        'volume': int(latest('volume', 0)),
+        'previous_close': float(prev_close),
+        'change': float(current_price - prev_close),
+        'pct_change': float((current_price - prev_close) / prev_close * 100),
+        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'market_time': meta.get('regularMarketTime', chart['timestamp'][-1] if chart['timestamp'] else None)
+    }
+
+
+def chart_to_frame(chart):
+    """
+    Convert a parsed chart into an OHLCV DataFrame, dropping incomplete bars
+    """
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(chart['timestamp'], unit='s'),
+        'open': chart['open'],
+        'high': chart['high'],
+        'low': chart['low'],
+        'close': chart['close'],
+        'volume': chart['volume']
+    }).dropna()
+
+
+class MarketDataClient:
+    def __init__(self, session=None, timeout=10):
+        self.session = session or create_session()
+        self.timeout = timeout
+
+    def fetch_chart(self, symbol, interval='1d', range='1d', **params):
+        """
+        Fetch and parse a Yahoo chart for a symbol
+        Returns: parsed chart dict, or None on a non-200 response
+        Network errors propagate to the caller
+        """
+        url = YAHOO_CHART_URL.format(symbol=requests.utils.quote(symbol, safe=''))
+        params = dict(params, interval=interval)
+        if 'period1' not in params:
+            params['range'] = range
+
+        response = self.session.get(url, params=params, timeout=self.timeout)
+
+        if response.status_code == 200:
+            return parse_chart(response.json())
+        return None
+
+    def fetch_quote(self, symbol, range='1d'):
+        """
+        Fetch the latest quote for a symbol
+        Returns: quote dict, or None on a non-200 response
+        """
+        chart = self.fetch_chart(symbol, interval='1d', range=range)
+        if chart is None:
+            return None
+        return chart_to_quote(chart)
+
+    def fetch_history(self, symbol, range='60d', interval='1d'):
+        """
+        Fetch OHLCV history for a symbol
+        Returns: DataFrame, or None on a non-200 response
+        """
+        chart = self.fetch_chart(symbol, interval=interval, range=range)
+        if chart is None:
+            return None
+        return chart_to_frame(chart)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Return the process-wide MarketDataClient, creating it on first use
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MarketDataClient()
+    return _client
@@ -0,0 +1,185 @@
+"""
+Shared Market Data Hub
+One background poller per process that publishes the latest NIFTY/VIX snapshot
+to every dashboard session, so upstream load does not grow with viewers
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from bar_aggregator import BarAggregator, in_session, session_date
+from market_data_client import get_client
+from ohlcv_store import get_store
+from streaming_indicators import IndicatorStream
+
+# Daily bars used to seed the live indicator stream
+SEED_BARS = 250
+
+
+class MarketDataHub:
+    def __init__(self, vix_fetcher=None, poll_interval=15, vix_interval=60, idle_timeout=300):
+        self.vix_fetcher = vix_fetcher
+        self.poll_interval = poll_interval
+        self.vix_interval = vix_interval
+        self.idle_timeout = idle_timeout
+
+        self._snapshot = {'nifty': None, 'nifty_updated_at': None, 'vix': None, 'indicators': None,
+                          'vwap': None, 'updated_at': None, 'version': 0}
+        self._lock = threading.Lock()
+        self._first_poll = threading.Event()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_access = time.monotonic()
+        self._last_vix_poll = None
+        self._indicator_stream = None
+        self._bar_aggregator = BarAggregator('1m', cumulative_volume=True)
+        self._last_market_time = None
+
+    def start(self):
+        """Start the background poller if it is not already running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='market-data-hub', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background poller"""
+        self._stop.set()
+        self._wake.set()
+
+    def snapshot(self, timeout=10):
+        """
+        Latest published snapshot, shared by all sessions
+        Waits up to `timeout` seconds for the first poll after startup
+        Returns: dict with nifty, nifty_updated_at, vix, indicators, vwap, updated_at and version
+        """
+        self._last_access = time.monotonic()
+        self._wake.set()
+        self._first_poll.wait(timeout)
+
+        with self._lock:
+            return dict(self._snapshot)
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Nobody is watching: sleep until the next snapshot() call
+            if time.monotonic() - self._last_access > self.idle_timeout:
+                self._wake.clear()
+                self._wake.wait()
+                continue
+
+            self.poll_once()
+            self._stop.wait(self.poll_interval)
+
+    def poll_once(self):
+        """Fetch NIFTY every poll and VIX every vix_interval, then publish"""
+        nifty = self._fetch_nifty()
+        indicators = self._update_indicators(nifty) if nifty else None
+        if nifty:
+            self._aggregate(nifty)
+
+        vix = None
+        now = time.monotonic()
+        if self._last_vix_poll is None or now - self._last_vix_poll >= self.vix_interval:
+            vix = self._fetch_vix()
+            self._last_vix_poll = now
+
+        with self._lock:
+            # Keep the previous value of any source that failed this round
+            previous_vix = self._snapshot['vix']
+            if vix is None or (vix.get('status') != 'success' and previous_vix is not None):
+                vix = previous_vix
+
+            now = datetime.now()
+            self._snapshot = {
+                'nifty': nifty or self._snapshot['nifty'],
+                'nifty_updated_at': now if nifty else self._snapshot['nifty_updated_at'],
+                'vix': vix,
+                'indicators': indicators or self._snapshot['indicators'],
+                'vwap': self._bar_aggregator.vwap,
+                'updated_at': now,
+                'version': self._snapshot['version'] + 1
+            }
+
+        self._first_poll.set()
+
+    def intraday_bars(self, bars=None):
+        """
+        1-minute NIFTY bars built from the hub's own quote polls, forming bar included
+        Returns: BarWindow
+        """
+        return self._bar_aggregator.window(bars)
+
+    def _aggregate(self, nifty):
+        """
+        Polled quotes are the tick stream for the hub's 1-minute NIFTY bars,
+        stamped with their market time; repeats of the last quote and quotes
+        outside the session (overnight, weekends, holidays) are not ticks
+        """
+        market_time = nifty.get('market_time')
+        if market_time is None or not in_session(market_time):
+            return
+        if self._last_market_time is not None and market_time <= self._last_market_time:
+            return
+        self._last_market_time = market_time
+        self._bar_aggregator.update(market_time, nifty['last_price'], nifty['volume'])
+
+    def _fetch_nifty(self):
+        try:
+            return get_client().fetch_quote('^NSEI')
+        except Exception as e:
+            print(f"Hub NIFTY poll failed: {e}")
+            return None
+
+    def _update_indicators(self, nifty):
+        """
+        Feed the latest quote into the streaming indicators as the forming
+        daily bar: O(1) per poll instead of a full recompute. The bar is keyed
+        on the quote's market time, so polls on weekends, holidays or before
+        the open revise the last session's bar instead of adding a new one
+        Returns: dict of latest indicator values, or None
+        """
+        if nifty.get('market_time') is None:
+            return None
+        try:
+            if self._indicator_stream is None:
+                history = get_store().history('^NSEI', bars=SEED_BARS)
+                if history is None:
+                    return None
+                history = history.assign(timestamp=history['timestamp'].dt.strftime('%Y-%m-%d'))
+                self._indicator_stream = IndicatorStream.from_frame(history)
+
+            return self._indicator_stream.update(
+                nifty['last_price'], nifty['high'], nifty['low'], nifty['volume'],
+                bar_time=session_date(nifty['market_time'])
+            )
+        except Exception as e:
+            print(f"Hub indicator update failed: {e}")
+            return None
+
+    def _fetch_vix(self):
+        timestamp = datetime.now().strftime("%H:%M:%S")
+
+        if self.vix_fetcher is not None:
+            try:
+                return self.vix_fetcher.fetch_current_vix()
+            except Exception as e:
+                print(f"Hub VIX poll failed: {e}")
+                return {'current': 15.0, 'change': 0.0, 'change_percent': 0.0,
+                        'source': 'Fallback', 'status': 'error', 'timestamp': timestamp}
+
+        try:
+            vix_quote = get_client().fetch_quote('^INVIX', range='5d')
+        except Exception as e:
+            print(f"Hub VIX poll failed: {e}")
+            vix_quote = None
+
+        if vix_quote is not None:
+            return {'current': vix_quote['last_price'], 'change': 0.0, 'change_percent': 0.0,
+                    'source': 'Yahoo Finance', 'status': 'success', 'timestamp': timestamp}
+        return {'current': 15.0, 'change': 0.0, 'change_percent': 0.0,
+                'source': 'Default', 'status': 'fallback', 'timestamp': timestamp}
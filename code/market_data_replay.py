@@ -0,0 +1,308 @@
+"""
+Market Data Record/Replay
+Capture Yahoo Finance, NSE and Investing.com responses to disk and serve them
+back from a local stand-in server with configurable latency and failures,
+so refresh latency and throughput can be measured without a network.
+
+Every session built by market_data_client.create_session (the shared Yahoo
+client, the NSE session, the Investing.com VIX fetches) honours two
+environment variables:
+
+    MARKET_DATA_RECORD_DIR=recordings   save every response under this directory
+    MARKET_DATA_REPLAY_URL=http://127.0.0.1:8765
+                                        send every request to the stand-in server
+
+Usage:
+    python market_data_replay.py record --dir recordings
+    python market_data_replay.py serve --dir recordings --port 8765 --latency 0.05 --failure-rate 0.1
+    MARKET_DATA_REPLAY_URL=http://127.0.0.1:8765 streamlit run integrated_trading_dashboard.py
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from requests.adapters import HTTPAdapter
+
+RECORD_DIR_ENV = 'MARKET_DATA_RECORD_DIR'
+REPLAY_URL_ENV = 'MARKET_DATA_REPLAY_URL'
+
+# Query parameters that change on every call and must not be part of the key
+VOLATILE_PARAMS = {'period1', 'period2', '_'}
+
+# Upstream requests exercised by the `record` command
+RECORD_TARGETS = [
+    ('yahoo', '^NSEI', '1d'),
+    ('yahoo', '^NSEI', '5d'),
+    ('yahoo', '^INVIX', '1d'),
+    ('yahoo', '^INVIX', '5d'),
+    ('yahoo', '^NSEBANK', '1d'),
+    ('yahoo', '^NSEI', '10y'),
+    ('nse', "https://www.nseindia.com/api/allIndices", None),
+    ('nse', "https://www.nseindia.com/api/equity-stockIndices?index=NIFTY%2050", None),
+    ('nse', "https://www.nseindia.com/api/option-chain-indices?symbol=NIFTY", None),
+    ('investing', None, None),
+]
+
+
+def recording_key(url):
+    """
+    Stable key for an upstream URL: host, path and sorted non-volatile query
+    Returns: (host, path, canonical query string)
+    """
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if k not in VOLATILE_PARAMS)
+    return parts.netloc, parts.path or '/', urlencode(query)
+
+
+def recording_path(record_dir, url):
+    """File holding the recording for a URL"""
+    host, path, query = recording_key(url)
+    digest = hashlib.sha1(f"{path}?{query}".encode('utf-8')).hexdigest()[:16]
+    return os.path.join(record_dir, host, f"{digest}.json")
+
+
+def save_recording(record_dir, url, response):
+    """Write one response to disk, text bodies as UTF-8 and anything else as base64"""
+    path = recording_path(record_dir, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    host, url_path, query = recording_key(url)
+    body = response.content
+    try:
+        encoded, encoding = body.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        encoded, encoding = base64.b64encode(body).decode('ascii'), 'base64'
+
+    recording = {
+        'url': url,
+        'host': host,
+        'path': url_path,
+        'query': query,
+        'status': response.status_code,
+        'content_type': response.headers.get('Content-Type', 'application/octet-stream'),
+        'encoding': encoding,
+        'body': encoded,
+        'recorded_at': time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(recording, f)
+    os.replace(tmp_path, path)
+
+
+def rewrite_url(url, replay_url):
+    """Point an upstream URL at the stand-in server: https://host/path?q -> {replay_url}/host/path?q"""
+    parts = urlsplit(url)
+    rewritten = f"{replay_url.rstrip('/')}/{parts.netloc}{parts.path or '/'}"
+    return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+
+class RecordReplayAdapter(HTTPAdapter):
+    """
+    Transport adapter that optionally redirects requests to the stand-in server
+    and/or records every response keyed by its original upstream URL
+    """
+
+    def __init__(self, record_dir=None, replay_url=None, **kwargs):
+        self.record_dir = record_dir
+        self.replay_url = replay_url
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        upstream_url = request.url
+        if self.replay_url:
+            request.url = rewrite_url(upstream_url, self.replay_url)
+
+        response = super().send(request, **kwargs)
+
+        if self.record_dir:
+            save_recording(self.record_dir, upstream_url, response)
+        return response
+
+
+def adapter_from_env(**kwargs):
+    """
+    Transport adapter for new sessions: a RecordReplayAdapter when recording or
+    replay is configured in the environment, a plain pooled HTTPAdapter otherwise
+    """
+    record_dir = os.environ.get(RECORD_DIR_ENV)
+    replay_url = os.environ.get(REPLAY_URL_ENV)
+
+    if record_dir or replay_url:
+        return RecordReplayAdapter(record_dir=record_dir, replay_url=replay_url, **kwargs)
+    return HTTPAdapter(**kwargs)
+
+
+class ReplayServer:
+    """
+    Local HTTP stand-in for Yahoo, NSE and Investing.com. Serves recordings at
+    /<upstream host>/<path>?<query>; falls back to the latest recording of the
+    same path when the exact query was never recorded.
+    """
+
+    def __init__(self, record_dir, host='127.0.0.1', port=8765,
+                 latency=0.0, jitter=0.0, failure_rate=0.0, failure_status=503, seed=None):
+        self.record_dir = record_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.requests_served = 0
+        self.failures_injected = 0
+
+        self._by_key, self._by_path = self._load_index()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _load_index(self):
+        by_key, by_path = {}, {}
+        for root, _, files in os.walk(self.record_dir):
+            for name in sorted(files):
+                if not name.endswith('.json'):
+                    continue
+                with open(os.path.join(root, name)) as f:
+                    recording = json.load(f)
+                key = (recording['host'], recording['path'], recording['query'])
+                by_key[key] = recording
+                latest = by_path.get(key[:2])
+                if latest is None or recording['recorded_at'] >= latest['recorded_at']:
+                    by_path[key[:2]] = recording
+        return by_key, by_path
+
+    def lookup(self, request_path):
+        """Recording for a stand-in request path, or None"""
+        host, _, rest = request_path.lstrip('/').partition('/')
+        key = recording_key(f"https://{host}/{rest}")
+        return self._by_key.get(key) or self._by_path.get(key[:2])
+
+    def _roll(self):
+        """Draw (delay seconds, inject failure?) for one request"""
+        with self._random_lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self._random.random() < self.failure_rate
+        return delay, fail
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                delay, fail = server._roll()
+                if delay:
+                    time.sleep(delay)
+
+                server.requests_served += 1
+                recording = server.lookup(self.path)
+
+                if fail:
+                    server.failures_injected += 1
+                    self._reply(server.failure_status, 'text/plain', b'injected failure')
+                elif recording is None:
+                    self._reply(404, 'text/plain', b'no recording')
+                else:
+                    body = recording['body']
+                    body = base64.b64decode(body) if recording['encoding'] == 'base64' else body.encode('utf-8')
+                    self._reply(recording['status'], recording['content_type'], body)
+
+            def _reply(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def record(record_dir):
+    """Fetch every upstream request the dashboards make once, saving the responses"""
+    os.environ[RECORD_DIR_ENV] = record_dir
+
+    # Imported here so the sessions are created with recording enabled
+    from fetch_india_vix import IndiaVIXFetcher
+    from market_data_client import get_client
+    from nse_session import get_nse_session
+
+    for kind, target, range_ in RECORD_TARGETS:
+        try:
+            if kind == 'yahoo':
+                get_client().fetch_chart(target, interval='1d', range=range_)
+            elif kind == 'nse':
+                get_nse_session().get(target)
+            else:
+                fetcher = IndiaVIXFetcher()
+                get_client().session.get(fetcher.url, headers=fetcher.headers, timeout=10)
+            print(f"✅ Recorded {kind} {target or ''} {range_ or ''}")
+        except Exception as e:
+            print(f"⚠️  Could not record {kind} {target or ''}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='capture upstream responses to disk')
+    record_parser.add_argument('--dir', default='recordings')
+
+    serve_parser = subparsers.add_parser('serve', help='replay recordings from a local server')
+    serve_parser.add_argument('--dir', default='recordings')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    serve_parser.add_argument('--jitter', type=float, default=0.0, help='extra random delay, up to this many seconds')
+    serve_parser.add_argument('--failure-rate', type=float, default=0.0, help='fraction of requests answered with --failure-status')
+    serve_parser.add_argument('--failure-status', type=int, default=503)
+    serve_parser.add_argument('--seed', type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.dir)
+        return
+
+    server = ReplayServer(args.dir, host=args.host, port=args.port, latency=args.latency,
+                          jitter=args.jitter, failure_rate=args.failure_rate,
+                          failure_status=args.failure_status, seed=args.seed)
+    print(f"🔁 Replaying {args.dir} at {server.url}")
+    print(f"   export {REPLAY_URL_ENV}={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Multi-Timeframe Confluence
+Scores the trend, RSI and MACD rules of AdvancedTradingAssistant on 5m, 15m,
+1h and daily bars and combines them into one confluence score.
+
+Only 5-minute bars are fetched. Higher timeframes are rolled up from them
+incrementally: each update re-aggregates just the buckets touched by new or
+revised base bars, and every timeframe keeps a streaming indicator state that
+advances in O(1) per changed bar. Evaluating four timeframes therefore costs
+about the same as keeping one up to date.
+
+The 5-minute backfill spans only ~42 sessions, too few daily bars for the
+indicators, so the daily timeframe is seeded from stored daily bars and the
+base bars only roll into its latest (forming) bar.
+"""
+
+import threading
+
+import numpy as np
+
+from bar_aggregator import bucket_start, resample, timeframe_seconds
+from bar_buffer import BarBuffer, BarWindow
+from indicator_engine import MIN_BARS
+from streaming_indicators import IndicatorStream
+
+BASE_TIMEFRAME = '5m'
+CONFLUENCE_TIMEFRAMES = ('5m', '15m', '1h', '1d')
+
+# Higher timeframes carry more weight in the confluence score
+TIMEFRAME_WEIGHTS = {'5m': 1.0, '15m': 1.0, '1h': 1.5, '1d': 2.0}
+
+
+def score_trend_momentum(price_vs_sma20, price_vs_sma50, rsi, macd_crossover, macd_hist):
+    """
+    Trend (weight 3), RSI (weight 3) and MACD (weight 2) rules
+    Returns: (score, list of signal descriptions)
+    """
+    score = 0
+    signals = []
+
+    if price_vs_sma20 > 2 and price_vs_sma50 > 2:
+        score += 3
+        signals.append("✅ Strong uptrend (above both SMAs)")
+    elif price_vs_sma20 > 0 and price_vs_sma50 > 0:
+        score += 2
+        signals.append("📈 Uptrend (above SMAs)")
+    elif price_vs_sma20 < -2 and price_vs_sma50 < -2:
+        score -= 3
+        signals.append("❌ Strong downtrend (below both SMAs)")
+    elif price_vs_sma20 < 0 and price_vs_sma50 < 0:
+        score -= 2
+        signals.append("📉 Downtrend (below SMAs)")
+    else:
+        signals.append("➡️  Mixed trend signals")
+
+    if 40 < rsi < 60:
+        score += 1
+        signals.append("📊 RSI neutral (balanced momentum)")
+    elif 30 < rsi < 40:
+        score += 2
+        signals.append("📈 RSI oversold (bullish reversal setup)")
+    elif 60 < rsi < 70:
+        score -= 1
+        signals.append("⚠️  RSI approaching overbought")
+    elif rsi > 70:
+        score -= 3
+        signals.append("❌ RSI overbought (bearish reversal risk)")
+    elif rsi < 30:
+        score += 3
+        signals.append("✅ RSI oversold (strong bounce potential)")
+
+    if macd_crossover == 'Bullish' and macd_hist > 0:
+        score += 2
+        signals.append("✅ MACD bullish crossover")
+    elif macd_crossover == 'Bearish' and macd_hist < 0:
+        score -= 2
+        signals.append("❌ MACD bearish crossover")
+    else:
+        signals.append("➡️  MACD neutral")
+
+    return score, signals
+
+
+def score_indicators(indicators, price):
+    """
+    Apply score_trend_momentum to a dict of latest indicator values
+    Returns: (score, list of signal descriptions)
+    """
+    sma_20, sma_50 = indicators['SMA_20'], indicators['SMA_50']
+    macd, macd_signal = indicators['MACD'], indicators['MACD_Signal']
+    return score_trend_momentum(
+        (price - sma_20) / sma_20 * 100,
+        (price - sma_50) / sma_50 * 100,
+        indicators['RSI'],
+        'Bullish' if macd > macd_signal else 'Bearish',
+        indicators['MACD_Histogram'],
+    )
+
+
+class MultiTimeframeState:
+    """
+    Bar buffers and streaming indicators for every confluence timeframe,
+    all fed from one series of base bars
+    """
+
+    def __init__(self, timeframes=CONFLUENCE_TIMEFRAMES, base=BASE_TIMEFRAME, capacity=4096):
+        for timeframe in timeframes:
+            if timeframe_seconds(timeframe) < timeframe_seconds(base):
+                raise ValueError(f"Timeframe {timeframe} is finer than the {base} base bars")
+
+        self.timeframes = tuple(timeframes)
+        self.base = base
+        self.capacity = capacity
+        self.buffers = {timeframe: BarBuffer(capacity) for timeframe in self.timeframes}
+        self.streams = {timeframe: IndicatorStream() for timeframe in self.timeframes}
+        self.seeds = {}  # timeframe -> timestamp of its last seeded bar
+        self._last_base_ts = None
+        self._lock = threading.Lock()
+
+    def seed(self, timeframe, bars):
+        """
+        Replace a timeframe's history with stored bars at that timeframe (a
+        BarWindow or (6, n) array, e.g. OHLCVStore.load_array(symbol, '1d')).
+        Later updates only roll base bars from the last seeded bar onwards into it.
+        Returns: number of bars seeded
+        """
+        columns = bars.columns if isinstance(bars, BarWindow) else np.array(bars, dtype=np.float64)
+        columns = columns[:, -self.capacity:].copy()
+        if columns.shape[1] == 0:
+            return 0
+
+        # Stamp the bars on the same session-anchored buckets the roll-ups use
+        columns[0] = bucket_start(columns[0], timeframe_seconds(timeframe))
+
+        with self._lock:
+            buffer = BarBuffer(self.capacity)
+            buffer.extend(columns)
+            stream = IndicatorStream()
+            for timestamp, _, high, low, close, volume in columns.T:
+                stream.update(close, high, low, volume, bar_time=timestamp)
+
+            self.buffers[timeframe] = buffer
+            self.streams[timeframe] = stream
+            self.seeds[timeframe] = columns[0, -1]
+        return columns.shape[1]
+
+    def update(self, base_bars):
+        """
+        Bring every timeframe level with time-sorted base bars (a BarWindow or
+        the (6, n) array from OHLCVStore.load_array). Bars before the last one
+        already seen are skipped; the last one may have been revised.
+        Returns: number of base bars processed
+        """
+        columns = base_bars.columns if isinstance(base_bars, BarWindow) else np.asarray(base_bars)
+        columns = columns[:, -self.capacity:]
+        if columns.shape[1] == 0:
+            return 0
+
+        timestamps = columns[0]
+        with self._lock:
+            changed_from = timestamps[0] if self._last_base_ts is None else self._last_base_ts
+            first_changed = int(np.searchsorted(timestamps, changed_from, side='left'))
+            if first_changed == columns.shape[1]:
+                return 0
+
+            for timeframe in self.timeframes:
+                # Re-aggregate from the start of the bucket holding the first changed base bar
+                start = bucket_start(changed_from, timeframe_seconds(timeframe))
+                rolled = resample(columns[:, np.searchsorted(timestamps, start, side='left'):], timeframe).columns
+
+                # Seeded history is authoritative; base bars only form the bars after it
+                if timeframe in self.seeds:
+                    rolled = rolled[:, rolled[0] >= self.seeds[timeframe]]
+
+                self.buffers[timeframe].sync(rolled)
+                stream = self.streams[timeframe]
+                for timestamp, _, high, low, close, volume in rolled.T:
+                    stream.update(close, high, low, volume, bar_time=timestamp)
+
+            self._last_base_ts = timestamps[-1]
+            return columns.shape[1] - first_changed
+
+    def bars(self, timeframe, bars=None):
+        """Returns: BarWindow of the last `bars` bars at one timeframe"""
+        return self.buffers[timeframe].window(bars)
+
+    def ready(self, timeframe):
+        """Whether a timeframe has enough bars for every indicator"""
+        return self.streams[timeframe].bars >= MIN_BARS
+
+    def confluence(self, price=None, weights=TIMEFRAME_WEIGHTS):
+        """
+        Score every timeframe with enough bars and combine them
+        price: price to compare with the moving averages, default the last base close
+        Returns: dict with 'score' (weighted mean of timeframe scores), 'bullish',
+        'bearish' and 'evaluated' timeframe counts, 'timeframes' mapping each
+        evaluated timeframe to its score, signals and indicators, and 'missing'
+        listing the timeframes left out for lack of bars
+        """
+        with self._lock:
+            if price is None:
+                window = self.buffers[self.timeframes[0]].window(1)
+                price = float(window.close[-1]) if len(window) else None
+
+            timeframes = {}
+            for timeframe in self.timeframes:
+                if price is None or not self.ready(timeframe):
+                    continue
+                indicators = self.streams[timeframe].latest()
+                score, signals = score_indicators(indicators, price)
+                timeframes[timeframe] = {'score': score, 'signals': signals, 'indicators': indicators}
+
+        total_weight = sum(weights.get(timeframe, 1.0) for timeframe in timeframes)
+        score = (sum(weights.get(timeframe, 1.0) * result['score'] for timeframe, result in timeframes.items())
+                 / total_weight if total_weight else 0.0)
+
+        return {
+            'score': score,
+            'bullish': sum(1 for result in timeframes.values() if result['score'] > 0),
+            'bearish': sum(1 for result in timeframes.values() if result['score'] < 0),
+            'evaluated': len(timeframes),
+            'timeframes': timeframes,
+            'missing': [timeframe for timeframe in self.timeframes if timeframe not in timeframes],
+        }
+
+
+_states = {}
+_states_lock = threading.Lock()
+
+
+def get_multi_timeframe(symbol, timeframes=CONFLUENCE_TIMEFRAMES):
+    """
+    Return the process-wide MultiTimeframeState for a symbol, creating it on first use
+    """
+    key = (symbol, tuple(timeframes))
+    if key not in _states:
+        with _states_lock:
+            if key not in _states:
+                _states[key] = MultiTimeframeState(timeframes)
+    return _states[key]
@@ -0,0 +1,78 @@
+"""
+Persistent NSE India Session
+NSE's JSON APIs reject requests without the cookies set by the homepage.
+This keeps one long-lived session, warms its cookies once, and re-warms only
+when they expire or the API answers 401/403.
+"""
+
+import threading
+import time
+
+from market_data_client import create_session
+
+NSE_HOME_URL = "https://www.nseindia.com"
+NSE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+class NSESession:
+    def __init__(self, cookie_ttl=300, timeout=10):
+        self.cookie_ttl = cookie_ttl
+        self.timeout = timeout
+        self.session = create_session(headers=NSE_HEADERS)
+        self._warmed_at = None
+        self._lock = threading.Lock()
+
+    def warm(self, rejected_at=None):
+        """
+        Hit the NSE homepage for cookies unless the current ones are still fresh
+        rejected_at: warmup time of cookies NSE just rejected; forces a re-warm
+        unless another caller has already re-warmed since
+        Concurrent callers share a single warmup request
+        """
+        with self._lock:
+            if rejected_at is not None:
+                if self._warmed_at != rejected_at:
+                    return
+            elif self._warmed_at is not None and time.monotonic() - self._warmed_at < self.cookie_ttl:
+                return
+
+            self.session.cookies.clear()
+            self.session.get(NSE_HOME_URL, timeout=self.timeout)
+            self._warmed_at = time.monotonic()
+
+    def get(self, url, **kwargs):
+        """
+        GET an NSE API URL with warm cookies, re-warming once on 401/403
+        Returns: requests.Response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+
+        self.warm()
+        warmed_at = self._warmed_at
+        response = self.session.get(url, **kwargs)
+
+        if response.status_code in (401, 403):
+            self.warm(rejected_at=warmed_at)
+            response = self.session.get(url, **kwargs)
+
+        return response
+
+
+_nse_session = None
+_nse_session_lock = threading.Lock()
+
+
+def get_nse_session():
+    """
+    Return the process-wide NSESession, creating it on first use
+    """
+    global _nse_session
+    if _nse_session is None:
+        with _nse_session_lock:
+            if _nse_session is None:
+                _nse_session = NSESession()
+    return _nse_session
@@ -0,0 +1,226 @@
+"""
+Local OHLCV Store
+Columnar on-disk daily bars per symbol with incremental append from Yahoo Finance
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from market_data_client import get_client
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# Range requested the first time a symbol is stored
+BACKFILL_RANGE = '10y'
+
+# Yahoo only serves a limited lookback at intraday intervals
+INTRADAY_BACKFILL_RANGES = {
+    '1m': '7d',
+    '2m': '60d',
+    '5m': '60d',
+    '15m': '60d',
+    '30m': '60d',
+    '60m': '730d',
+    '1h': '730d',
+}
+
+# Margin kept inside an intraday lookback so a request never reaches past it
+LOOKBACK_MARGIN = 60 * 60
+
+
+class OHLCVStore:
+    """
+    Each (symbol, interval) lives in one .npy file holding a (6, n) float64 array:
+    one contiguous row per column (epoch-second timestamps, OHLC, volume).
+    Loading is a single memory-mapped read; updates only request bars from the
+    last stored bar onwards, so the still-forming bar is replaced as it changes.
+    """
+
+    def __init__(self, root=os.path.join('.cache', 'ohlcv'), client=None):
+        self.root = root
+        self.client = client
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _path(self, symbol, interval):
+        safe_symbol = ''.join(c if c.isalnum() else '_' for c in symbol)
+        return os.path.join(self.root, f"{safe_symbol}_{interval}.npy")
+
+    def _file_lock(self, symbol, interval):
+        """One lock per stored file so different symbols update concurrently"""
+        with self._lock:
+            return self._locks.setdefault((symbol, interval), threading.Lock())
+
+    def load_array(self, symbol, interval='1d'):
+        """
+        Memory-map the stored columns for a symbol
+        Returns: read-only (6, n) array, or None when nothing is stored
+        """
+        path = self._path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode='r')
+
+    def load(self, symbol, interval='1d', bars=None):
+        """
+        Load stored bars as a DataFrame, optionally only the last `bars` rows
+        """
+        columns = self.load_array(symbol, interval)
+        if columns is None:
+            return None
+
+        if bars is not None:
+            columns = columns[:, -bars:]
+
+        frame = pd.DataFrame({name: np.array(columns[i]) for i, name in enumerate(COLUMNS)})
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'], unit='s')
+        return frame
+
+    def update(self, symbol, interval='1d'):
+        """
+        Fetch bars newer than the last stored bar and append them
+        Returns: number of stored bars after the update
+        """
+        client = self.client or get_client()
+
+        with self._file_lock(symbol, interval):
+            stored = self.load_array(symbol, interval)
+
+            if stored is None or stored.shape[1] == 0:
+                chart = client.fetch_chart(symbol, interval=interval,
+                                           range=INTRADAY_BACKFILL_RANGES.get(interval, BACKFILL_RANGE))
+            else:
+                now = int(time.time())
+                period1 = int(stored[0, -1])
+                if interval in INTRADAY_BACKFILL_RANGES:
+                    # Yahoo rejects intraday requests reaching past its lookback;
+                    # after a longer gap resume from the oldest bar it still serves
+                    lookback = int(INTRADAY_BACKFILL_RANGES[interval][:-1]) * 86400
+                    period1 = max(period1, now - lookback + LOOKBACK_MARGIN)
+                chart = client.fetch_chart(symbol, interval=interval, period1=period1, period2=now)
+
+            if chart is None:
+                print(f"OHLCV store update for {symbol} ({interval}) got no chart")
+                return 0 if stored is None else stored.shape[1]
+
+            fresh = self._chart_columns(chart)
+
+            if stored is not None and fresh.shape[1] > 0:
+                # Keep stored bars strictly older than the first fetched bar
+                keep = np.searchsorted(stored[0], fresh[0, 0], side='left')
+                merged = np.concatenate([stored[:, :keep], fresh], axis=1)
+            elif stored is not None:
+                return stored.shape[1]
+            else:
+                merged = fresh
+
+            self._write(symbol, interval, merged)
+            return merged.shape[1]
+
+    def history(self, symbol, bars=None, interval='1d'):
+        """
+        Bring a symbol up to date and return its last `bars` rows as a DataFrame
+        Falls back to whatever is already stored if the update fails
+        """
+        try:
+            self.update(symbol, interval)
+        except Exception as e:
+            print(f"OHLCV store update for {symbol} failed: {e}")
+        return self.load(symbol, interval, bars=bars)
+
+    def load_matrix(self, symbols, interval='1d', bars=None):
+        """
+        Load several symbols as aligned (time x symbols) matrices over the union
+        of their bars (matched by day for daily intervals), NaN where a symbol
+        has no bar. A stale, recently listed or gappy symbol only leaves holes in
+        its own column instead of truncating every other one.
+        Symbols with nothing stored are dropped.
+        Returns: dict with symbols, timestamp (epoch seconds) and one contiguous
+        float64 matrix per OHLCV column, or None when no symbol is stored
+        """
+        arrays = {}
+        for symbol in symbols:
+            columns = self.load_array(symbol, interval)
+            if columns is not None and columns.shape[1] > 0:
+                arrays[symbol] = columns
+
+        if not arrays:
+            return None
+
+        # Exchanges stamp daily bars at slightly different times; align on the day
+        unit = 86400 if interval.endswith(('d', 'wk', 'mo')) else 1
+        keys = {symbol: np.floor_divide(columns[0], unit) for symbol, columns in arrays.items()}
+
+        union = np.unique(np.concatenate(list(keys.values())))
+        if bars is not None:
+            union = union[-bars:]
+
+        timestamp = np.full(len(union), np.nan)
+        matrix = {'symbols': list(arrays)}
+        for name in COLUMNS[1:]:
+            matrix[name] = np.full((len(union), len(arrays)), np.nan)
+
+        for j, (symbol, columns) in enumerate(arrays.items()):
+            rows = np.searchsorted(union, keys[symbol])
+            present = rows < len(union)
+            present[present] = union[rows[present]] == keys[symbol][present]
+            rows = rows[present]
+
+            timestamp[rows] = columns[0][present]
+            for i, name in enumerate(COLUMNS[1:], start=1):
+                matrix[name][rows, j] = columns[i][present]
+
+        matrix['timestamp'] = timestamp
+        return matrix
+
+    def history_matrix(self, symbols, bars=None, interval='1d', max_workers=8):
+        """
+        Bring several symbols up to date concurrently and return them as aligned matrices
+        Symbols whose update fails fall back to what is already stored
+        """
+        def update(symbol):
+            try:
+                self.update(symbol, interval)
+            except Exception as e:
+                print(f"OHLCV store update for {symbol} failed: {e}")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(update, symbols))
+
+        return self.load_matrix(symbols, interval, bars=bars)
+
+    def _chart_columns(self, chart):
+        """Convert a parsed chart into a (6, n) array, dropping incomplete bars"""
+        columns = np.array([chart[name] for name in COLUMNS], dtype=float).reshape(len(COLUMNS), -1)
+        complete = ~np.isnan(columns).any(axis=0)
+        return np.ascontiguousarray(columns[:, complete])
+
+    def _write(self, symbol, interval, columns):
+        """Atomically replace the stored file"""
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(symbol, interval)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(columns, dtype=np.float64))
+        os.replace(tmp_path, path)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    Return the process-wide OHLCVStore, creating it on first use
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = OHLCVStore()
+    return _store
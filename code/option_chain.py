@@ -0,0 +1,121 @@
+"""
+NSE Option Chain Snapshots
+Fetches the NSE option chain for an index, flattens it into one row per
+(expiry, strike, type) quote and solves implied volatility for the whole
+snapshot in a single vectorized call.
+"""
+
+from collections import namedtuple
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from implied_volatility import implied_volatility
+from nse_session import get_nse_session
+from option_greeks import years_to_expiry
+
+NSE_OPTION_CHAIN_URL = "https://www.nseindia.com/api/option-chain-indices?symbol={symbol}"
+
+OPTION_TYPES = {'CE': 'CALL', 'PE': 'PUT'}
+
+# spot: underlying value; timestamp: NSE snapshot time; quotes: one row per option
+OptionChainSnapshot = namedtuple('OptionChainSnapshot', ['symbol', 'spot', 'timestamp', 'quotes'])
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def parse_option_chain(payload, symbol='NIFTY'):
+    """
+    Flatten an NSE option-chain JSON payload
+    Premium is the bid/ask mid when both sides are quoted, else the last price
+    Returns: OptionChainSnapshot; quotes has expiry, strike, option_type,
+    last_price, bid, ask, premium, open_interest and nse_iv (%) columns
+    """
+    records = payload.get('records', {})
+    rows = []
+    for entry in records.get('data', []):
+        for side, option_type in OPTION_TYPES.items():
+            option = entry.get(side)
+            if not option:
+                continue
+            rows.append((
+                entry.get('expiryDate', option.get('expiryDate')),
+                _number(entry.get('strikePrice', option.get('strikePrice'))),
+                option_type,
+                _number(option.get('lastPrice')),
+                _number(option.get('bidprice')),
+                _number(option.get('askPrice')),
+                _number(option.get('openInterest')),
+                _number(option.get('impliedVolatility')),
+            ))
+
+    quotes = pd.DataFrame(rows, columns=['expiry', 'strike', 'option_type', 'last_price', 'bid', 'ask',
+                                         'open_interest', 'nse_iv'])
+    quoted = (quotes['bid'] > 0) & (quotes['ask'] >= quotes['bid'])
+    quotes.insert(6, 'premium', np.where(quoted, (quotes['bid'] + quotes['ask']) / 2, quotes['last_price']))
+
+    return OptionChainSnapshot(symbol, _number(records.get('underlyingValue')), records.get('timestamp'), quotes)
+
+
+def solve_implied_volatility(snapshot, now=None):
+    """
+    Add time_to_expiry (years) and iv (decimal) columns for every quote in one solver call
+    Returns: OptionChainSnapshot with the extended quotes
+    """
+    quotes = snapshot.quotes.copy()
+    expiries = {expiry: years_to_expiry(expiry, now) for expiry in quotes['expiry'].unique()}
+    quotes['time_to_expiry'] = quotes['expiry'].map(expiries).astype(float)
+    quotes['iv'] = implied_volatility(
+        quotes['premium'].to_numpy(), snapshot.spot, quotes['strike'].to_numpy(),
+        quotes['time_to_expiry'].to_numpy(), quotes['option_type'].to_numpy())
+    return snapshot._replace(quotes=quotes)
+
+
+def fetch_option_chain(symbol='NIFTY'):
+    """
+    Fetch and solve the current NSE option chain
+    Returns: OptionChainSnapshot, or None
+    """
+    response = get_nse_session().get(NSE_OPTION_CHAIN_URL.format(symbol=quote(symbol)))
+    if response.status_code != 200:
+        return None
+
+    snapshot = parse_option_chain(response.json(), symbol)
+    if snapshot.quotes.empty or np.isnan(snapshot.spot):
+        return None
+    return solve_implied_volatility(snapshot)
+
+
+def otm_quotes(snapshot):
+    """
+    Liquid side of the chain: unexpired, solved quotes of puts at or below spot and calls above
+    Returns: DataFrame, a subset of snapshot.quotes
+    """
+    quotes = snapshot.quotes
+    otm = ((quotes['option_type'] == 'PUT') & (quotes['strike'] <= snapshot.spot)) | \
+          ((quotes['option_type'] == 'CALL') & (quotes['strike'] > snapshot.spot))
+    return quotes[otm & (quotes['time_to_expiry'] > 0) & quotes['iv'].notna()]
+
+
+def otm_smile(snapshot, expiry=None):
+    """
+    Implied volatility by strike for one expiry (the nearest unexpired one by
+    default), from the OTM quotes
+    Returns: (expiry, time_to_expiry, strikes, ivs) with strikes ascending, or None
+    """
+    otm = otm_quotes(snapshot)
+    if otm.empty:
+        return None
+    if expiry is None:
+        expiry = otm.loc[otm['time_to_expiry'].idxmin(), 'expiry']
+
+    otm = otm[otm['expiry'] == expiry].sort_values('strike')
+    if otm.empty:
+        return None
+    return expiry, float(otm['time_to_expiry'].iloc[0]), otm['strike'].to_numpy(), otm['iv'].to_numpy()
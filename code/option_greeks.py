@@ -0,0 +1,119 @@
+"""
+Analytic Black-Scholes Greeks
+Price, delta, gamma, theta, vega and rho for any number of option legs in one
+vectorized pass that shares d1/d2 and the normal CDF/PDF evaluations, plus
+net position Greeks for strategies and portfolios.
+
+Units follow NSE trading screens:
+    delta, gamma   per 1 point move in the underlying
+    theta          per calendar day
+    vega           per 1 volatility point (1%)
+    rho            per 1% change in the risk-free rate
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from option_pricing import RISK_FREE_RATE, d1_d2, is_call, norm_cdf, norm_pdf
+
+GREEKS = ('delta', 'gamma', 'theta', 'vega', 'rho')
+
+# NSE index options expire at the close
+EXPIRY_CLOSE_HOUR = 15
+EXPIRY_CLOSE_MINUTE = 30
+
+
+def price_and_greeks(spot, strike, time_to_expiry, volatility, option_type='call',
+                     rate=RISK_FREE_RATE, fast_cdf=True):
+    """
+    Black-Scholes price and Greeks per unit of underlying; arguments broadcast
+    Legs at expiry or with zero volatility get their intrinsic value, a 0/1
+    delta and zero gamma and vega
+    Returns: dict of 'price' and every GREEKS name -> array of the broadcast shape
+    """
+    d1, d2, vol_sqrt_t = d1_d2(spot, strike, time_to_expiry, volatility, rate)
+    spot = np.asarray(spot, dtype=np.float64)
+    time_to_expiry = np.asarray(time_to_expiry, dtype=np.float64)
+    discounted_strike = np.asarray(strike, dtype=np.float64) * np.exp(-rate * time_to_expiry)
+
+    # Calls read N(d1), N(d2); puts read N(-d1), N(-d2)
+    sign = np.where(is_call(option_type), 1.0, -1.0)
+    cdf = norm_cdf(np.stack(np.broadcast_arrays(sign * d1, sign * d2)), fast=fast_cdf)
+    pdf = norm_pdf(d1)
+    strike_cdf = discounted_strike * cdf[1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = {
+            'price': sign * (spot * cdf[0] - strike_cdf),
+            'delta': sign * cdf[0],
+            'gamma': pdf / (spot * vol_sqrt_t),
+            'theta': (-spot * pdf * vol_sqrt_t / (2.0 * time_to_expiry) - sign * rate * strike_cdf) / 365.0,
+            'vega': spot * pdf * np.sqrt(time_to_expiry) / 100.0,
+            'rho': sign * time_to_expiry * strike_cdf / 100.0,
+        }
+
+    degenerate = ~(vol_sqrt_t > 0)
+    if np.any(degenerate):
+        in_the_money = (sign * (spot - discounted_strike) > 0).astype(np.float64)
+        limits = {
+            'price': in_the_money * sign * (spot - discounted_strike),
+            'delta': in_the_money * sign,
+            'gamma': 0.0,
+            'theta': -in_the_money * sign * rate * discounted_strike / 365.0,
+            'vega': 0.0,
+            'rho': in_the_money * sign * time_to_expiry * discounted_strike / 100.0,
+        }
+        for name, limit in limits.items():
+            result[name] = np.where(degenerate, limit, result[name])
+
+    shape = np.broadcast(d1, sign).shape
+    return {name: np.broadcast_to(values, shape) for name, values in result.items()}
+
+
+def net_greeks(spot, strike, time_to_expiry, volatility, option_type, quantity,
+               rate=RISK_FREE_RATE, fast_cdf=True):
+    """
+    Net Greeks of a set of legs; quantity is signed units of underlying
+    (positive long, negative short), so results are in rupees per unit move
+    Returns: dict with every GREEKS name -> net float, 'value' (mark-to-model
+    position value) and 'legs' (per-leg dicts of the same, quantity-weighted)
+    """
+    legs = price_and_greeks(spot, strike, time_to_expiry, volatility, option_type, rate, fast_cdf)
+    quantity = np.asarray(quantity, dtype=np.float64)
+
+    weighted = {name: legs[name] * quantity for name in GREEKS}
+    weighted['value'] = legs['price'] * quantity
+
+    net = {name: float(values.sum()) for name, values in weighted.items()}
+    names = list(weighted)
+    net['legs'] = [dict(zip(names, values)) for values in zip(*(weighted[name].tolist() for name in names))]
+    return net
+
+
+def signed_quantity(action, units):
+    """Units of underlying for one leg: positive for BUY, negative for SELL"""
+    return units if action.upper() == 'BUY' else -units
+
+
+def years_to_expiry(expiry, now=None):
+    """
+    Year fraction until the 15:30 close on an expiry date ('13-FEB-2026',
+    '2026-02-13', a date or a datetime); zero once it has passed
+    """
+    now = now or datetime.now()
+    if isinstance(expiry, str):
+        for fmt in ('%d-%b-%Y', '%Y-%m-%d'):
+            try:
+                expiry = datetime.strptime(expiry.title(), fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"Unrecognised expiry date: {expiry}")
+    if not isinstance(expiry, datetime):
+        expiry = datetime(expiry.year, expiry.month, expiry.day)
+    if expiry.hour == 0 and expiry.minute == 0:
+        expiry = expiry.replace(hour=EXPIRY_CLOSE_HOUR, minute=EXPIRY_CLOSE_MINUTE)
+
+    return max((expiry - now).total_seconds(), 0.0) / (365.0 * 24 * 60 * 60)
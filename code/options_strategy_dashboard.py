@@ -10,12 +10,26 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-import requests
 from datetime import datetime, timedelta
-from scipy.stats import norm
 import warnings
 warnings.filterwarnings('ignore')
 
+from option_greeks import GREEKS, net_greeks, signed_quantity
+from option_pricing import black_scholes
+from payoff_engine import breakevens, legs_from_trades, payoff_at_expiry, pnl_before_expiry, price_grid
+from quote_cache import cached_history, cached_option_chain, cached_quote
+from volatility_estimators import latest_estimates, vol_cone
+from volatility_surface import get_volatility_surface
+
+# Daily bars behind the realized volatility estimates and vol cone (~2 years)
+VOL_HISTORY_BARS = 504
+
+# Floor for quoted premiums, so far OTM legs never price at zero
+MIN_OPTION_PRICE = 0.1
+
+# NIFTY contract size used for position-level figures
+LOT_SIZE = 50
+
 # Page configuration
 st.set_page_config(
     page_title="NIFTY Options Strategy Recommender",
@@ -99,7 +113,11 @@ class OptionsStrategyRecommender:
         self.nifty_data = None
         self.vix_data = None
         self.historical_data = None
+        self.historical_volatility = 20
+        self.realized_volatility = None
+        self.vol_cone = None
         self.options_chain = None
+        self.surface = None
         self.recommended_strategy = None
         self.trade_setup = None
 
@@ -210,41 +228,16 @@ class OptionsStrategyRecommender:
         """Fetch comprehensive market data"""
         try:
             # Fetch NIFTY 50
-            url = "https://query1.finance.yahoo.com/v8/finance/chart/%5ENSEI"
-            params = {'interval': '1d', 'range': '1d'}
-            headers = {'User-Agent': 'Mozilla/5.0'}
-
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                result = data['chart']['result'][0]
-                meta = result['meta']
-                quotes = result['indicators']['quote'][0]
-
-                latest_idx = -1
-                current_price = meta.get('regularMarketPrice', quotes['close'][latest_idx])
-                prev_close = meta.get('chartPreviousClose', quotes['close'][-2] if len(quotes['close']) > 1 else current_price)
-
-                self.nifty_data = {
-                    'last_price': float(current_price),
-                    'open': float(quotes['open'][latest_idx]) if quotes['open'][latest_idx] else current_price,
-                    'high': float(quotes['high'][latest_idx]) if quotes['high'][latest_idx] else current_price,
-                    'low': float(quotes['low'][latest_idx]) if quotes['low'][latest_idx] else current_price,
-                    'previous_close': float(prev_close),
-                    'change': float(current_price - prev_close),
-                    'pct_change': float((current_price - prev_close) / prev_close * 100),
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
+            quote = cached_quote('^NSEI')
+
+            if quote is not None:
+                self.nifty_data = quote
 
             # Fetch VIX
-            url_vix = "https://query1.finance.yahoo.com/v8/finance/chart/%5EINVIX"
-            response_vix = requests.get(url_vix, params={'interval': '1d', 'range': '5d'}, headers=headers, timeout=10)
+            vix_quote = cached_quote('^INVIX', range='5d', kind='vix')
 
-            if response_vix.status_code == 200:
-                data_vix = response_vix.json()
-                vix_price = data_vix['chart']['result'][0]['meta'].get('regularMarketPrice', 15.0)
-                self.vix_data = {'current': float(vix_price)}
+            if vix_quote is not None:
+                self.vix_data = {'current': vix_quote['last_price']}
             else:
                 self.vix_data = {'current': 15.0}
 
@@ -255,31 +248,45 @@ class OptionsStrategyRecommender:
             return False
 
     def fetch_historical_data(self):
-        """Fetch historical data for volatility calculation"""
+        """Fetch historical OHLC data for realized volatility and the vol cone"""
         try:
-            url = "https://query1.finance.yahoo.com/v8/finance/chart/%5ENSEI"
-            params = {'interval': '1d', 'range': '30d'}
-            headers = {'User-Agent': 'Mozilla/5.0'}
-
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            history = cached_history('^NSEI', bars=VOL_HISTORY_BARS)
 
-            if response.status_code == 200:
-                data = response.json()
-                result = data['chart']['result'][0]
-                quotes = result['indicators']['quote'][0]
+            if history is not None:
+                self.historical_data = history[['timestamp', 'open', 'high', 'low', 'close']]
 
-                self.historical_data = pd.DataFrame({
-                    'close': quotes['close']
-                }).dropna()
-
-                # Calculate historical volatility
-                returns = np.log(self.historical_data['close'] / self.historical_data['close'].shift(1))
-                self.historical_volatility = returns.std() * np.sqrt(252) * 100
+                # 30-day Yang-Zhang volatility, plus every estimator for comparison
+                self.realized_volatility = latest_estimates(self.historical_data, window=30)
+                self.historical_volatility = self.realized_volatility['yang_zhang']
+                self.vol_cone = vol_cone(self.historical_data)
                 return True
         except:
             self.historical_volatility = 20
             return False
 
+    def fetch_option_chain(self):
+        """Fetch the NIFTY option chain and refresh the shared volatility surface from it"""
+        try:
+            self.options_chain = cached_option_chain('NIFTY')
+            if self.options_chain is not None:
+                surface = get_volatility_surface('NIFTY')
+                surface.update(self.options_chain)
+                self.surface = surface if len(surface) else None
+            return self.surface is not None
+        except Exception as e:
+            print(f"Option chain fetch failed: {e}")
+            return False
+
+    def volatility_for(self, strikes, time_to_expiry, fallback):
+        """
+        Implied volatility (decimal) per strike from the volatility surface;
+        fallback when there is no option chain
+        Returns: float for a single strike, array otherwise
+        """
+        if self.surface is None:
+            return fallback
+        return self.surface.implied_volatility(strikes, time_to_expiry)
+
     def analyze_market_condition(self):
         """Analyze current market condition"""
         trend = 'neutral'
@@ -410,28 +417,30 @@ class OptionsStrategyRecommender:
         return recommendations
 
     def calculate_option_prices(self, spot, strike, time_to_expiry, volatility, option_type='call'):
-        """Calculate option price using Black-Scholes (simplified)"""
-        r = 0.07  # Risk-free rate
-
-        d1 = (np.log(spot / strike) + (r + 0.5 * volatility ** 2) * time_to_expiry) / (volatility * np.sqrt(time_to_expiry))
-        d2 = d1 - volatility * np.sqrt(time_to_expiry)
-
-        if option_type == 'call':
-            price = spot * norm.cdf(d1) - strike * np.exp(-r * time_to_expiry) * norm.cdf(d2)
-        else:  # put
-            price = strike * np.exp(-r * time_to_expiry) * norm.cdf(-d2) - spot * norm.cdf(-d1)
-
-        return max(price, 0.1)
+        """
+        Black-Scholes price(s) at the volatility surface's IV for each strike,
+        floored at MIN_OPTION_PRICE; volatility is the flat fallback without a chain
+        Arguments broadcast, so a list of strikes and option types prices
+        every leg of a strategy in one vectorized evaluation
+        Returns: float for a single option, list of floats otherwise
+        """
+        volatility = self.volatility_for(strike, time_to_expiry, volatility)
+        prices = np.maximum(black_scholes(spot, strike, time_to_expiry, volatility, option_type), MIN_OPTION_PRICE)
+        return prices.tolist()
 
     def generate_trade_setup(self, strategy_key, market_condition):
         """Generate specific trade setup for the strategy"""
         spot = self.nifty_data['last_price']
         vix = self.vix_data['current']
-        volatility = vix / 100  # Convert to decimal
+        volatility = vix / 100  # Convert to decimal, used when there is no option chain
 
-        # Days to expiry (assuming weekly expiry)
-        days_to_expiry = 7
-        time_to_expiry = days_to_expiry / 365
+        # Nearest expiry from the option chain, else assume a weekly expiry
+        if self.surface is not None:
+            time_to_expiry = self.surface.expiries[0][1]
+            days_to_expiry = time_to_expiry * 365
+        else:
+            days_to_expiry = 7
+            time_to_expiry = days_to_expiry / 365
 
         # Round to nearest 50
         spot_rounded = round(spot / 50) * 50
@@ -440,6 +449,7 @@ class OptionsStrategyRecommender:
             'strategy': strategy_key,
             'spot_price': spot,
             'expiry_days': days_to_expiry,
+            'time_to_expiry': time_to_expiry,
             'trades': [],
             'max_profit': 0,
             'max_loss': 0,
@@ -452,13 +462,12 @@ class OptionsStrategyRecommender:
             buy_strike = spot_rounded
             sell_strike = spot_rounded + 200
 
-            buy_premium = self.calculate_option_prices(spot, buy_strike, time_to_expiry, volatility, 'call')
-            sell_premium = self.calculate_option_prices(spot, sell_strike, time_to_expiry, volatility, 'call')
+            buy_premium, sell_premium = self.calculate_option_prices(
+                spot, [buy_strike, sell_strike], time_to_expiry, volatility, 'call')
 
             net_debit = buy_premium - sell_premium
             max_profit = (sell_strike - buy_strike) - net_debit
             max_loss = net_debit
-            breakeven = buy_strike + net_debit
 
             trade_setup['trades'] = [
                 {'action': 'BUY', 'type': 'CALL', 'strike': buy_strike, 'premium': buy_premium, 'lots': 1},
@@ -466,7 +475,6 @@ class OptionsStrategyRecommender:
             ]
             trade_setup['max_profit'] = max_profit * 50  # Lot size
             trade_setup['max_loss'] = max_loss * 50
-            trade_setup['breakeven'] = [breakeven]
             trade_setup['net_debit'] = net_debit * 50
             trade_setup['probability_of_profit'] = 60
 
@@ -475,13 +483,12 @@ class OptionsStrategyRecommender:
             buy_strike = spot_rounded
             sell_strike = spot_rounded - 200
 
-            buy_premium = self.calculate_option_prices(spot, buy_strike, time_to_expiry, volatility, 'put')
-            sell_premium = self.calculate_option_prices(spot, sell_strike, time_to_expiry, volatility, 'put')
+            buy_premium, sell_premium = self.calculate_option_prices(
+                spot, [buy_strike, sell_strike], time_to_expiry, volatility, 'put')
 
             net_debit = buy_premium - sell_premium
             max_profit = (buy_strike - sell_strike) - net_debit
             max_loss = net_debit
-            breakeven = buy_strike - net_debit
 
             trade_setup['trades'] = [
                 {'action': 'BUY', 'type': 'PUT', 'strike': buy_strike, 'premium': buy_premium, 'lots': 1},
@@ -489,7 +496,6 @@ class OptionsStrategyRecommender:
             ]
             trade_setup['max_profit'] = max_profit * 50
             trade_setup['max_loss'] = max_loss * 50
-            trade_setup['breakeven'] = [breakeven]
             trade_setup['net_debit'] = net_debit * 50
             trade_setup['probability_of_profit'] = 55
 
@@ -500,10 +506,9 @@ class OptionsStrategyRecommender:
             put_sell_strike = spot_rounded - 150
             put_buy_strike = spot_rounded - 250
 
-            call_sell_premium = self.calculate_option_prices(spot, call_sell_strike, time_to_expiry, volatility, 'call')
-            call_buy_premium = self.calculate_option_prices(spot, call_buy_strike, time_to_expiry, volatility, 'call')
-            put_sell_premium = self.calculate_option_prices(spot, put_sell_strike, time_to_expiry, volatility, 'put')
-            put_buy_premium = self.calculate_option_prices(spot, put_buy_strike, time_to_expiry, volatility, 'put')
+            call_sell_premium, call_buy_premium, put_sell_premium, put_buy_premium = self.calculate_option_prices(
+                spot, [call_sell_strike, call_buy_strike, put_sell_strike, put_buy_strike],
+                time_to_expiry, volatility, ['call', 'call', 'put', 'put'])
 
             net_credit = (call_sell_premium - call_buy_premium) + (put_sell_premium - put_buy_premium)
             max_profit = net_credit
@@ -517,7 +522,6 @@ class OptionsStrategyRecommender:
             ]
             trade_setup['max_profit'] = max_profit * 50
             trade_setup['max_loss'] = max_loss * 50
-            trade_setup['breakeven'] = [put_sell_strike - net_credit, call_sell_strike + net_credit]
             trade_setup['net_credit'] = net_credit * 50
             trade_setup['probability_of_profit'] = 70
 
@@ -531,7 +535,6 @@ class OptionsStrategyRecommender:
             ]
             trade_setup['max_profit'] = 999999  # Unlimited
             trade_setup['max_loss'] = premium * 50
-            trade_setup['breakeven'] = [strike + premium]
             trade_setup['net_debit'] = premium * 50
             trade_setup['probability_of_profit'] = 45
 
@@ -545,15 +548,14 @@ class OptionsStrategyRecommender:
             ]
             trade_setup['max_profit'] = (strike - premium) * 50
             trade_setup['max_loss'] = premium * 50
-            trade_setup['breakeven'] = [strike - premium]
             trade_setup['net_debit'] = premium * 50
             trade_setup['probability_of_profit'] = 45
 
         elif strategy_key == 'long_straddle':
             # Buy ATM call and ATM put
             strike = spot_rounded
-            call_premium = self.calculate_option_prices(spot, strike, time_to_expiry, volatility, 'call')
-            put_premium = self.calculate_option_prices(spot, strike, time_to_expiry, volatility, 'put')
+            call_premium, put_premium = self.calculate_option_prices(
+                spot, strike, time_to_expiry, volatility, ['call', 'put'])
 
             total_premium = call_premium + put_premium
 
@@ -563,7 +565,6 @@ class OptionsStrategyRecommender:
             ]
             trade_setup['max_profit'] = 999999  # Unlimited
             trade_setup['max_loss'] = total_premium * 50
-            trade_setup['breakeven'] = [strike - total_premium, strike + total_premium]
             trade_setup['net_debit'] = total_premium * 50
             trade_setup['probability_of_profit'] = 40
 
@@ -578,39 +579,70 @@ class OptionsStrategyRecommender:
             trade_setup['max_loss'] = 2500
             trade_setup['probability_of_profit'] = 50
 
-        return trade_setup
+        # Exact breakevens from the piecewise-linear expiry payoff
+        trade_setup['breakeven'] = breakevens(legs_from_trades(trade_setup['trades'], LOT_SIZE)).tolist()
 
-    def create_payoff_diagram(self, trade_setup):
-        """Create payoff diagram for the strategy"""
-        spot = self.nifty_data['last_price']
+        self._attach_greeks(trade_setup, spot, time_to_expiry, volatility)
+        return trade_setup
 
-        # Create price range
-        price_range = np.linspace(spot * 0.90, spot * 1.10, 100)
+    def _attach_greeks(self, trade_setup, spot, time_to_expiry, volatility):
+        """Add each leg's implied volatility and position Greeks, and their net to the setup, in one vectorized pass"""
+        trades = trade_setup['trades']
+        strikes = [trade['strike'] for trade in trades]
+        leg_volatility = np.broadcast_to(self.volatility_for(strikes, time_to_expiry, volatility), len(trades))
+        greeks = net_greeks(
+            spot,
+            strikes,
+            time_to_expiry,
+            leg_volatility,
+            [trade['type'] for trade in trades],
+            [signed_quantity(trade['action'], trade['lots'] * LOT_SIZE) for trade in trades],
+        )
+        for trade, leg, iv in zip(trades, greeks['legs'], leg_volatility.tolist()):
+            trade['iv'] = iv
+            trade['greeks'] = {name: leg[name] for name in GREEKS}
+        trade_setup['greeks'] = {name: greeks[name] for name in GREEKS}
+
+    def create_vol_cone_chart(self):
+        """Vol cone: realized volatility quantiles per window, today's reading and VIX"""
+        cone = self.vol_cone
+        windows = cone.index.tolist()
+        fig = go.Figure()
 
-        payoffs = []
+        fig.add_trace(go.Scatter(x=windows, y=cone['q100'], name='Max', line=dict(color='#ef4444', dash='dot')))
+        fig.add_trace(go.Scatter(x=windows, y=cone['q75'], name='75th pct', line=dict(color='#f59e0b')))
+        fig.add_trace(go.Scatter(x=windows, y=cone['q50'], name='Median', line=dict(color='#3b82f6', width=3)))
+        fig.add_trace(go.Scatter(x=windows, y=cone['q25'], name='25th pct', line=dict(color='#f59e0b')))
+        fig.add_trace(go.Scatter(x=windows, y=cone['q0'], name='Min', line=dict(color='#10b981', dash='dot')))
+        fig.add_trace(go.Scatter(x=windows, y=cone['current'], name='Current', mode='lines+markers',
+                                 line=dict(color='black', width=2)))
+        fig.add_hline(y=self.vix_data['current'], line_dash="dash", line_color="purple",
+                      annotation_text=f"India VIX {self.vix_data['current']:.2f}")
 
-        for price in price_range:
-            total_payoff = 0
+        fig.update_layout(
+            title="Yang-Zhang Volatility Cone",
+            xaxis_title="Window (trading days)",
+            yaxis_title="Annualized Volatility (%)",
+            height=400,
+            hovermode='x unified'
+        )
+        return fig
 
-            for trade in trade_setup['trades']:
-                strike = trade['strike']
-                premium = trade['premium']
-                option_type = trade['type']
-                action = trade['action']
+    def create_payoff_diagram(self, trade_setup):
+        """Create payoff diagram for the strategy"""
+        spot = self.nifty_data['last_price']
 
-                if option_type == 'CALL':
-                    intrinsic = max(price - strike, 0)
-                else:  # PUT
-                    intrinsic = max(strike - price, 0)
+        trades = trade_setup['trades']
+        legs = legs_from_trades(trades, LOT_SIZE)
 
-                if action == 'BUY':
-                    payoff = (intrinsic - premium) * 50
-                else:  # SELL
-                    payoff = (premium - intrinsic) * 50
+        # Price range, with the strikes added so the payoff kinks are exact
+        price_range = price_grid(spot, legs.strikes)
 
-                total_payoff += payoff
+        payoffs = payoff_at_expiry(legs, price_range)
 
-            payoffs.append(total_payoff)
+        # Mark-to-model P&L today, each leg held at its volatility from the surface
+        pnl_today = pnl_before_expiry(legs, price_range, trade_setup['time_to_expiry'],
+                                      [trade['iv'] for trade in trades])
 
         # Create figure
         fig = go.Figure()
@@ -626,6 +658,14 @@ class OptionsStrategyRecommender:
             fillcolor='rgba(102, 126, 234, 0.1)'
         ))
 
+        fig.add_trace(go.Scatter(
+            x=price_range,
+            y=pnl_today,
+            mode='lines',
+            name='P&L Today',
+            line=dict(color='#f59e0b', width=2, dash='dash')
+        ))
+
         # Add zero line
         fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
 
@@ -639,7 +679,7 @@ class OptionsStrategyRecommender:
                 fig.add_vline(x=be, line_dash="dot", line_color="green", opacity=0.5)
 
         fig.update_layout(
-            title="Profit/Loss Diagram at Expiry",
+            title="Profit/Loss Diagram: at Expiry and Today",
             xaxis_title="NIFTY Price",
             yaxis_title="Profit/Loss (₹)",
             height=400,
@@ -1088,6 +1128,7 @@ def main():
             return
 
         recommender.fetch_historical_data()
+        recommender.fetch_option_chain()
 
         if recommender.vix_data is None:
             recommender.vix_data = {'current': 15.0}
@@ -1195,6 +1236,21 @@ def main():
 
     st.markdown("---")
 
+    # Realized volatility vs implied (VIX)
+    if recommender.vol_cone is not None:
+        st.markdown("## 📐 Realized Volatility (30-day)")
+
+        estimators = [
+            ('Yang-Zhang', 'yang_zhang'), ('Garman-Klass', 'garman_klass'),
+            ('Rogers-Satchell', 'rogers_satchell'), ('Parkinson', 'parkinson'),
+            ('Close-to-Close', 'close_to_close'), ('EWMA (λ=0.94)', 'ewma'),
+        ]
+        for col, (label, key) in zip(st.columns(len(estimators)), estimators):
+            col.metric(label, f"{recommender.realized_volatility[key]:.2f}%")
+
+        st.plotly_chart(recommender.create_vol_cone_chart(), width='stretch')
+        st.markdown("---")
+
     # Get recommendations
     recommendations = recommender.recommend_strategy(market_condition)
 
@@ -1231,6 +1287,11 @@ def main():
     """, unsafe_allow_html=True)
 
     st.markdown("### 💼 Specific Trade Setup")
+    if recommender.surface is not None:
+        st.caption(f"Premiums, Greeks and the P&L-today curve read the NSE volatility surface "
+                   f"({len(recommender.surface)} expiries), nearest expiry {recommender.surface.expiries[0][0]}")
+    else:
+        st.caption("Option chain unavailable: premiums and Greeks use India VIX as a flat volatility, 7-day expiry")
 
     col1, col2 = st.columns(2)
 
@@ -1244,7 +1305,8 @@ def main():
             **Trade {i}:**
             <span style='color: {action_color}; font-weight: bold;'>{trade['action']}</span>
             {trade['type']} @ Strike ₹{trade['strike']:,.0f}
-            <br>Premium: ₹{trade['premium']:.2f} × 50 = ₹{trade['premium']*50:,.2f}
+            <br>Premium: ₹{trade['premium']:.2f} × 50 = ₹{trade['premium']*50:,.2f} | IV {trade['iv']*100:.1f}%
+            <br>Δ {trade['greeks']['delta']:+.1f} | Θ ₹{trade['greeks']['theta']:+,.0f}/day | Vega ₹{trade['greeks']['vega']:+,.0f}
             """, unsafe_allow_html=True)
             st.markdown("---")
 
@@ -1275,6 +1337,21 @@ def main():
 
         st.markdown('</div>', unsafe_allow_html=True)
 
+    # Net position Greeks
+    st.markdown("#### 🧮 Position Greeks")
+    greeks = trade_setup['greeks']
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Delta", f"{greeks['delta']:+.1f}", help="₹ P&L per 1 point NIFTY move")
+    with col2:
+        st.metric("Gamma", f"{greeks['gamma']:+.3f}", help="Change in delta per 1 point NIFTY move")
+    with col3:
+        st.metric("Theta", f"₹{greeks['theta']:+,.0f}", help="₹ P&L per calendar day from time decay")
+    with col4:
+        st.metric("Vega", f"₹{greeks['vega']:+,.0f}", help="₹ P&L per 1 point rise in volatility")
+    with col5:
+        st.metric("Rho", f"₹{greeks['rho']:+,.0f}", help="₹ P&L per 1% rise in interest rates")
+
     # Profit/Loss Summary Cards
     col1, col2, col3 = st.columns(3)
 
@@ -0,0 +1,93 @@
+"""
+Vectorized Payoff Engine
+P&L of any multi-leg option position over a whole price grid in one
+broadcast (prices x legs) and a matrix product with the signed leg
+quantities, plus exact breakevens.
+
+At expiry the payoff is piecewise linear in the underlying with kinks only at
+the strikes, so it is fully described by its values at 0 and at each strike
+and by the slope beyond the highest strike; breakevens are the roots of those
+linear pieces, found without any grid.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from option_greeks import signed_quantity
+from option_pricing import RISK_FREE_RATE, black_scholes, is_call
+
+# strikes, premiums paid/received per unit, is-call mask, signed units of underlying
+Legs = namedtuple('Legs', ['strikes', 'premiums', 'calls', 'quantities'])
+
+
+def legs_from_trades(trades, lot_size):
+    """
+    Leg arrays from trade dicts with action, type, strike, premium and lots
+    Returns: Legs
+    """
+    return Legs(
+        np.array([trade['strike'] for trade in trades], dtype=np.float64),
+        np.array([trade['premium'] for trade in trades], dtype=np.float64),
+        is_call([trade['type'] for trade in trades]),
+        np.array([signed_quantity(trade['action'], trade['lots'] * lot_size) for trade in trades],
+                 dtype=np.float64),
+    )
+
+
+def price_grid(spot, strikes=(), width=0.10, points=100):
+    """
+    Evenly spaced underlying prices within +/- width of spot, with every
+    strike inside that range added so plotted kinks are exact
+    Returns: sorted array
+    """
+    grid = np.linspace(spot * (1 - width), spot * (1 + width), points)
+    strikes = np.asarray(strikes, dtype=np.float64)
+    return np.union1d(grid, strikes[(strikes > grid[0]) & (strikes < grid[-1])])
+
+
+def payoff_at_expiry(legs, prices):
+    """
+    Position P&L at expiry for every underlying price
+    Returns: array shaped like prices
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    sign = np.where(legs.calls, 1.0, -1.0)
+    intrinsic = np.maximum(sign * (prices[..., np.newaxis] - legs.strikes), 0.0)
+    return (intrinsic - legs.premiums) @ legs.quantities
+
+
+def pnl_before_expiry(legs, prices, time_to_expiry, volatility, rate=RISK_FREE_RATE):
+    """
+    Mark-to-model position P&L for every underlying price with time_to_expiry
+    (years) left; volatility is a scalar or one value per leg
+    Returns: array shaped like prices
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    values = black_scholes(prices[..., np.newaxis], legs.strikes, time_to_expiry, volatility, legs.calls, rate)
+    return (values - legs.premiums) @ legs.quantities
+
+
+def breakevens(legs):
+    """
+    Underlying prices at which the expiry payoff is exactly zero, solved on
+    each linear piece between 0, the strikes and beyond the highest strike
+    Returns: sorted array (empty when the position never breaks even)
+    """
+    if not len(legs.strikes):
+        return np.empty(0)
+
+    knots = np.unique(np.concatenate(([0.0], legs.strikes)))
+    values = payoff_at_expiry(legs, knots)
+
+    # Beyond the highest strike only calls move, one unit of P&L per point per unit held
+    tail_slope = legs.quantities[legs.calls].sum()
+
+    roots = [knots[values == 0]]
+    crossing = values[:-1] * values[1:] < 0
+    x0, x1, y0, y1 = knots[:-1][crossing], knots[1:][crossing], values[:-1][crossing], values[1:][crossing]
+    roots.append(x0 - y0 * (x1 - x0) / (y1 - y0))
+    if values[-1] * tail_slope < 0:
+        roots.append([knots[-1] - values[-1] / tail_slope])
+
+    return np.unique(np.concatenate(roots))
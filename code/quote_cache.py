@@ -0,0 +1,170 @@
+"""
+Process-wide Quote Cache
+TTL cache with stale-while-revalidate, shared by every Streamlit rerun and session
+"""
+
+import threading
+import time
+
+from bar_buffer import get_bar_buffer
+from market_data_client import get_client
+from ohlcv_store import get_store
+from option_chain import fetch_option_chain
+
+# Seconds an entry is considered fresh, per data kind
+DEFAULT_TTLS = {
+    'quote': 15,
+    'vix': 60,
+    'option_chain': 60,
+    'history': 6 * 60 * 60,
+    'intraday': 60,
+}
+
+# Seconds after which a stale entry is too old to serve while revalidating;
+# past this the caller waits for a synchronous reload instead
+DEFAULT_MAX_STALE = {
+    'quote': 5 * 60,
+    'vix': 15 * 60,
+    'option_chain': 15 * 60,
+    'history': 7 * 24 * 60 * 60,
+    'intraday': 5 * 60,
+}
+
+
+class QuoteCache:
+    def __init__(self, ttls=None, max_stale=None):
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_stale = dict(DEFAULT_MAX_STALE, **(max_stale or {}))
+        self._entries = {}
+        self._refreshing = set()
+        self._load_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind, key, loader):
+        """
+        Return the cached value for (kind, key), loading it with loader() when missing.
+        Stale entries are returned immediately while a background refresh runs.
+        Loader exceptions on a cold miss propagate to the caller.
+        """
+        cache_key = (kind, key)
+        entry = self._entries.get(cache_key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+
+            if age <= self.ttls[kind]:
+                return value
+            if age <= self.max_stale[kind]:
+                self._refresh_in_background(cache_key, loader)
+                return value
+
+        return self._load(cache_key, loader)
+
+    def _load(self, cache_key, loader):
+        """Load synchronously, letting concurrent callers for the same key share one request"""
+        with self._lock:
+            load_lock = self._load_locks.setdefault(cache_key, threading.Lock())
+
+        with load_lock:
+            # Another caller may have filled the entry while we waited
+            entry = self._entries.get(cache_key)
+            if entry is not None and time.monotonic() - entry[1] <= self.ttls[cache_key[0]]:
+                return entry[0]
+
+            value = loader()
+            if value is not None:
+                self._store(cache_key, value)
+            return value
+
+    def _refresh_in_background(self, cache_key, loader):
+        """Start one background refresh per key; failures keep the stale value"""
+        with self._lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        def refresh():
+            try:
+                value = loader()
+                if value is not None:
+                    self._store(cache_key, value)
+            except Exception as e:
+                print(f"Background refresh of {cache_key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cache_key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _store(self, cache_key, value):
+        with self._lock:
+            self._entries[cache_key] = (value, time.monotonic())
+
+    def invalidate(self, kind=None):
+        """Drop all entries, or only those of one data kind"""
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            else:
+                for cache_key in [k for k in self._entries if k[0] == kind]:
+                    del self._entries[cache_key]
+
+
+QUOTE_CACHE = QuoteCache()
+
+
+def _history_kind(interval):
+    """Cache kind for stored bars: intraday bars go stale within minutes, daily ones within hours"""
+    return 'history' if interval == '1d' else 'intraday'
+
+
+def cached_quote(symbol, range='1d', kind='quote'):
+    """
+    Latest quote for a symbol through the process-wide cache
+    Returns: a copy of the quote dict, or None
+    """
+    quote = QUOTE_CACHE.get(kind, (symbol, range), lambda: get_client().fetch_quote(symbol, range=range))
+    return dict(quote) if quote is not None else None
+
+
+def cached_history(symbol, bars=250, interval='1d'):
+    """
+    Last `bars` OHLCV bars for a symbol from the local store, through the process-wide cache
+    Returns: a copy of the DataFrame, or None
+    """
+    history = QUOTE_CACHE.get(_history_kind(interval), (symbol, bars, interval),
+                              lambda: get_store().history(symbol, bars=bars, interval=interval))
+    return history.copy() if history is not None else None
+
+
+def cached_bars(symbol, bars=250, interval='1d'):
+    """
+    Last `bars` bars for a symbol as zero-copy views into its shared ring buffer.
+    The store update runs at most once per history (or intraday) TTL; each one copies only
+    the bars that are new since the previous sync into the buffer.
+    Returns: BarWindow, or None
+    """
+    def load():
+        store = get_store()
+        try:
+            store.update(symbol, interval)
+        except Exception as e:
+            print(f"OHLCV store update for {symbol} failed: {e}")
+        columns = store.load_array(symbol, interval)
+        if columns is None:
+            return None
+        buffer = get_bar_buffer(symbol, interval)
+        buffer.sync(columns)
+        return buffer
+
+    buffer = QUOTE_CACHE.get(_history_kind(interval), ('bars', symbol, interval), load)
+    return buffer.window(bars) if buffer is not None else None
+
+
+def cached_option_chain(symbol='NIFTY'):
+    """
+    NSE option chain with implied volatility solved for every quote, through the process-wide cache
+    Returns: OptionChainSnapshot, or None
+    """
+    return QUOTE_CACHE.get('option_chain', (symbol,), lambda: fetch_option_chain(symbol))
@@ -0,0 +1,446 @@
+"""
+Streaming Indicators
+Incremental SMA, EMA, RSI, MACD, Bollinger Bands and ATR that update in
+constant time per bar or tick, for minute/tick feeds where recomputing the
+whole history window on every update does not scale.
+
+Each update either appends a new bar or, when it carries the same bar_time as
+the previous update, revises the still-forming last bar. State can be
+checkpointed with get_state() and restored with from_state().
+"""
+
+from collections import deque
+
+import numpy as np
+
+# Recompute running sums from the window this often to stop float drift
+RESYNC_INTERVAL = 1024
+
+
+class RollingWindow:
+    """Fixed-size window with running sum and sum of squares"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self._offset = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._updates = 0
+
+    def update(self, value, revise=False):
+        if self._offset is None:
+            self._offset = value
+        x = value - self._offset
+
+        if revise and self.values:
+            old = self.values[-1] - self._offset
+            self.values[-1] = value
+            self._sum += x - old
+            self._sum_sq += x * x - old * old
+            return
+
+        if len(self.values) == self.window:
+            old = self.values[0] - self._offset
+            self._sum -= old
+            self._sum_sq -= old * old
+        self.values.append(value)
+        self._sum += x
+        self._sum_sq += x * x
+
+        self._updates += 1
+        if self._updates % RESYNC_INTERVAL == 0:
+            shifted = np.fromiter(self.values, dtype=np.float64) - self._offset
+            self._sum = float(shifted.sum())
+            self._sum_sq = float((shifted * shifted).sum())
+
+    @property
+    def full(self):
+        return len(self.values) == self.window
+
+    def mean(self):
+        if not self.full:
+            return np.nan
+        return self._sum / self.window + self._offset
+
+    def std(self):
+        """Sample standard deviation (ddof=1)"""
+        if not self.full or self.window < 2:
+            return np.nan
+        variance = (self._sum_sq - self._sum * self._sum / self.window) / (self.window - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+    def get_state(self):
+        return {'window': self.window, 'values': list(self.values), 'updates': self._updates}
+
+    @classmethod
+    def from_state(cls, state):
+        rolling = cls(state['window'])
+        for value in state['values']:
+            rolling.update(value)
+        rolling._updates = state['updates']
+        return rolling
+
+
+class SMA:
+    """Simple moving average"""
+
+    def __init__(self, window):
+        self._window = RollingWindow(window)
+        self.value = np.nan
+
+    def update(self, value, revise=False):
+        self._window.update(value, revise)
+        self.value = self._window.mean()
+        return self.value
+
+    def get_state(self):
+        return {'window': self._window.get_state()}
+
+    @classmethod
+    def from_state(cls, state):
+        sma = cls(state['window']['window'])
+        sma._window = RollingWindow.from_state(state['window'])
+        sma.value = sma._window.mean()
+        return sma
+
+
+class EMA:
+    """Exponential moving average, as pandas ewm(span=span, adjust=False)"""
+
+    def __init__(self, span):
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = np.nan
+        self._previous = np.nan
+
+    def update(self, value, revise=False):
+        if not revise:
+            self._previous = self.value
+        base = self._previous
+
+        self.value = value if np.isnan(base) else self.alpha * value + (1.0 - self.alpha) * base
+        return self.value
+
+    def get_state(self):
+        return {'span': self.span, 'value': self.value, 'previous': self._previous}
+
+    @classmethod
+    def from_state(cls, state):
+        ema = cls(state['span'])
+        ema.value = state['value']
+        ema._previous = state['previous']
+        return ema
+
+
+class WilderAverage:
+    """Wilder smoothing: SMA of the first `period` values, then avg = (avg * (period - 1) + x) / period"""
+
+    def __init__(self, period):
+        self.period = period
+        self.value = np.nan
+        self._count = 0
+        self._sum = 0.0
+        self._previous = (np.nan, 0, 0.0)
+
+    def update(self, value, revise=False):
+        if revise and self._count:
+            self.value, self._count, self._sum = self._previous
+        else:
+            self._previous = (self.value, self._count, self._sum)
+
+        self._count += 1
+        if self._count <= self.period:
+            self._sum += value
+            self.value = self._sum / self.period if self._count == self.period else np.nan
+        else:
+            self.value = (self.value * (self.period - 1) + value) / self.period
+        return self.value
+
+    def get_state(self):
+        return {'period': self.period, 'value': self.value, 'count': self._count,
+                'sum': self._sum, 'previous': list(self._previous)}
+
+    @classmethod
+    def from_state(cls, state):
+        average = cls(state['period'])
+        average.value = state['value']
+        average._count = state['count']
+        average._sum = state['sum']
+        average._previous = tuple(state['previous'])
+        return average
+
+
+def _average(period, wilder):
+    return WilderAverage(period) if wilder else SMA(period)
+
+
+def _average_from_state(state):
+    return WilderAverage.from_state(state) if 'period' in state else SMA.from_state(state)
+
+
+class RSI:
+    """
+    Relative Strength Index; simple averages of gains/losses by default
+    (as the dashboards use), Wilder smoothing with wilder=True
+    """
+
+    def __init__(self, period=14, wilder=False):
+        self.period = period
+        self.wilder = wilder
+        self._gains = _average(period, wilder)
+        self._losses = _average(period, wilder)
+        self._last_close = np.nan
+        self._prev_close = np.nan
+        self.value = np.nan
+
+    def update(self, close, revise=False):
+        if not revise:
+            self._prev_close = self._last_close
+        self._last_close = close
+
+        # Wilder's averages start with the first real delta (second bar)
+        if self.wilder and np.isnan(self._prev_close):
+            return self.value
+
+        delta = 0.0 if np.isnan(self._prev_close) else close - self._prev_close
+        avg_gain = self._gains.update(max(delta, 0.0), revise)
+        avg_loss = self._losses.update(max(-delta, 0.0), revise)
+
+        if np.isnan(avg_gain) or np.isnan(avg_loss) or (avg_gain == 0 and avg_loss == 0):
+            self.value = np.nan
+        elif avg_loss == 0:
+            self.value = 100.0
+        else:
+            self.value = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        return self.value
+
+    def get_state(self):
+        return {'period': self.period, 'wilder': self.wilder,
+                'gains': self._gains.get_state(), 'losses': self._losses.get_state(),
+                'last_close': self._last_close, 'prev_close': self._prev_close, 'value': self.value}
+
+    @classmethod
+    def from_state(cls, state):
+        rsi = cls(state['period'], state['wilder'])
+        rsi._gains = _average_from_state(state['gains'])
+        rsi._losses = _average_from_state(state['losses'])
+        rsi._last_close = state['last_close']
+        rsi._prev_close = state['prev_close']
+        rsi.value = state['value']
+        return rsi
+
+
+class MACD:
+    """MACD line, signal line and histogram from three chained EMAs"""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.value = np.nan
+
+    def update(self, close, revise=False):
+        self.value = self.fast.update(close, revise) - self.slow.update(close, revise)
+        self.signal.update(self.value, revise)
+        return self.value
+
+    @property
+    def histogram(self):
+        return self.value - self.signal.value
+
+    def get_state(self):
+        return {'fast': self.fast.get_state(), 'slow': self.slow.get_state(),
+                'signal': self.signal.get_state(), 'value': self.value}
+
+    @classmethod
+    def from_state(cls, state):
+        macd = cls()
+        macd.fast = EMA.from_state(state['fast'])
+        macd.slow = EMA.from_state(state['slow'])
+        macd.signal = EMA.from_state(state['signal'])
+        macd.value = state['value']
+        return macd
+
+
+class BollingerBands:
+    """Middle band (SMA) +/- num_std sample standard deviations"""
+
+    def __init__(self, window=20, num_std=2.0):
+        self.num_std = num_std
+        self._window = RollingWindow(window)
+
+    def update(self, close, revise=False):
+        self._window.update(close, revise)
+        return self.bands
+
+    @property
+    def bands(self):
+        """Returns: (upper, middle, lower)"""
+        middle = self._window.mean()
+        width = self.num_std * self._window.std()
+        return middle + width, middle, middle - width
+
+    def get_state(self):
+        return {'num_std': self.num_std, 'window': self._window.get_state()}
+
+    @classmethod
+    def from_state(cls, state):
+        bands = cls(state['window']['window'], state['num_std'])
+        bands._window = RollingWindow.from_state(state['window'])
+        return bands
+
+
+class ATR:
+    """
+    Average True Range; simple average by default (as the dashboards use),
+    Wilder smoothing with wilder=True
+    """
+
+    def __init__(self, period=14, wilder=False):
+        self.period = period
+        self.wilder = wilder
+        self._average = _average(period, wilder)
+        self._last_close = np.nan
+        self._prev_close = np.nan
+        self.value = np.nan
+
+    def update(self, high, low, close, revise=False):
+        if not revise:
+            self._prev_close = self._last_close
+        self._last_close = close
+
+        tr = high - low
+        if not np.isnan(self._prev_close):
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+
+        self.value = self._average.update(tr, revise)
+        return self.value
+
+    def get_state(self):
+        return {'period': self.period, 'wilder': self.wilder, 'average': self._average.get_state(),
+                'last_close': self._last_close, 'prev_close': self._prev_close, 'value': self.value}
+
+    @classmethod
+    def from_state(cls, state):
+        atr = cls(state['period'], state['wilder'])
+        atr._average = _average_from_state(state['average'])
+        atr._last_close = state['last_close']
+        atr._prev_close = state['prev_close']
+        atr.value = state['value']
+        return atr
+
+
+class IndicatorStream:
+    """
+    The full dashboard indicator set, updated one bar or tick at a time.
+    Values use the same names as indicator_engine.IndicatorSet.latest().
+    """
+
+    def __init__(self):
+        self.sma_20 = SMA(20)
+        self.sma_50 = SMA(50)
+        self.ema_12 = EMA(12)
+        self.ema_26 = EMA(26)
+        self.rsi = RSI(14)
+        self.macd = MACD(12, 26, 9)
+        self.bollinger = BollingerBands(20, 2.0)
+        self.atr = ATR(14)
+        self.volume_sma_20 = SMA(20)
+        self.bar_time = None
+        self.bars = 0
+
+    def update(self, close, high=None, low=None, volume=None, bar_time=None):
+        """
+        Feed one bar, or one tick of the forming bar
+        bar_time: identifies the bar; an update with the same bar_time as the
+        previous one revises that bar instead of appending a new one
+        Returns: dict of indicator name -> latest value
+        """
+        revise = bar_time is not None and bar_time == self.bar_time
+        if not revise:
+            self.bars += 1
+        self.bar_time = bar_time
+
+        high = close if high is None else high
+        low = close if low is None else low
+
+        self.sma_20.update(close, revise)
+        self.sma_50.update(close, revise)
+        self.ema_12.update(close, revise)
+        self.ema_26.update(close, revise)
+        self.rsi.update(close, revise)
+        self.macd.update(close, revise)
+        self.bollinger.update(close, revise)
+        self.atr.update(high, low, close, revise)
+        if volume is not None:
+            self.volume_sma_20.update(volume, revise)
+
+        return self.latest()
+
+    def latest(self):
+        """
+        Returns: dict of indicator name -> latest value
+        """
+        bb_upper, bb_middle, bb_lower = self.bollinger.bands
+        return {
+            'SMA_20': self.sma_20.value,
+            'SMA_50': self.sma_50.value,
+            'EMA_12': self.ema_12.value,
+            'EMA_26': self.ema_26.value,
+            'RSI': self.rsi.value,
+            'MACD': self.macd.value,
+            'MACD_Signal': self.macd.signal.value,
+            'MACD_Histogram': self.macd.histogram,
+            'BB_Upper': bb_upper,
+            'BB_Middle': bb_middle,
+            'BB_Lower': bb_lower,
+            'ATR': self.atr.value,
+            'Volume_SMA_20': self.volume_sma_20.value,
+        }
+
+    @classmethod
+    def from_frame(cls, df):
+        """Seed a stream from an OHLCV DataFrame (one pass over the history)"""
+        stream = cls()
+        has_volume = 'volume' in df
+        for row in df.itertuples(index=False):
+            stream.update(row.close, row.high, row.low, row.volume if has_volume else None,
+                          bar_time=getattr(row, 'timestamp', None))
+        return stream
+
+    def get_state(self):
+        """
+        Checkpoint of every indicator's running state (JSON-serialisable
+        when bar_time is)
+        """
+        return {
+            'sma_20': self.sma_20.get_state(),
+            'sma_50': self.sma_50.get_state(),
+            'ema_12': self.ema_12.get_state(),
+            'ema_26': self.ema_26.get_state(),
+            'rsi': self.rsi.get_state(),
+            'macd': self.macd.get_state(),
+            'bollinger': self.bollinger.get_state(),
+            'atr': self.atr.get_state(),
+            'volume_sma_20': self.volume_sma_20.get_state(),
+            'bar_time': self.bar_time,
+            'bars': self.bars,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Restore a stream from get_state()"""
+        stream = cls()
+        stream.sma_20 = SMA.from_state(state['sma_20'])
+        stream.sma_50 = SMA.from_state(state['sma_50'])
+        stream.ema_12 = EMA.from_state(state['ema_12'])
+        stream.ema_26 = EMA.from_state(state['ema_26'])
+        stream.rsi = RSI.from_state(state['rsi'])
+        stream.macd = MACD.from_state(state['macd'])
+        stream.bollinger = BollingerBands.from_state(state['bollinger'])
+        stream.atr = ATR.from_state(state['atr'])
+        stream.volume_sma_20 = SMA.from_state(state['volume_sma_20'])
+        stream.bar_time = state['bar_time']
+        stream.bars = state['bars']
+        return stream
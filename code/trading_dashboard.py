@@ -7,12 +7,20 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
-import pandas as pd
 import numpy as np
-import requests
 import time
 from plotly.subplots import make_subplots
 
+from bar_aggregator import resample
+from indicator_cache import INDICATOR_CACHE, cached_indicators
+from indicator_engine import MIN_BARS
+from quote_cache import cached_bars, cached_quote
+from universe_scanner import SIGNAL_ACTIONS, classify_actions, risk_scores, scan_universe, score_signals
+
+CHART_TIMEFRAMES = ['1m', '5m', '15m', '30m', '1d']
+
+# Yahoo's 1-minute lookback: seven 375-minute sessions
+INTRADAY_BASE_BARS = 7 * 375
 
 # Page configuration
 st.set_page_config(
@@ -111,6 +119,8 @@ class TradingDashboard:
     def __init__(self):
         self.nifty_data = None
         self.historical_data = None
+        self.timeframe = '1d'
+        self.indicators = None
         self.vix_data = None
         self.technical_indicators = {}
         self.risk_metrics = {}
@@ -119,60 +129,32 @@ class TradingDashboard:
     def fetch_nifty_data(self):
         """Fetch real-time NIFTY 50 data"""
         try:
-            url = "https://query1.finance.yahoo.com/v8/finance/chart/%5ENSEI"
-            params = {'interval': '1d', 'range': '1d'}
-            headers = {'User-Agent': 'Mozilla/5.0'}
-
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                result = data['chart']['result'][0]
-                meta = result['meta']
-                quotes = result['indicators']['quote'][0]
-
-                latest_idx = -1
-                current_price = meta.get('regularMarketPrice', quotes['close'][latest_idx])
-                prev_close = meta.get('chartPreviousClose', quotes['close'][-2] if len(quotes['close']) > 1 else current_price)
-
-                self.nifty_data = {
-                    'last_price': float(current_price),
-                    'open': float(quotes['open'][latest_idx]) if quotes['open'][latest_idx] else current_price,
-                    'high': float(quotes['high'][latest_idx]) if quotes['high'][latest_idx] else current_price,
-                    'low': float(quotes['low'][latest_idx]) if quotes['low'][latest_idx] else current_price,
-                    'volume': int(quotes['volume'][latest_idx]) if quotes['volume'][latest_idx] else 0,
-                    'previous_close': float(prev_close),
-                    'change': float(current_price - prev_close),
-                    'pct_change': float((current_price - prev_close) / prev_close * 100),
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
+            quote = cached_quote('^NSEI')
+
+            if quote is not None:
+                self.nifty_data = quote
                 return True
         except Exception as e:
             st.error(f"Error fetching data: {e}")
             return False
 
-    def fetch_historical_data(self):
-        """Fetch historical data"""
+    def fetch_historical_data(self, timeframe='1d'):
+        """
+        Fetch bars for the chosen timeframe. Daily bars are views into the shared
+        NIFTY bar buffer; intraday timeframes are resampled from the cached
+        1-minute buffer, so switching between them needs no extra fetch.
+        """
         try:
-            url = "https://query1.finance.yahoo.com/v8/finance/chart/%5ENSEI"
-            params = {'interval': '1d', 'range': '60d'}
-            headers = {'User-Agent': 'Mozilla/5.0'}
-
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                result = data['chart']['result'][0]
-                quotes = result['indicators']['quote'][0]
-
-                self.historical_data = pd.DataFrame({
-                    'timestamp': pd.to_datetime(result['timestamp'], unit='s'),
-                    'open': quotes['open'],
-                    'high': quotes['high'],
-                    'low': quotes['low'],
-                    'close': quotes['close'],
-                    'volume': quotes['volume']
-                }).dropna()
+            self.timeframe = timeframe
+            if timeframe == '1d':
+                bars = cached_bars('^NSEI', bars=250)
+            else:
+                bars = cached_bars('^NSEI', bars=INTRADAY_BASE_BARS, interval='1m')
+                if bars is not None and timeframe != '1m':
+                    bars = resample(bars, timeframe)
+
+            if bars is not None:
+                self.historical_data = bars.tail(250)
                 return True
         except:
             return False
@@ -180,20 +162,10 @@ class TradingDashboard:
     def fetch_vix(self):
         """Fetch India VIX"""
         try:
-            url = "https://query1.finance.yahoo.com/v8/finance/chart/%5EINVIX"
-            params = {'interval': '1d', 'range': '5d'}
-            headers = {'User-Agent': 'Mozilla/5.0'}
-
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            quote = cached_quote('^INVIX', range='5d', kind='vix')
 
-            if response.status_code == 200:
-                data = response.json()
-                result = data['chart']['result'][0]
-                meta = result['meta']
-                quotes = result['indicators']['quote'][0]
-
-                vix_current = meta.get('regularMarketPrice', quotes['close'][-1])
-                self.vix_data = {'current': float(vix_current)}
+            if quote is not None:
+                self.vix_data = {'current': quote['last_price']}
                 return True
         except:
             self.vix_data = {'current': 15.0}
@@ -201,8 +173,9 @@ class TradingDashboard:
 
     def calculate_indicators(self):
         """Calculate technical indicators"""
-        if self.historical_data is None or len(self.historical_data) < 50:
+        if self.historical_data is None or len(self.historical_data) < MIN_BARS:
             # Set default indicators if we can't calculate them
+            self.indicators = None
             if self.nifty_data:
                 current_price = self.nifty_data['last_price']
                 self.technical_indicators = {
@@ -219,134 +192,48 @@ class TradingDashboard:
                 }
             return False
 
-        df = self.historical_data.copy()
-
-        # Moving Averages
-        df['SMA_20'] = df['close'].rolling(window=20).mean()
-        df['SMA_50'] = df['close'].rolling(window=50).mean()
-        df['EMA_12'] = df['close'].ewm(span=12, adjust=False).mean()
-        df['EMA_26'] = df['close'].ewm(span=26, adjust=False).mean()
-
-        # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-
-        # MACD
-        df['MACD'] = df['EMA_12'] - df['EMA_26']
-        df['MACD_Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-        df['MACD_Histogram'] = df['MACD'] - df['MACD_Signal']
-
-        # Bollinger Bands
-        df['BB_Middle'] = df['close'].rolling(window=20).mean()
-        bb_std = df['close'].rolling(window=20).std()
-        df['BB_Upper'] = df['BB_Middle'] + (bb_std * 2)
-        df['BB_Lower'] = df['BB_Middle'] - (bb_std * 2)
+        # Shared across reruns and sessions until the bars change
+        self.indicators = cached_indicators('^NSEI', self.timeframe, self.historical_data)
+        latest = self.indicators.latest()
 
         # Store indicators
         current_price = self.nifty_data['last_price']
         self.technical_indicators = {
-            'SMA_20': df['SMA_20'].iloc[-1],
-            'SMA_50': df['SMA_50'].iloc[-1],
-            'RSI': df['RSI'].iloc[-1],
-            'MACD': df['MACD'].iloc[-1],
-            'MACD_Signal': df['MACD_Signal'].iloc[-1],
-            'BB_Upper': df['BB_Upper'].iloc[-1],
-            'BB_Middle': df['BB_Middle'].iloc[-1],
-            'BB_Lower': df['BB_Lower'].iloc[-1],
-            'price_vs_sma20': ((current_price - df['SMA_20'].iloc[-1]) / df['SMA_20'].iloc[-1]) * 100,
-            'price_vs_sma50': ((current_price - df['SMA_50'].iloc[-1]) / df['SMA_50'].iloc[-1]) * 100,
+            'SMA_20': latest['SMA_20'],
+            'SMA_50': latest['SMA_50'],
+            'RSI': latest['RSI'],
+            'MACD': latest['MACD'],
+            'MACD_Signal': latest['MACD_Signal'],
+            'BB_Upper': latest['BB_Upper'],
+            'BB_Middle': latest['BB_Middle'],
+            'BB_Lower': latest['BB_Lower'],
+            'price_vs_sma20': ((current_price - latest['SMA_20']) / latest['SMA_20']) * 100,
+            'price_vs_sma50': ((current_price - latest['SMA_50']) / latest['SMA_50']) * 100,
         }
 
-        self.historical_data = df
         return True
 
     def analyze_and_generate_signal(self):
         """Generate trading signal"""
-        signal_score = 0
-
         # Ensure vix_data exists
         if self.vix_data is None:
             self.vix_data = {'current': 15.0}
 
-        # Trend analysis
-        price_vs_sma20 = self.technical_indicators.get('price_vs_sma20', 0)
-        price_vs_sma50 = self.technical_indicators.get('price_vs_sma50', 0)
-
-        if price_vs_sma20 > 2 and price_vs_sma50 > 2:
-            signal_score += 3
-        elif price_vs_sma20 > 0 and price_vs_sma50 > 0:
-            signal_score += 2
-        elif price_vs_sma20 < -2 and price_vs_sma50 < -2:
-            signal_score -= 3
-        elif price_vs_sma20 < 0 and price_vs_sma50 < 0:
-            signal_score -= 2
-
-        # RSI
-        rsi = self.technical_indicators.get('RSI', 50)
-        if 40 < rsi < 60:
-            signal_score += 1
-        elif 30 < rsi < 40:
-            signal_score += 2
-        elif rsi > 70:
-            signal_score -= 3
-        elif rsi < 30:
-            signal_score += 3
-
-        # MACD
-        if self.technical_indicators.get('MACD', 0) > self.technical_indicators.get('MACD_Signal', 0):
-            signal_score += 2
-        else:
-            signal_score -= 2
-
-        # VIX
+        # Trend, RSI, MACD and VIX scoring shared with the universe scanner
         vix = self.vix_data.get('current', 15.0)
-        if vix < 15:
-            signal_score += 1
-        elif vix > 20:
-            signal_score -= 2
-
-        # Calculate risk score
-        risk_score = 50
-        if vix > 25:
-            risk_score = 80
-        elif vix > 20:
-            risk_score = 65
-        elif vix > 15:
-            risk_score = 45
-        else:
-            risk_score = 30
+        signal_score = int(score_signals(
+            self.technical_indicators.get('price_vs_sma20', 0),
+            self.technical_indicators.get('price_vs_sma50', 0),
+            self.technical_indicators.get('RSI', 50),
+            self.technical_indicators.get('MACD', 0),
+            self.technical_indicators.get('MACD_Signal', 0),
+            vix
+        ))
+        risk_score = int(risk_scores(vix))
 
         # Generate recommendation
         current_price = self.nifty_data['last_price']
-
-        if signal_score >= 5 and risk_score < 60:
-            action = "STRONG BUY"
-            action_type = "buy"
-            confidence = "High"
-            position_size = "75-100%"
-        elif signal_score >= 3 and risk_score < 70:
-            action = "BUY"
-            action_type = "buy"
-            confidence = "Moderate"
-            position_size = "50-75%"
-        elif signal_score <= -5 and risk_score < 60:
-            action = "STRONG SELL"
-            action_type = "sell"
-            confidence = "High"
-            position_size = "75-100%"
-        elif signal_score <= -3 and risk_score < 70:
-            action = "SELL"
-            action_type = "sell"
-            confidence = "Moderate"
-            position_size = "50-75%"
-        else:
-            action = "HOLD / WAIT"
-            action_type = "hold"
-            confidence = "Neutral"
-            position_size = "0-25%"
+        action, action_type, confidence, position_size = SIGNAL_ACTIONS[int(classify_actions(signal_score, risk_score))]
 
         # Calculate levels
         pivot = (self.nifty_data['high'] + self.nifty_data['low'] + current_price) / 3
@@ -401,8 +288,9 @@ def create_gauge_chart(value, title, max_value=100, color_range=None):
     return fig
 
 
-def create_candlestick_chart(df):
-    """Create candlestick chart with indicators"""
+def create_candlestick_chart(bars, indicators):
+    """Create candlestick chart from a BarWindow and the matching IndicatorSet"""
+    timestamps = bars.datetimes
     fig = make_subplots(
         rows=3, cols=1,
         shared_xaxes=True,
@@ -414,11 +302,11 @@ def create_candlestick_chart(df):
     # Candlestick
     fig.add_trace(
         go.Candlestick(
-            x=df['timestamp'],
-            open=df['open'],
-            high=df['high'],
-            low=df['low'],
-            close=df['close'],
+            x=timestamps,
+            open=bars.open,
+            high=bars.high,
+            low=bars.low,
+            close=bars.close,
             name='NIFTY 50'
         ),
         row=1, col=1
@@ -426,27 +314,27 @@ def create_candlestick_chart(df):
 
     # SMAs
     fig.add_trace(
-        go.Scatter(x=df['timestamp'], y=df['SMA_20'], name='SMA 20', line=dict(color='orange', width=1)),
+        go.Scatter(x=timestamps, y=indicators.SMA_20, name='SMA 20', line=dict(color='orange', width=1)),
         row=1, col=1
     )
     fig.add_trace(
-        go.Scatter(x=df['timestamp'], y=df['SMA_50'], name='SMA 50', line=dict(color='blue', width=1)),
+        go.Scatter(x=timestamps, y=indicators.SMA_50, name='SMA 50', line=dict(color='blue', width=1)),
         row=1, col=1
     )
 
     # Bollinger Bands
     fig.add_trace(
-        go.Scatter(x=df['timestamp'], y=df['BB_Upper'], name='BB Upper', line=dict(color='gray', width=1, dash='dash')),
+        go.Scatter(x=timestamps, y=indicators.BB_Upper, name='BB Upper', line=dict(color='gray', width=1, dash='dash')),
         row=1, col=1
     )
     fig.add_trace(
-        go.Scatter(x=df['timestamp'], y=df['BB_Lower'], name='BB Lower', line=dict(color='gray', width=1, dash='dash')),
+        go.Scatter(x=timestamps, y=indicators.BB_Lower, name='BB Lower', line=dict(color='gray', width=1, dash='dash')),
         row=1, col=1
     )
 
     # RSI
     fig.add_trace(
-        go.Scatter(x=df['timestamp'], y=df['RSI'], name='RSI', line=dict(color='purple', width=2)),
+        go.Scatter(x=timestamps, y=indicators.RSI, name='RSI', line=dict(color='purple', width=2)),
         row=2, col=1
     )
     fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
@@ -454,11 +342,11 @@ def create_candlestick_chart(df):
 
     # MACD
     fig.add_trace(
-        go.Scatter(x=df['timestamp'], y=df['MACD'], name='MACD', line=dict(color='blue', width=2)),
+        go.Scatter(x=timestamps, y=indicators.MACD, name='MACD', line=dict(color='blue', width=2)),
         row=3, col=1
     )
     fig.add_trace(
-        go.Scatter(x=df['timestamp'], y=df['MACD_Signal'], name='Signal', line=dict(color='orange', width=2)),
+        go.Scatter(x=timestamps, y=indicators.MACD_Signal, name='Signal', line=dict(color='orange', width=2)),
         row=3, col=1
     )
 
@@ -491,6 +379,9 @@ def main():
         if st.button("🔄 Refresh Data", key="refresh"):
             st.rerun()
 
+        timeframe = st.selectbox("🕒 Chart Timeframe", CHART_TIMEFRAMES,
+                                 index=CHART_TIMEFRAMES.index('1d'), key="timeframe")
+
         st.markdown("---")
 
         st.markdown("## ℹ️ How to Read")
@@ -525,7 +416,7 @@ def main():
             return
 
         # Fetch additional data (non-critical)
-        dashboard.fetch_historical_data()
+        dashboard.fetch_historical_data(timeframe)
         dashboard.fetch_vix()
 
         # Ensure vix_data is initialized
@@ -682,10 +573,13 @@ def main():
         # Technical Indicators
         st.markdown("## 📊 Technical Analysis (For Advanced Users)")
 
-        if dashboard.historical_data is not None:
+        if dashboard.historical_data is not None and dashboard.indicators is not None:
             # Charts
-            fig = create_candlestick_chart(dashboard.historical_data.tail(60))
+            fig = create_candlestick_chart(dashboard.historical_data.tail(60), dashboard.indicators.tail(60))
             st.plotly_chart(fig, width='stretch')
+            cache_stats = INDICATOR_CACHE.stats()
+            st.caption(f"Indicator cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                       f"({cache_stats['hit_rate']:.0%} hit rate)")
 
             # Indicator values
             st.markdown("### 📈 Key Indicators Explained")
@@ -720,6 +614,15 @@ def main():
                 *Price position relative to average*
                 """)
 
+            with st.expander("🔭 Scan NIFTY 50 & Sectoral Indices"):
+                if st.button("Run Universe Scan"):
+                    with st.spinner("Scoring the whole universe..."):
+                        scan = scan_universe(vix=dashboard.vix_data.get('current', 15.0))
+                    if scan is not None:
+                        st.dataframe(scan, width='stretch', hide_index=True)
+                    else:
+                        st.error("Not enough stored history to scan the universe")
+
         # Risk Management
         st.markdown("---")
         st.markdown("## ⚠️ Risk Management Tips")
@@ -0,0 +1,192 @@
+"""
+Universe Scanner
+Runs the dashboard's signal scoring across the NIFTY 50 constituents and the
+sectoral indices at once: indicators come from one matrix call to the
+indicator engine, and scoring is vectorized over every symbol.
+
+Usage:
+    python universe_scanner.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from indicator_engine import MIN_BARS, indicators_from_matrix
+from ohlcv_store import get_store
+
+# NIFTY 50 constituents (Yahoo Finance tickers); the index is rebalanced
+# twice a year, so keep this list in step with NSE's published constituents.
+# Tickers missing from Yahoo are simply dropped from a scan.
+NIFTY_50_SYMBOLS = [
+    'ADANIENT.NS', 'ADANIPORTS.NS', 'APOLLOHOSP.NS', 'ASIANPAINT.NS', 'AXISBANK.NS',
+    'BAJAJ-AUTO.NS', 'BAJAJFINSV.NS', 'BAJFINANCE.NS', 'BEL.NS', 'BHARTIARTL.NS',
+    'CIPLA.NS', 'COALINDIA.NS', 'DRREDDY.NS', 'EICHERMOT.NS', 'ETERNAL.NS',
+    'GRASIM.NS', 'HCLTECH.NS', 'HDFCBANK.NS', 'HDFCLIFE.NS', 'HINDALCO.NS',
+    'HINDUNILVR.NS', 'ICICIBANK.NS', 'INDIGO.NS', 'INFY.NS', 'ITC.NS',
+    'JIOFIN.NS', 'JSWSTEEL.NS', 'KOTAKBANK.NS', 'LT.NS', 'M&M.NS',
+    'MARUTI.NS', 'MAXHEALTH.NS', 'NESTLEIND.NS', 'NTPC.NS', 'ONGC.NS',
+    'POWERGRID.NS', 'RELIANCE.NS', 'SBILIFE.NS', 'SBIN.NS', 'SHRIRAMFIN.NS',
+    'SUNPHARMA.NS', 'TATACONSUM.NS', 'TATASTEEL.NS', 'TCS.NS', 'TECHM.NS',
+    'TITAN.NS', 'TMPV.NS', 'TRENT.NS', 'ULTRACEMCO.NS', 'WIPRO.NS',
+]
+
+SECTOR_INDICES = [
+    '^NSEI', '^NSEBANK', '^CNXIT', '^CNXAUTO', '^CNXFMCG', '^CNXPHARMA',
+    '^CNXMETAL', '^CNXREALTY', '^CNXENERGY', '^CNXPSUBANK', '^CNXMEDIA',
+    '^CNXINFRA', 'NIFTY_FIN_SERVICE.NS',
+]
+
+DEFAULT_UNIVERSE = NIFTY_50_SYMBOLS + SECTOR_INDICES
+
+# (action, action_type, confidence, position_size), indexed by classify_actions()
+SIGNAL_ACTIONS = [
+    ("STRONG BUY", "buy", "High", "75-100%"),
+    ("BUY", "buy", "Moderate", "50-75%"),
+    ("STRONG SELL", "sell", "High", "75-100%"),
+    ("SELL", "sell", "Moderate", "50-75%"),
+    ("HOLD / WAIT", "hold", "Neutral", "0-25%"),
+]
+
+
+def score_signals(price_vs_sma20, price_vs_sma50, rsi, macd, macd_signal, vix):
+    """
+    Trend + RSI + MACD + VIX signal score, for one symbol or an array of them
+    Returns: int array of scores (0-d for scalar inputs)
+    """
+    price_vs_sma20, price_vs_sma50, rsi, macd, macd_signal, vix = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (price_vs_sma20, price_vs_sma50, rsi, macd, macd_signal, vix))
+    )
+
+    trend = np.select(
+        [(price_vs_sma20 > 2) & (price_vs_sma50 > 2),
+         (price_vs_sma20 > 0) & (price_vs_sma50 > 0),
+         (price_vs_sma20 < -2) & (price_vs_sma50 < -2),
+         (price_vs_sma20 < 0) & (price_vs_sma50 < 0)],
+        [3, 2, -3, -2], default=0
+    )
+    momentum = np.select(
+        [(rsi > 40) & (rsi < 60), (rsi > 30) & (rsi < 40), rsi > 70, rsi < 30],
+        [1, 2, -3, 3], default=0
+    )
+    macd_score = np.where(macd > macd_signal, 2, -2)
+    vix_score = np.select([vix < 15, vix > 20], [1, -2], default=0)
+
+    return trend + momentum + macd_score + vix_score
+
+
+def risk_scores(vix):
+    """
+    Risk score from India VIX
+    Returns: int array (0-d for a scalar VIX)
+    """
+    vix = np.asarray(vix, dtype=np.float64)
+    return np.select([vix > 25, vix > 20, vix > 15], [80, 65, 45], default=30)
+
+
+def classify_actions(signal_score, risk_score):
+    """
+    Map signal and risk scores to rows of SIGNAL_ACTIONS
+    Returns: int array of SIGNAL_ACTIONS indices
+    """
+    signal_score, risk_score = np.broadcast_arrays(np.asarray(signal_score), np.asarray(risk_score))
+    return np.select(
+        [(signal_score >= 5) & (risk_score < 60),
+         (signal_score >= 3) & (risk_score < 70),
+         (signal_score <= -5) & (risk_score < 60),
+         (signal_score <= -3) & (risk_score < 70)],
+        [0, 1, 2, 3], default=4
+    )
+
+
+def _fill_gaps(values):
+    """Carry each column's last bar over its holes and its first bar back over missing early rows"""
+    rows = np.arange(len(values))[:, np.newaxis]
+    values = values[np.maximum.accumulate(np.where(np.isnan(values), 0, rows), axis=0), np.arange(values.shape[1])]
+    first = np.argmax(~np.isnan(values), axis=0)
+    return np.where(np.isnan(values), values[first, np.arange(values.shape[1])], values)
+
+
+def scannable_matrix(matrix, min_bars=MIN_BARS):
+    """
+    Keep the symbols that have a bar on the matrix's last day and at least
+    min_bars bars in total, with their holes filled
+    Returns: (matrix of the kept symbols, list of skipped symbols)
+    """
+    close = matrix['close']
+    keep = ~np.isnan(close[-1]) & (np.count_nonzero(~np.isnan(close), axis=0) >= min_bars)
+
+    symbols = np.array(matrix['symbols'], dtype=object)
+    scannable = {'symbols': symbols[keep].tolist(), 'timestamp': matrix['timestamp']}
+    for name in ('open', 'high', 'low', 'close', 'volume'):
+        scannable[name] = np.ascontiguousarray(_fill_gaps(matrix[name][:, keep]))
+    return scannable, symbols[~keep].tolist()
+
+
+def scan_universe(symbols=None, bars=250, vix=15.0, store=None):
+    """
+    Score every symbol of the universe in one pass, as of the latest day any symbol has
+    Symbols without a bar on that day or with fewer than MIN_BARS bars are skipped;
+    the scan's attrs record the as-of date ('as_of') and the skipped symbols ('skipped')
+    Returns: DataFrame sorted by signal score, or None when no history is available
+    """
+    store = store or get_store()
+    matrix = store.history_matrix(symbols or DEFAULT_UNIVERSE, bars=bars)
+
+    if matrix is None or len(matrix['timestamp']) < MIN_BARS:
+        return None
+
+    matrix, skipped = scannable_matrix(matrix)
+    if not matrix['symbols']:
+        return None
+
+    latest = indicators_from_matrix(matrix).latest()
+    close = matrix['close']
+    price = close[-1]
+    prev_close = close[-2]
+
+    price_vs_sma20 = (price - latest['SMA_20']) / latest['SMA_20'] * 100
+    price_vs_sma50 = (price - latest['SMA_50']) / latest['SMA_50'] * 100
+
+    signal = score_signals(price_vs_sma20, price_vs_sma50, latest['RSI'],
+                           latest['MACD'], latest['MACD_Signal'], vix)
+    risk = risk_scores(vix)
+    actions = classify_actions(signal, risk)
+
+    scan = pd.DataFrame({
+        'symbol': matrix['symbols'],
+        'price': price,
+        'change_pct': (price - prev_close) / prev_close * 100,
+        'price_vs_sma20': price_vs_sma20,
+        'price_vs_sma50': price_vs_sma50,
+        'RSI': latest['RSI'],
+        'MACD_Histogram': latest['MACD_Histogram'],
+        'ATR_pct': latest['ATR'] / price * 100,
+        'signal_score': signal,
+        'risk_score': np.broadcast_to(risk, signal.shape),
+        'action': [SIGNAL_ACTIONS[i][0] for i in actions],
+    })
+    scan = scan.sort_values('signal_score', ascending=False, ignore_index=True)
+    scan.attrs['as_of'] = pd.to_datetime(matrix['timestamp'][-1], unit='s').strftime('%Y-%m-%d')
+    scan.attrs['skipped'] = skipped
+    return scan
+
+
+def main():
+    print("🔭 Scanning NIFTY 50 constituents and sectoral indices...")
+    scan = scan_universe()
+
+    if scan is None:
+        print("❌ Not enough stored history to scan the universe")
+        return
+
+    pd.set_option('display.width', 160)
+    print(f"📅 Signals as of {scan.attrs['as_of']}")
+    print(scan.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+    if scan.attrs['skipped']:
+        print(f"\n⚠️ Skipped {len(scan.attrs['skipped'])} symbols with no bar on {scan.attrs['as_of']} "
+              f"or fewer than {MIN_BARS} bars: {', '.join(scan.attrs['skipped'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Realized Volatility Estimators
+Close-to-close, Parkinson, Garman-Klass, Rogers-Satchell, Yang-Zhang and EWMA
+volatility from daily OHLC bars, over rolling windows of any length.
+
+Every estimator computes its per-bar variance terms once and then rolls them
+with a single prefix-sum pass, so long histories and many windows (vol cones)
+stay cheap. Inputs are (time,) arrays or (time x symbols) matrices; results
+are annualized decimals aligned with the input bars, NaN until the window fills.
+"""
+
+import numpy as np
+import pandas as pd
+
+from indicator_engine import rolling_mean, rolling_std
+
+TRADING_DAYS = 252
+
+# RiskMetrics decay for daily data
+EWMA_LAMBDA = 0.94
+
+ESTIMATORS = ('close_to_close', 'parkinson', 'garman_klass', 'rogers_satchell', 'yang_zhang')
+
+CONE_WINDOWS = (10, 20, 30, 60, 90, 120)
+CONE_QUANTILES = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+try:
+    from scipy.signal import lfilter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+def _as_array(values):
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _after_first_bar(rolled, shape):
+    """Re-align a series computed from bar 1 onwards with the input bars"""
+    out = np.full(shape, np.nan)
+    out[1:] = rolled
+    return out
+
+
+def _annualize(variance, trading_periods):
+    return np.sqrt(np.maximum(variance, 0.0) * trading_periods)
+
+
+def close_to_close(close, window=30, trading_periods=TRADING_DAYS):
+    """Sample standard deviation of daily log returns"""
+    close = _as_array(close)
+    returns = np.log(close[1:] / close[:-1])
+    return _after_first_bar(rolling_std(returns, window) * np.sqrt(trading_periods), close.shape)
+
+
+def parkinson(high, low, window=30, trading_periods=TRADING_DAYS):
+    """High-low range estimator (no drift, no opening jumps)"""
+    log_hl = np.log(_as_array(high) / _as_array(low))
+    term = log_hl * log_hl / (4.0 * np.log(2.0))
+    return _annualize(rolling_mean(term, window), trading_periods)
+
+
+def garman_klass(open_, high, low, close, window=30, trading_periods=TRADING_DAYS):
+    """Range plus open-to-close estimator (no drift, no opening jumps)"""
+    log_hl = np.log(_as_array(high) / _as_array(low))
+    log_co = np.log(_as_array(close) / _as_array(open_))
+    term = 0.5 * log_hl * log_hl - (2.0 * np.log(2.0) - 1.0) * log_co * log_co
+    return _annualize(rolling_mean(term, window), trading_periods)
+
+
+def _rogers_satchell_terms(open_, high, low, close):
+    log_ho = np.log(high / open_)
+    log_hc = np.log(high / close)
+    log_lo = np.log(low / open_)
+    log_lc = np.log(low / close)
+    return log_hc * log_ho + log_lc * log_lo
+
+
+def rogers_satchell(open_, high, low, close, window=30, trading_periods=TRADING_DAYS):
+    """Drift-independent range estimator"""
+    term = _rogers_satchell_terms(_as_array(open_), _as_array(high), _as_array(low), _as_array(close))
+    return _annualize(rolling_mean(term, window), trading_periods)
+
+
+def yang_zhang(open_, high, low, close, window=30, trading_periods=TRADING_DAYS):
+    """
+    Overnight + open-to-close + Rogers-Satchell variance, weighted to minimise
+    estimator variance; handles both drift and opening jumps
+    """
+    open_, high, low, close = (_as_array(x) for x in (open_, high, low, close))
+
+    overnight = np.log(open_[1:] / close[:-1])
+    open_to_close = np.log(close[1:] / open_[1:])
+    rs_terms = _rogers_satchell_terms(open_[1:], high[1:], low[1:], close[1:])
+
+    overnight_var = rolling_std(overnight, window) ** 2
+    open_to_close_var = rolling_std(open_to_close, window) ** 2
+    rs_var = rolling_mean(rs_terms, window)
+
+    k = 0.34 / (1.34 + (window + 1.0) / (window - 1.0))
+    variance = overnight_var + k * open_to_close_var + (1.0 - k) * rs_var
+    return _after_first_bar(_annualize(variance, trading_periods), close.shape)
+
+
+def ewma(close, lam=EWMA_LAMBDA, trading_periods=TRADING_DAYS):
+    """
+    RiskMetrics exponentially weighted volatility: var_t = lam * var_t-1 + (1 - lam) * r_t^2,
+    seeded with the first squared return
+    """
+    close = _as_array(close)
+    returns = np.log(close[1:] / close[:-1])
+    if not len(returns):
+        return np.full(close.shape, np.nan)
+
+    squared = returns * returns
+    if SCIPY_AVAILABLE:
+        zi = (lam * squared[0])[np.newaxis]
+        variance, _ = lfilter([1.0 - lam], [1.0, -lam], squared, axis=0, zi=zi)
+    else:
+        variance = np.empty(squared.shape)
+        variance[0] = squared[0]
+        for i in range(1, len(squared)):
+            variance[i] = lam * variance[i - 1] + (1.0 - lam) * squared[i]
+
+    return _after_first_bar(_annualize(variance, trading_periods), close.shape)
+
+
+def estimate(estimator, open_, high, low, close, window=30, trading_periods=TRADING_DAYS):
+    """Run one of ESTIMATORS by name"""
+    if estimator == 'close_to_close':
+        return close_to_close(close, window, trading_periods)
+    if estimator == 'parkinson':
+        return parkinson(high, low, window, trading_periods)
+    if estimator == 'garman_klass':
+        return garman_klass(open_, high, low, close, window, trading_periods)
+    if estimator == 'rogers_satchell':
+        return rogers_satchell(open_, high, low, close, window, trading_periods)
+    if estimator == 'yang_zhang':
+        return yang_zhang(open_, high, low, close, window, trading_periods)
+    raise ValueError(f"Unknown volatility estimator: {estimator}")
+
+
+def latest_estimates(df, window=30):
+    """
+    Latest annualized volatility (%) from every estimator for an OHLC DataFrame
+    Returns: dict of estimator name -> percent, plus 'ewma'
+    """
+    ohlc = [df[name].to_numpy() for name in ('open', 'high', 'low', 'close')]
+    latest = {name: float(estimate(name, *ohlc, window=window)[-1]) * 100 for name in ESTIMATORS}
+    latest['ewma'] = float(ewma(ohlc[3])[-1]) * 100
+    return latest
+
+
+def vol_cone(df, windows=CONE_WINDOWS, estimator='yang_zhang', quantiles=CONE_QUANTILES):
+    """
+    Distribution of rolling realized volatility (%) per window length
+    Returns: DataFrame indexed by window with one column per quantile
+    (q0 .. q100) and the current reading
+    """
+    ohlc = [df[name].to_numpy() for name in ('open', 'high', 'low', 'close')]
+
+    rows = []
+    for window in windows:
+        series = estimate(estimator, *ohlc, window=window) * 100
+        series = series[~np.isnan(series)]
+        if not len(series):
+            continue
+        row = {f"q{int(q * 100)}": value for q, value in zip(quantiles, np.quantile(series, quantiles))}
+        row['window'] = window
+        row['current'] = series[-1]
+        rows.append(row)
+
+    return pd.DataFrame(rows).set_index('window') if rows else None
@@ -0,0 +1,259 @@
+"""
+Implied Volatility Surface
+Strike x expiry surface built from solved option-chain quotes. Each expiry is
+a monotone (PCHIP) cubic spline of implied variance in log-strike with its
+coefficients precomputed, so a lookup is one searchsorted plus a Horner
+evaluation. Between expiries the surface interpolates linearly in total
+variance (iv^2 * T) at the same strike, and it holds each smile's volatility
+flat beyond its wings and outside the quoted expiries.
+
+Every snapshot re-solves its IVs against the new spot and time to expiry, so
+IVs rarely repeat exactly. A smile is therefore updated in place of a refit:
+only strikes whose IV moved by more than IV_TOLERANCE count as changed, and
+since a PCHIP slope depends only on the neighbouring knots, just the
+intervals next to those strikes get new coefficients.
+"""
+
+import threading
+
+import numpy as np
+
+from option_chain import otm_quotes
+
+# IV change (decimal) below which a quote keeps its knot in the smile
+IV_TOLERANCE = 1e-4
+
+
+def _pchip_slopes(x, y, index=None):
+    """
+    Fritsch-Carlson derivatives at the knots in index (all knots by default):
+    no overshoot between points, flat at local extrema. Each one depends only
+    on the knots next to it (the first three or last three at the ends).
+    """
+    n = len(x)
+    index = np.arange(n) if index is None else np.asarray(index)
+    if n == 2:
+        return np.full(len(index), (y[1] - y[0]) / (x[1] - x[0]))
+
+    def secant(i):
+        return (y[i + 1] - y[i]) / (x[i + 1] - x[i])
+
+    slopes = np.zeros(len(index))
+
+    # Interior: weighted harmonic mean of neighbouring secants when they agree in sign
+    interior = (index > 0) & (index < n - 1)
+    i = index[interior]
+    h0, h1 = x[i] - x[i - 1], x[i + 1] - x[i]
+    m0, m1 = secant(i - 1), secant(i)
+    w1 = 2 * h1 + h0
+    w2 = h1 + 2 * h0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        harmonic = (w1 + w2) / (w1 / m0 + w2 / m1)
+    slopes[interior] = np.where(m0 * m1 > 0, harmonic, 0.0)
+
+    # Ends: one-sided three-point estimate, limited to keep the shape
+    for end, (i0, i1) in ((0, (0, 1)), (n - 1, (n - 2, n - 3))):
+        if end not in index:
+            continue
+        h0, h1 = x[i0 + 1] - x[i0], x[i1 + 1] - x[i1]
+        m0, m1 = secant(i0), secant(i1)
+        slope = ((2 * h0 + h1) * m0 - h0 * m1) / (h0 + h1)
+        if np.sign(slope) != np.sign(m0):
+            slope = 0.0
+        elif np.sign(m0) != np.sign(m1) and abs(slope) > abs(3 * m0):
+            slope = 3 * m0
+        slopes[index == end] = slope
+    return slopes
+
+
+class SmileSpline:
+    """Implied variance across strikes for one expiry, as a monotone cubic in log-strike"""
+
+    def __init__(self, strikes, ivs):
+        order = np.argsort(strikes)
+        self.strikes = np.asarray(strikes, dtype=np.float64)[order]
+        self.ivs = np.asarray(ivs, dtype=np.float64)[order]
+        self.knots = np.log(self.strikes)
+        self.slopes = None
+
+        # Per-interval coefficients of y = c0 + c1 t + c2 t^2 + c3 t^3, t = x - knot
+        if len(self.knots) == 1:
+            zero = np.zeros(1)
+            self.coefficients = (self.ivs * self.ivs, zero, zero, zero)
+        else:
+            self.slopes = _pchip_slopes(self.knots, self.ivs * self.ivs)
+            self.coefficients = self._coefficients(np.arange(len(self.knots) - 1))
+
+    def _coefficients(self, intervals):
+        """Cubic coefficients of the given intervals from the knots' variances and slopes"""
+        variance = self.ivs * self.ivs
+        left, right = intervals, intervals + 1
+        h = self.knots[right] - self.knots[left]
+        delta = (variance[right] - variance[left]) / h
+        return (variance[left], self.slopes[left],
+                (3 * delta - 2 * self.slopes[left] - self.slopes[right]) / h,
+                (self.slopes[left] + self.slopes[right] - 2 * delta) / (h * h))
+
+    def updated(self, strikes, ivs, tolerance=IV_TOLERANCE):
+        """
+        Spline for a new set of quotes. Knots whose IV moved by at most
+        tolerance keep their old IV; when any moved further, only the
+        intervals next to them are recomputed. New or dropped strikes force
+        a full refit.
+        Returns: (spline, number of knots changed); self when nothing changed
+        """
+        order = np.argsort(strikes)
+        strikes = np.asarray(strikes, dtype=np.float64)[order]
+        ivs = np.asarray(ivs, dtype=np.float64)[order]
+        if not np.array_equal(self.strikes, strikes):
+            return SmileSpline(strikes, ivs), len(strikes)
+
+        changed = np.abs(ivs - self.ivs) > tolerance
+        if not changed.any():
+            return self, 0
+        if self.slopes is None:
+            return SmileSpline(strikes, ivs), 1
+
+        spline = SmileSpline.__new__(SmileSpline)
+        spline.strikes, spline.knots = self.strikes, self.knots
+        spline.ivs = np.where(changed, ivs, self.ivs)
+
+        # A slope moves with its own knot and its neighbours; the end slopes with the first/last three
+        moved = changed.copy()
+        moved[1:] |= changed[:-1]
+        moved[:-1] |= changed[1:]
+        moved[0] |= changed[:3].any()
+        moved[-1] |= changed[-3:].any()
+        knots = np.flatnonzero(moved)
+        spline.slopes = self.slopes.copy()
+        spline.slopes[knots] = _pchip_slopes(spline.knots, spline.ivs * spline.ivs, knots)
+
+        intervals = np.flatnonzero(moved[:-1] | moved[1:])
+        spline.coefficients = tuple(c.copy() for c in self.coefficients)
+        for c, values in zip(spline.coefficients, spline._coefficients(intervals)):
+            c[intervals] = values
+        return spline, int(changed.sum())
+
+    def variance(self, strikes):
+        """Implied variance at any strikes, flat beyond the first and last quote"""
+        x = np.clip(np.log(np.asarray(strikes, dtype=np.float64)), self.knots[0], self.knots[-1])
+        index = np.clip(np.searchsorted(self.knots, x, side='right') - 1, 0, len(self.coefficients[0]) - 1)
+        t = x - self.knots.take(index)
+        c0, c1, c2, c3 = (c.take(index) for c in self.coefficients)
+        return c0 + t * (c1 + t * (c2 + t * c3))
+
+
+class VolatilitySurface:
+    """
+    Implied volatility by (strike, time to expiry), refreshed from option-chain snapshots
+    update() publishes smiles and their times as one immutable tuple, so lookups need no lock
+    """
+
+    def __init__(self, min_quotes=3):
+        self.min_quotes = min_quotes
+        self.timestamp = None
+        self.refits = 0
+        # ((expiry, time_to_expiry, SmileSpline), ...) nearest expiry first, and their times
+        self._state = ((), np.empty(0))
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._state[0])
+
+    @property
+    def expiries(self):
+        """Returns: [(expiry, time_to_expiry), ...] nearest first"""
+        return [(expiry, time_to_expiry) for expiry, time_to_expiry, _ in self._state[0]]
+
+    def update(self, snapshot):
+        """
+        Rebuild from a solved OptionChainSnapshot, updating each expiry's smile
+        only where its OTM IVs moved (see SmileSpline.updated); times to expiry
+        are always refreshed
+        Returns: number of smiles refit or updated
+        """
+        with self._lock:
+            if snapshot.timestamp is not None and snapshot.timestamp == self.timestamp:
+                return 0
+
+            current = {expiry: spline for expiry, _, spline in self._state[0]}
+            slices = []
+            refit = 0
+            for expiry, quotes in otm_quotes(snapshot).groupby('expiry', sort=False):
+                if len(quotes) < self.min_quotes:
+                    continue
+                strikes = quotes['strike'].to_numpy()
+                ivs = quotes['iv'].to_numpy()
+
+                spline = current.get(expiry)
+                if spline is None:
+                    spline, changed = SmileSpline(strikes, ivs), len(strikes)
+                else:
+                    spline, changed = spline.updated(strikes, ivs)
+                refit += changed > 0
+                slices.append((expiry, float(quotes['time_to_expiry'].iloc[0]), spline))
+
+            slices.sort(key=lambda item: item[1])
+            self._state = (tuple(slices), np.array([time_to_expiry for _, time_to_expiry, _ in slices]))
+            self.timestamp = snapshot.timestamp
+            self.refits += refit
+            return refit
+
+    def implied_volatility(self, strike, time_to_expiry):
+        """
+        Annualized implied volatility (decimal); arguments broadcast
+        Returns: float for scalar inputs, otherwise an array of the broadcast shape, or None when empty
+        """
+        slices, times = self._state
+        if not slices:
+            return None
+
+        strike, time_to_expiry = np.broadcast_arrays(np.asarray(strike, dtype=np.float64),
+                                                     np.asarray(time_to_expiry, dtype=np.float64))
+        shape = strike.shape
+        if strike.size == 0:
+            return np.empty(shape)
+        strike, time_to_expiry = strike.ravel(), time_to_expiry.ravel()
+        # Bracketing smiles; before the first or after the last expiry both are that end's smile
+        position = np.searchsorted(times, time_to_expiry)
+        upper = np.minimum(position, len(slices) - 1)
+        lower = np.where((position > 0) & (position < len(slices)), position - 1, upper)
+
+        variance = np.empty((2, len(strike)))
+        for side, index in enumerate((lower, upper)):
+            if side and np.array_equal(lower, upper):
+                variance[1] = variance[0]
+                continue
+            if index.min() == index.max():
+                variance[side] = slices[index[0]][2].variance(strike)
+                continue
+            for i in np.unique(index):
+                mask = index == i
+                variance[side, mask] = slices[i][2].variance(strike[mask])
+
+        # Linear in total variance between expiries; constant volatility outside them
+        t_lower, t_upper = times[lower], times[upper]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(t_upper > t_lower, (time_to_expiry - t_lower) / (t_upper - t_lower), 1.0)
+            weight = np.clip(weight, 0.0, 1.0)
+            total = (1 - weight) * variance[0] * t_lower + weight * variance[1] * t_upper
+            result = np.sqrt(np.where((t_upper > t_lower) & (time_to_expiry > 0),
+                                      total / time_to_expiry, variance[1]))
+
+        result = result.reshape(shape)
+        return result[()] if result.ndim == 0 else result
+
+
+_surfaces = {}
+_surfaces_lock = threading.Lock()
+
+
+def get_volatility_surface(symbol='NIFTY'):
+    """
+    Return the process-wide VolatilitySurface for a symbol, creating it on first use
+    """
+    if symbol not in _surfaces:
+        with _surfaces_lock:
+            if symbol not in _surfaces:
+                _surfaces[symbol] = VolatilitySurface()
+    return _surfaces[symbol]